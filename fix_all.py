@@ -4,15 +4,15 @@
 EIMS 시스템 전체 진단 및 수정 스크립트
 """
 
-import sqlite3
 import sys
 import pathlib
-from collections import Counter
 
 # 프로젝트 루트 경로 추가
 ROOT = pathlib.Path(__file__).resolve().parent
 sys.path.insert(0, str(ROOT))
 
+from scripts.connection import connect
+
 def main():
     print("=== EIMS 시스템 전체 진단 및 수정 ===")
     print()
@@ -20,7 +20,7 @@ def main():
     # 1단계: 데이터베이스 현황 확인
     print("[1단계] 데이터베이스 현황 확인")
     try:
-        conn = sqlite3.connect('storage/lab.db')
+        conn = connect()
         cursor = conn.cursor()
         
         print("=== 배정 현황 ===")
@@ -34,7 +34,6 @@ def main():
         cursor.execute('SELECT COUNT(*) as count FROM samples')
         sample_count = cursor.fetchone()[0]
         print(f"총 샘플 수: {sample_count}개")
-        conn.close()
         
     except Exception as e:
         print(f"데이터베이스 확인 오류: {e}")
@@ -113,25 +112,23 @@ def main():
     print("[4단계] 문제 해결 실행")
     try:
         print("이전 배정 데이터 삭제 중...")
-        conn = sqlite3.connect('storage/lab.db')
+        conn = connect()
         cursor = conn.cursor()
         cursor.execute('DELETE FROM assignments')
         conn.commit()
-        conn.close()
         print("삭제 완료!")
         
         print()
         print("새로운 배정 실행 중...")
-        from scripts.assign import run_assign
-        from scripts.db import get_samples_df
+        from scripts.assign import run_assign_chunked
+        from scripts.db import iter_samples
         
-        samples_df = get_samples_df()
-        if not samples_df.empty:
-            result = run_assign(samples_df)
-            print(f"새로운 배정 완료: {len(result)}개")
+        # 시료를 묶음 단위로 읽어 배정 (전체를 메모리에 올리지 않음)
+        researcher_counts = run_assign_chunked(iter_samples())
+        if researcher_counts:
+            print(f"새로운 배정 완료: {sum(researcher_counts.values())}개")
             
             # 배정 결과 요약
-            researcher_counts = Counter([a['researcher'] for a in result])
             for researcher, count in researcher_counts.items():
                 print(f"  {researcher}: {count}개")
         else:
@@ -1,31 +1,31 @@
-import sqlite3
 import sys
 import pathlib
-sys.path.append('scripts')
 
-from assign import run_assign
-from db import get_samples_df
+ROOT = pathlib.Path(__file__).resolve().parent
+if str(ROOT) not in sys.path: sys.path.insert(0, str(ROOT))
+
+from scripts.connection import connect
+
+from scripts.assign import run_assign_chunked
+from scripts.db import iter_samples
 
 # 1. 이전 배정 데이터 삭제
 print("이전 배정 데이터 삭제 중...")
-conn = sqlite3.connect('storage/lab.db')
+conn = connect()
 cursor = conn.cursor()
 cursor.execute('DELETE FROM assignments')
 conn.commit()
-conn.close()
 print("삭제 완료!")
 
 # 2. 새로운 배정 실행
 print()
 print("새로운 배정 실행 중...")
-samples_df = get_samples_df()
-if not samples_df.empty:
-    result = run_assign(samples_df)
-    print(f"새로운 배정 완료: {len(result)}개")
+# 시료를 묶음 단위로 읽어 배정 (전체를 메모리에 올리지 않음)
+researcher_counts = run_assign_chunked(iter_samples())
+if researcher_counts:
+    print(f"새로운 배정 완료: {sum(researcher_counts.values())}개")
     
     # 배정 결과 요약
-    from collections import Counter
-    researcher_counts = Counter([a['researcher'] for a in result])
     for researcher, count in researcher_counts.items():
         print(f"  {researcher}: {count}개")
 else:
@@ -1,4 +1,5 @@
 import csv, pathlib
+from collections import Counter
 
 from . import db
 
@@ -21,23 +22,8 @@ def _load_people():
                 people.append({"name": r["name"], "email": r["email"]})
     return people
 
-def run_assign(df):
-    rules = _load_rules()
-    people = _load_people()
-    loads = db.today_loads()  # {name: count}
-    
-    # 이미 배정된 작업 조회
-    existing_assignments = db.get_existing_assignments()
-
-    # 이름 전용 리스트
-    names = [p["name"] for p in people]
-    
-    # 디버깅: 로드된 데이터 확인
-    print(f"DEBUG: 로드된 연구원들: {names}")
-    print(f"DEBUG: 로드된 규칙 수: {len(rules)}")
-    for i, rule in enumerate(rules):
-        print(f"DEBUG: 규칙 {i+1}: {rule}")
-
+def _assign_rows(df, rules, names, existing_assignments, loads, verbose=True):
+    """df 각 행에 규칙으로 연구원을 정하고 (배정 목록, 스킵 수) 반환 (저장은 호출한 쪽에서)"""
     assigned=[]
     skipped=0
     for _, row in df.iterrows():
@@ -47,26 +33,31 @@ def run_assign(df):
         # 중복 체크: 이미 배정된 작업은 스킵
         assignment_key = f"{sample_no}_{item}"
         if assignment_key in existing_assignments:
-            print(f"DEBUG: 이미 배정된 작업 스킵 - sample_no: {sample_no}, item: {item}")
+            if verbose:
+                print(f"DEBUG: 이미 배정된 작업 스킵 - sample_no: {sample_no}, item: {item}")
             skipped += 1
             continue
         
         chosen = None
-        print(f"DEBUG: 처리 중인 항목: '{item}'")
+        if verbose:
+            print(f"DEBUG: 처리 중인 항목: '{item}'")
 
         # 규칙에 따른 배정 (라운드로빈 제거)
-        for rule in sorted(rules, key=lambda x: int(x.get("priority","1"))):
+        for rule in rules:
             if rule["item_pattern"]:
                 # 파이프 구분자로 분리된 패턴들 확인
                 patterns = rule["item_pattern"].split("|")
-                print(f"DEBUG: 패턴들: {patterns}")
+                if verbose:
+                    print(f"DEBUG: 패턴들: {patterns}")
                 for pattern in patterns:
                     if pattern.strip() in item:
                         pref = rule.get("preferred")
-                        print(f"DEBUG: 매칭된 패턴: '{pattern.strip()}' -> 선호 연구원: '{pref}'")
+                        if verbose:
+                            print(f"DEBUG: 매칭된 패턴: '{pattern.strip()}' -> 선호 연구원: '{pref}'")
                         if pref in names:
                             chosen = pref
-                            print(f"DEBUG: 배정됨: '{chosen}'")
+                            if verbose:
+                                print(f"DEBUG: 배정됨: '{chosen}'")
                             break
                 if chosen:
                     break
@@ -74,13 +65,68 @@ def run_assign(df):
         # 규칙에 해당하지 않는 경우 첫 번째 연구원에게 배정
         if not chosen:
             chosen = names[0] if names else "system"
-            print(f"DEBUG: 규칙 없음, 기본 배정: '{chosen}'")
+            if verbose:
+                print(f"DEBUG: 규칙 없음, 기본 배정: '{chosen}'")
 
         assigned.append({"sample_no": row["sample_no"], "item": item, "researcher": chosen, "method":"rule_only"})
         loads[chosen] = loads.get(chosen,0) + 1
+    return assigned, skipped
+
+def run_assign(df):
+    rules = sorted(_load_rules(), key=lambda x: int(x.get("priority","1")))
+    people = _load_people()
+    loads = db.today_loads()  # {name: count}
+    
+    # 이미 배정된 작업 조회
+    existing_assignments = db.get_existing_assignments()
+
+    # 이름 전용 리스트
+    names = [p["name"] for p in people]
+    
+    # 디버깅: 로드된 데이터 확인
+    print(f"DEBUG: 로드된 연구원들: {names}")
+    print(f"DEBUG: 로드된 규칙 수: {len(rules)}")
+    for i, rule in enumerate(rules):
+        print(f"DEBUG: 규칙 {i+1}: {rule}")
+
+    assigned, skipped = _assign_rows(df, rules, names, existing_assignments, loads)
     
     print(f"DEBUG: 총 {skipped}개 작업 스킵 (이미 배정됨)")
     print(f"DEBUG: 새로 배정된 작업: {len(assigned)}개")
 
     db.save_assignments(assigned)
     return assigned
+
+class ChunkAssigner:
+    """묶음 단위 배정기 (규칙/연구원/오늘 부하는 한 번만 읽음)
+
+    묶음마다 그 안의 (sample_no, item)만 기존 배정을 조회하므로 기존 배정 수와 무관하게
+    묶음 크기에 비례하는 비용으로 배정/저장한다. 행별 DEBUG 출력은 생략.
+    """
+
+    def __init__(self):
+        self.rules = sorted(_load_rules(), key=lambda x: int(x.get("priority","1")))
+        self.names = [p["name"] for p in _load_people()]
+        self.loads = db.today_loads()
+        self.skipped = 0
+
+    def assign(self, df):
+        """df를 배정/저장하고 새로 배정한 목록 반환"""
+        sample_nos = df["sample_no"].astype(str) if "sample_no" in df.columns else [""] * len(df)
+        existing_assignments = db.get_existing_assignments(zip(sample_nos, df["item"].astype(str)))
+        assigned, skipped = _assign_rows(df, self.rules, self.names, existing_assignments, self.loads, verbose=False)
+        db.save_assignments(assigned)
+        self.skipped += skipped
+        return assigned
+
+def run_assign_chunked(chunks):
+    """DataFrame 묶음(예: db.iter_samples())을 차례로 배정/저장하고 연구원별 배정 수(Counter) 반환
+
+    배정 목록은 묶음마다 저장 후 버리므로 전체 시료가 수백만 행이어도 메모리는 묶음 크기만큼만 사용한다.
+    """
+    assigner = ChunkAssigner()
+    counts = Counter()
+    for df in chunks:
+        counts.update(a["researcher"] for a in assigner.assign(df))
+        print(f"DEBUG: {sum(counts.values())}개 배정, {assigner.skipped}개 스킵 (누적)")
+    return counts
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+EIMS 기간 백필 스크립트
+장애 등으로 빠진 기간을 일/주 단위 구간으로 나누어 동시에 내려받고,
+uniq_key 기준으로 중복을 제거한 뒤 DB 저장 및 작업 배정을 수행
+
+사용법:
+    python scripts/backfill.py 2025-10-01 2025-10-20 --step week --concurrency 4
+"""
+
+import argparse
+import os
+import sys
+import pathlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path: sys.path.insert(0, str(ROOT))
+
+import pandas as pd
+
+from scripts import scrape_eims, eims_http, db, staging
+from scripts.normalize import normalize, concat_normalized
+from scripts.fingerprint import row_hashes
+from scripts.assign import run_assign
+from scripts.structured_logger import logger
+
+DEFAULT_CONCURRENCY = int(os.environ.get("EIMS_BACKFILL_CONCURRENCY", "4"))
+STEP_DAYS = {"day": 1, "week": 7}
+
+
+def split_windows(date_from, date_to, step="day"):
+    """[date_from, date_to] 기간을 일/주 단위 (시작일, 종료일) 구간 목록으로 분할"""
+    start = datetime.strptime(date_from, "%Y-%m-%d").date()
+    end = datetime.strptime(date_to, "%Y-%m-%d").date()
+    if start > end:
+        raise ValueError(f"시작일이 종료일보다 늦습니다: {date_from} > {date_to}")
+
+    days = STEP_DAYS[step]
+    windows = []
+    while start <= end:
+        window_end = min(start + timedelta(days=days - 1), end)
+        windows.append((start.isoformat(), window_end.isoformat()))
+        start = window_end + timedelta(days=1)
+    return windows
+
+
+def _try_direct(window):
+    try:
+        return scrape_eims._direct_download(*window)
+    except eims_http.DirectExportError as e:
+        logger.log_event("backfill_window_direct_failed", window=list(window), reason=str(e))
+        return None
+
+
+def download_windows(windows, concurrency=DEFAULT_CONCURRENCY):
+    """구간별 엑셀 파일 다운로드 후 [(구간, 파일경로)] 반환 (구간 순서 유지)
+
+    로그인은 한 번만 수행하고, 이후 구간은 저장된 세션을 공유하는
+    HTTP 세션 여러 개로 동시에 받는다. 직접 다운로드에 실패한 구간만
+    브라우저로 하나씩 다시 받는다.
+    """
+    paths = {}
+    pending = list(windows)
+
+    # 첫 구간: 세션/엑셀출력 요청이 없으면 브라우저로 받으면서 로그인 + 요청 캡처
+    first = pending.pop(0)
+    paths[first], _ = scrape_eims.download_excel(*first)
+
+    if pending:
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+            for window, path in zip(pending, pool.map(_try_direct, pending)):
+                if path is not None:
+                    paths[window] = path
+
+    # 직접 다운로드 실패 구간은 브라우저로 순차 처리 (sync Playwright는 스레드 간 공유 불가)
+    for window in pending:
+        if window not in paths:
+            paths[window], _ = scrape_eims._browser_download(*window)
+
+    return [(window, paths[window]) for window in windows]
+
+
+def merge_windows(files):
+    """구간별 파일을 읽어 정규화 후 병합, uniq_key 중복은 나중 구간 기준으로 제거
+
+    구간이 많아도 메모리가 적게 들도록 저카디널리티 컬럼은 공유 카테고리의 범주형으로 유지
+    """
+    frames = []
+    for window, path in files:
+        # 이미 스테이징된 파일은 엑셀을 다시 파싱하지 않음
+        df = staging.load_normalized(path)
+        if df is None:
+            df = normalize(scrape_eims.read_excel(path), categorical=True)
+            df["row_hash"] = row_hashes(df)
+            staging.stage(df, path)
+        df["_source"] = str(path)
+        frames.append(df)
+    if not frames:
+        return pd.DataFrame()
+
+    merged = concat_normalized(frames)
+    return merged.drop_duplicates(subset="uniq_key", keep="last").reset_index(drop=True)
+
+
+def backfill(date_from, date_to, step="day", concurrency=DEFAULT_CONCURRENCY, assign=True):
+    """기간 백필 실행, 저장된 행 수 반환"""
+    windows = split_windows(date_from, date_to, step)
+    logger.log_event("backfill_started", date_from=date_from, date_to=date_to,
+                     step=step, windows=len(windows), concurrency=concurrency)
+
+    files = download_windows(windows, concurrency)
+    merged = merge_windows(files)
+    logger.log_event("backfill_merged", files=len(files), rows=len(merged))
+    if merged.empty:
+        return 0
+
+    db.init_db()
+    for source_path, part in merged.groupby("_source", sort=False):
+        db.upsert_samples(part.drop(columns="_source"), source_path)
+
+    if assign:
+        assigned = run_assign(merged.drop(columns="_source"))
+        logger.log_assignment("system", len(assigned), [a["item"] for a in assigned])
+
+    logger.log_event("backfill_completed", rows=len(merged))
+    return len(merged)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EIMS 기간 백필")
+    parser.add_argument("date_from", help="시작일 (YYYY-MM-DD)")
+    parser.add_argument("date_to", help="종료일 (YYYY-MM-DD)")
+    parser.add_argument("--step", choices=sorted(STEP_DAYS), default="day", help="구간 단위")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="동시 다운로드 수")
+    parser.add_argument("--no-assign", action="store_true", help="DB 저장만 하고 작업 배정은 생략")
+    args = parser.parse_args()
+
+    try:
+        rows = backfill(args.date_from, args.date_to, args.step, args.concurrency, assign=not args.no_assign)
+        print(f"✅ 백필 완료: {rows}행")
+    except Exception as e:
+        logger.log_error("backfill_failed", e)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
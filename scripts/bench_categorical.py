@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+표준화 결과 범주형 모드 메모리 벤치마크
+백필처럼 여러 배치를 표준화해 합치는 경우를 합성 데이터로 재현하여
+문자열(object) 모드와 범주형 모드의 결과 메모리, 최대 메모리, 그룹 집계 시간을 비교
+
+사용법:
+    python scripts/bench_categorical.py --sizes 100000 500000 1000000 --batch 50000
+"""
+
+import argparse
+import gc
+import sys
+import pathlib
+import time
+import tracemalloc
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path: sys.path.insert(0, str(ROOT))
+
+import pandas as pd
+
+from scripts.normalize import normalize, concat_normalized
+from scripts.bench_normalize import synthetic_export
+
+
+def _normalize_batches(raw, batch, categorical):
+    frames = [normalize(raw.iloc[i:i + batch], categorical=categorical) for i in range(0, len(raw), batch)]
+    return concat_normalized(frames)
+
+
+def _measure(raw, batch, categorical):
+    """(결과 메모리 MB, 최대 메모리 MB, 표준화 시간 s, 그룹 집계 시간 s)"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        started = time.perf_counter()
+        df = _normalize_batches(raw, batch, categorical)
+        elapsed = time.perf_counter() - started
+        gc.collect()
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    started = time.perf_counter()
+    df.groupby(["item", "site_name"], observed=True).size()
+    df["item"].value_counts()
+    grouped = time.perf_counter() - started
+    return retained / (1024 * 1024), peak / (1024 * 1024), elapsed, grouped
+
+
+def main():
+    parser = argparse.ArgumentParser(description="범주형 모드 메모리 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100000, 500000, 1000000], help="전체 행 수 목록")
+    parser.add_argument("--batch", type=int, default=50000, help="배치(백필 구간) 행 수")
+    args = parser.parse_args()
+
+    print(f"{'행 수':>9}{'모드':>13}{'결과(MB)':>11}{'최대(MB)':>11}{'표준화(s)':>11}{'집계(s)':>9}")
+    print("-" * 64)
+    for size in args.sizes:
+        raw = synthetic_export(size)
+        pd.testing.assert_frame_equal(
+            _normalize_batches(raw, args.batch, False),
+            _normalize_batches(raw, args.batch, True).astype(object),
+        )
+        for name, categorical in (("object", False), ("categorical", True)):
+            retained, peak, elapsed, grouped = _measure(raw, args.batch, categorical)
+            print(f"{size:>9}{name:>13}{retained:>11.1f}{peak:>11.1f}{elapsed:>11.3f}{grouped:>9.3f}")
+        del raw
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+lab.db 동시 접근 벤치마크
+정시 작업(쓰기 1개)과 완료 처리/공유폴더 동기화(읽기 여러 개)가 같은 DB를 동시에 쓰는 상황을
+별도 프로세스로 재현하여, 기존 방식(기본 저널 + 호출마다 새 연결)과 공용 연결 모듈(WAL + pragma + 연결 재사용)의
+읽기 지연, 처리량, 잠금 오류 수를 비교 (임시 폴더 사용)
+
+사용법:
+    python scripts/bench_concurrency.py --readers 4 --seconds 10 --rows 20000 --batch 20000
+"""
+
+import argparse
+import multiprocessing as mp
+import pathlib
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path: sys.path.insert(0, str(ROOT))
+
+from scripts import connection, db
+from scripts.complete_tasks import RESEARCHER_TODAY_SQL
+
+MODES = ("legacy", "shared")
+
+# 배정(today_loads)과 완료 처리(complete_tasks)가 실행하는 조회
+READ_QUERIES = [db.TODAY_LOADS_SQL, RESEARCHER_TODAY_SQL]
+
+
+def _open(mode, path):
+    """legacy: 기존 코드처럼 호출마다 새 연결 (기본 timeout 5초), shared: 공용 연결"""
+    return sqlite3.connect(path) if mode == "legacy" else connection.connect(path)
+
+
+def _done(mode, conn):
+    if mode == "legacy":
+        conn.close()
+
+
+def _prepare(path, rows):
+    """기본 저널 모드의 새 DB에 시료/최근 30일 배정 데이터 채우기"""
+    conn = sqlite3.connect(path)
+    conn.executescript((ROOT / "sql" / "schema.sql").read_text(encoding="utf-8"))
+    now = datetime.now().isoformat(timespec="seconds")
+    days = [(datetime.now() - timedelta(days=d)).isoformat(timespec="seconds") for d in range(30)]
+    samples = [(f"S{i // 5:07d}", "사업장", now, "방류수", f"항목{i % 5}", "접수", f"S{i // 5:07d}_항목{i % 5}")
+               for i in range(rows)]
+    conn.executemany("""INSERT INTO samples (sample_no, site_name, collected_at, kind, item, status, uniq_key)
+                        VALUES (?, ?, ?, ?, ?, ?, ?)""", samples)
+    conn.executemany("""INSERT INTO assignments (sample_no, item, researcher, assigned_at, method)
+                        VALUES (?, ?, ?, ?, 'bench')""",
+                     [(s[0], s[4], f"연구원{i % 4}", days[i % 30]) for i, s in enumerate(samples)])
+    conn.commit()
+    conn.close()
+
+
+def _reader(mode, path, seconds, seed, out):
+    rng = random.Random(seed)
+    latencies, errors = [], 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            conn = _open(mode, path)
+            query = rng.choice(READ_QUERIES)
+            params = db.today_range()
+            if query is RESEARCHER_TODAY_SQL:
+                params = (f"연구원{rng.randrange(4)}", *params)
+            conn.execute(query, params).fetchall()
+            _done(mode, conn)
+            latencies.append(time.perf_counter() - started)
+        except sqlite3.OperationalError:
+            errors += 1
+    out.put(("reader", latencies, errors))
+
+
+def _writer(mode, path, seconds, rows, batch, out):
+    """정시 작업처럼 배치 단위 갱신 트랜잭션을 반복"""
+    rng = random.Random(0)
+    latencies, errors = [], 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        ids = [(rng.choice(("접수", "분석중", "완료")), rng.randrange(1, rows + 1)) for _ in range(batch)]
+        try:
+            conn = _open(mode, path)
+            with conn:
+                conn.executemany("UPDATE samples SET status = ? WHERE id = ?", ids)
+            _done(mode, conn)
+            latencies.append(time.perf_counter() - started)
+        except sqlite3.OperationalError:
+            errors += 1
+    out.put(("writer", latencies, errors))
+
+
+def _p95(values):
+    return statistics.quantiles(values, n=20)[-1] if len(values) >= 2 else (values[0] if values else 0.0)
+
+
+def run(mode, workdir, readers, seconds, rows, batch):
+    path = pathlib.Path(workdir) / f"{mode}.db"
+    _prepare(path, rows)
+    if mode == "shared":
+        connection.connect(path)  # WAL 전환 (파일에 기록됨)
+        connection.close(path)
+
+    out = mp.Queue()
+    procs = [mp.Process(target=_writer, args=(mode, path, seconds, rows, batch, out))]
+    procs += [mp.Process(target=_reader, args=(mode, path, seconds, i, out)) for i in range(readers)]
+    for p in procs:
+        p.start()
+    results = [out.get() for _ in procs]
+    for p in procs:
+        p.join()
+
+    read = [lat for role, lats, _ in results if role == "reader" for lat in lats]
+    write = [lat for role, lats, _ in results if role == "writer" for lat in lats]
+    return {
+        "read_ops": len(read) / seconds,
+        "read_p95_ms": _p95(read) * 1000,
+        "read_max_ms": max(read, default=0.0) * 1000,
+        "write_ops": len(write) / seconds,
+        "errors": sum(errors for _, _, errors in results),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="lab.db 동시 접근 벤치마크")
+    parser.add_argument("--readers", type=int, default=4, help="동시 읽기 프로세스 수")
+    parser.add_argument("--seconds", type=float, default=10, help="모드별 측정 시간")
+    parser.add_argument("--rows", type=int, default=20000, help="시료/배정 행 수")
+    parser.add_argument("--batch", type=int, default=20000, help="쓰기 트랜잭션당 갱신 행 수")
+    args = parser.parse_args()
+
+    print(f"{'모드':>8}{'읽기/s':>10}{'읽기 p95(ms)':>14}{'읽기 최대(ms)':>15}{'쓰기/s':>9}{'잠금 오류':>10}")
+    print("-" * 66)
+    with tempfile.TemporaryDirectory() as workdir:
+        for mode in MODES:
+            r = run(mode, workdir, args.readers, args.seconds, args.rows, args.batch)
+            print(f"{mode:>8}{r['read_ops']:>10.0f}{r['read_p95_ms']:>14.1f}{r['read_max_ms']:>15.1f}"
+                  f"{r['write_ops']:>9.1f}{r['errors']:>10}")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
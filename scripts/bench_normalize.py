@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+normalize() 대용량 벤치마크 (이전 구현과 비교)
+read_excel_streaming 결과와 같은 형태의 합성 프레임(10만~100만 행)으로
+처리 속도(rows/s)와 최대 메모리(tracemalloc 기준 추가 할당량)를 측정하고,
+두 구현의 결과가 같은지도 확인
+
+사용법:
+    python scripts/bench_normalize.py --sizes 100000 300000 1000000 --repeat 3
+"""
+
+import argparse
+import gc
+import sys
+import pathlib
+import statistics
+import time
+import tracemalloc
+from typing import List
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path: sys.path.insert(0, str(ROOT))
+
+import numpy as np
+import pandas as pd
+
+from scripts import normalize as current
+from scripts.eims_standin import EXPORT_HEADER, SAMPLE_ITEMS, SAMPLE_KINDS, SAMPLE_SITES
+
+
+# ---- 비교 기준: 벡터화 이전 normalize 그대로 (검증 포함, 행/컬럼 단위 파이썬 처리, 여러 번 복사) ----
+# 상수/_clean_headers는 그때와 같으므로 현재 모듈 것을 사용
+
+def _legacy_promote_header_row(df: pd.DataFrame) -> pd.DataFrame:
+    # 상단에 설명 행이 포함된 경우, '측정항목' 등의 키워드가 있는 행을 찾아 헤더로 승격
+    for i in range(min(10, len(df))):
+        row_values = [str(v).strip() for v in list(df.iloc[i].values)]
+        if any(any(cand in v for cand in current.HEADER_ITEM_CANDIDATES) for v in row_values):
+            # 헤더 행을 찾았으면 그 행을 컬럼명으로 사용하고 다음 행부터 데이터로 사용
+            df = df.iloc[i + 1 :].copy()
+            df.columns = current._clean_headers(row_values)
+            return df
+
+    # 기본: 현재 헤더 정리만 적용
+    df = df.copy()
+    df.columns = current._clean_headers(list(df.columns))
+    return df
+
+
+def _legacy_apply_synonym_mapping(df: pd.DataFrame) -> pd.DataFrame:
+    rename_map = {}
+    for col in df.columns:
+        std = current.SYNONYM_COLMAP.get(col)
+        if std:
+            rename_map[col] = std
+    if rename_map:
+        df = df.rename(columns=rename_map)
+    return df
+
+
+def legacy_normalize(df: pd.DataFrame) -> pd.DataFrame:
+    df = _legacy_promote_header_row(df)
+    df = _legacy_apply_synonym_mapping(df)
+
+    # 유지 컬럼 구성: item은 필수, 나머지는 존재하는 것만 유지
+    desired = ["sample_no", "site_name", "collected_at", "kind", "item", "status"]
+    keep = [c for c in desired if c in df.columns]
+    if "item" not in keep:
+        raise ValueError("필수 컬럼 'item(측정항목)'을 찾을 수 없습니다.")
+
+    df = df[keep].copy()
+
+    for c in df.columns:
+        try:
+            if df[c].dtype == object:
+                df[c] = df[c].astype(str).str.strip()
+        except AttributeError:
+            # 컬럼이 중복되어 DataFrame이 반환되는 경우
+            continue
+
+    # uniq_key 생성: sample_no 있으면 sample_no+item, 없으면 site_name/collected_at 조합
+    if "sample_no" in df.columns:
+        df["uniq_key"] = df["sample_no"].astype(str) + "_" + df["item"].astype(str)
+    else:
+        parts: List[str] = []
+        if "site_name" in df.columns:
+            parts.append(df["site_name"].astype(str))
+        if "collected_at" in df.columns:
+            parts.append(df["collected_at"].astype(str))
+        parts.append(df["item"].astype(str))
+        if parts:
+            combined = parts[0]
+            for p in parts[1:]:
+                combined = combined + "_" + p
+            df["uniq_key"] = combined
+        else:
+            df["uniq_key"] = df.index.astype(str)
+
+    # 공백/결측 item 제거
+    df = df[df["item"].astype(str).str.strip() != ""].reset_index(drop=True)
+    return df
+
+
+# ---- 합성 데이터 ----
+
+def synthetic_export(rows: int, seed: int = 0) -> pd.DataFrame:
+    """엑셀출력을 스트리밍 리더로 읽은 것과 같은 모양의 프레임 (시료당 측정항목 약 5개)"""
+    rng = np.random.default_rng(seed)
+    sample_ids = np.arange(rows) // 5
+    sample_no = np.array([f"20251021-{i:06d}" for i in range(sample_ids[-1] + 1)], dtype=object)[sample_ids]
+    minutes = rng.integers(0, 30 * 24 * 60, sample_ids[-1] + 1)[sample_ids]
+    collected = (pd.Timestamp("2025-10-01") + pd.to_timedelta(minutes, unit="m")).strftime("%Y-%m-%d %H:%M")
+    items = np.array(SAMPLE_ITEMS + [" 총질소 ", ""], dtype=object)
+    return pd.DataFrame({
+        EXPORT_HEADER[0]: sample_no,
+        EXPORT_HEADER[1]: np.array(SAMPLE_SITES, dtype=object)[rng.integers(0, len(SAMPLE_SITES), rows)],
+        EXPORT_HEADER[2]: np.asarray(collected, dtype=object),
+        EXPORT_HEADER[3]: np.array(SAMPLE_KINDS, dtype=object)[rng.integers(0, len(SAMPLE_KINDS), rows)],
+        EXPORT_HEADER[4]: items[rng.integers(0, len(items), rows)],
+        EXPORT_HEADER[5]: np.full(rows, "접수", dtype=object),
+    })
+
+
+# ---- 측정 ----
+
+def _time_once(fn, raw):
+    gc.collect()
+    started = time.perf_counter()
+    fn(raw)
+    return time.perf_counter() - started
+
+
+def _peak_memory_mb(fn, raw):
+    """입력 프레임을 제외하고 함수 실행 중 추가로 할당된 최대 메모리 (MB)"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn(raw)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="normalize() 대용량 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100000, 300000, 1000000], help="행 수 목록")
+    parser.add_argument("--repeat", type=int, default=3, help="크기별 반복 횟수 (중앙값 표시)")
+    args = parser.parse_args()
+
+    impls = [("before", legacy_normalize), ("after", current.normalize)]
+
+    print(f"{'행 수':>9}{'구현':>8}{'시간(s)':>10}{'rows/s':>12}{'최대 메모리(MB)':>16}")
+    print("-" * 55)
+    for size in args.sizes:
+        raw = synthetic_export(size)
+        pd.testing.assert_frame_equal(legacy_normalize(raw), current.normalize(raw), check_dtype=False)
+        for name, fn in impls:
+            seconds = statistics.median(_time_once(fn, raw) for _ in range(args.repeat))
+            peak = _peak_memory_mb(fn, raw)
+            print(f"{size:>9}{name:>8}{seconds:>10.3f}{size / seconds:>12.0f}{peak:>16.1f}")
+        del raw
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
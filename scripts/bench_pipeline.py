@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+스크래핑 → 표준화 → DB 저장 → 작업 배정 전체 경로 벤치마크
+오프라인 EIMS 대역 서버(eims_standin)를 띄워 실제 fetch_excel_df 코드로 엑셀을 받고,
+임시 폴더의 DB/다운로드/세션을 사용하므로 운영 storage에는 손대지 않음
+
+사용법:
+    python scripts/bench_pipeline.py --sizes 1000 10000 50000 --latency-ms 100 --repeat 3
+    python scripts/bench_pipeline.py --mode browser      # 직접 다운로드 없이 매번 브라우저 사용
+"""
+
+import argparse
+import contextlib
+import os
+import sys
+import pathlib
+import shutil
+import statistics
+import tempfile
+import time
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path: sys.path.insert(0, str(ROOT))
+
+from scripts.eims_standin import StandinServer
+
+STAGES = ["fetch", "normalize", "row_hash", "upsert", "assign"]
+
+
+def _prepare_env(server, workdir, mode):
+    """scrape_eims 임포트 전에 대역 서버/임시 저장소를 가리키도록 환경변수 설정"""
+    os.environ.update({
+        "EIMS_ID": "bench",
+        "EIMS_PW": "bench",
+        "EIMS_LOGIN_URLS": server.login_url,
+        "EIMS_FIELD_URL": server.field_url,
+        "EIMS_STORAGE_DIR": str(workdir / "storage"),
+        "EIMS_DOWNLOAD_MODE": mode,
+    })
+
+
+def run_pipeline(db_path):
+    """job.run_job과 같은 순서로 한 번 실행하고 단계별 소요 시간(초)과 행 수 반환"""
+    from scripts import db
+    from scripts.scrape_eims import fetch_excel_df
+    from scripts.normalize import normalize
+    from scripts.fingerprint import row_hashes
+    from scripts.assign import run_assign
+
+    db.DB_PATH = db_path
+    db.init_db()
+
+    timings = {}
+
+    def timed(stage, fn):
+        started = time.perf_counter()
+        result = fn()
+        timings[stage] = time.perf_counter() - started
+        return result
+
+    raw = timed("fetch", fetch_excel_df)
+    df = timed("normalize", lambda: normalize(raw))
+    df["row_hash"] = timed("row_hash", lambda: row_hashes(df))
+    timed("upsert", lambda: db.upsert_samples(df, raw.attrs.get("source_path", "")))
+    # run_assign은 행마다 DEBUG 출력을 하므로 측정 중에는 버림
+    with open(os.devnull, "w", encoding="utf-8") as devnull, contextlib.redirect_stdout(devnull):
+        assigned = timed("assign", lambda: run_assign(df))
+
+    timings["total"] = sum(timings[s] for s in STAGES)
+    return timings, len(raw), len(assigned)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="스크래핑 전체 경로 벤치마크 (오프라인 대역 서버 사용)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000], help="엑셀 행 수 목록")
+    parser.add_argument("--latency-ms", type=int, default=0, help="대역 서버 응답 지연(ms)")
+    parser.add_argument("--repeat", type=int, default=3, help="크기별 반복 횟수 (중앙값 표시)")
+    parser.add_argument("--mode", choices=["auto", "browser"], default="auto", help="EIMS_DOWNLOAD_MODE")
+    parser.add_argument("--keep", action="store_true", help="임시 폴더를 지우지 않음")
+    args = parser.parse_args()
+
+    workdir = pathlib.Path(tempfile.mkdtemp(prefix="eims_bench_"))
+    (workdir / "storage" / "logs").mkdir(parents=True)
+    cwd = os.getcwd()
+    # scrape_eims/structured_logger는 임포트 시점의 작업 폴더 기준 storage/logs에 기록
+    os.chdir(workdir)
+
+    server = StandinServer(rows=args.sizes[0], latency_ms=args.latency_ms).start()
+    _prepare_env(server, workdir, args.mode)
+    try:
+        # 첫 실행은 로그인/세션 저장/엑셀출력 요청 캡처가 섞이므로 따로 실행하고 결과에서 제외
+        server.rows = 10
+        started = time.perf_counter()
+        run_pipeline(workdir / "storage" / "warmup.db")
+        print(f"워밍업(로그인 포함): {time.perf_counter() - started:.2f}s")
+
+        print(f"\n=== 전체 경로 벤치마크 (지연 {args.latency_ms}ms, 모드 {args.mode}, 반복 {args.repeat}회 중앙값) ===")
+        print(f"{'행 수':>8}" + "".join(f"{s + '(s)':>12}" for s in STAGES + ["total"]) + f"{'rows/s':>10}{'배정':>8}")
+        for size in args.sizes:
+            server.rows = size
+            runs = []
+            for i in range(args.repeat):
+                # 매번 빈 DB에서 시작 (신규 저장/배정 경로 측정)
+                runs.append(run_pipeline(workdir / "storage" / f"lab_{size}_{i}.db"))
+            medians = {s: statistics.median(r[0][s] for r in runs) for s in STAGES + ["total"]}
+            rows, assigned = runs[-1][1], runs[-1][2]
+            rate = rows / medians["total"] if medians["total"] else 0
+            print(f"{rows:>8}" + "".join(f"{medians[s]:>12.3f}" for s in STAGES + ["total"])
+                  + f"{rate:>10.0f}{assigned:>8}")
+        print(f"\n대역 서버 요청 수: {server.requests}")
+    finally:
+        server.stop()
+        os.chdir(cwd)
+        if args.keep:
+            print(f"임시 폴더: {workdir}")
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+배정 조회 쿼리 실행 계획 점검
+today_loads / 공유폴더 동기화 / 완료 처리 / 대시보드 쿼리의 EXPLAIN QUERY PLAN을 확인하여
+인덱스 없이 테이블 전체를 읽는(SCAN) 단계가 생기면 실패(종료 코드 1)로 알림
+기본은 schema.sql로 만든 빈 임시 DB(통계 없음)에서 확인하고, --db로 실제 DB도 확인 가능
+
+사용법:
+    python scripts/check_query_plans.py
+    python scripts/check_query_plans.py --db storage/lab.db
+"""
+
+import argparse
+import pathlib
+import re
+import sys
+import tempfile
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path: sys.path.insert(0, str(ROOT))
+
+from scripts import db
+from scripts.connection import connect, close
+from scripts.sync_to_shared import TODAY_ASSIGNMENTS_SQL, DASHBOARD_SQL
+from scripts.complete_tasks import RESEARCHER_TODAY_SQL
+
+# (이름, SQL, 파라미터, 허용하는 SCAN 단계) - 대시보드는 전체 건수도 세므로 커버링 인덱스 스캔만 허용
+CHECKS = [
+    ("today_loads", db.TODAY_LOADS_SQL, db.today_range(), ()),
+    ("create_today_assignments", TODAY_ASSIGNMENTS_SQL, db.today_range(), ()),
+    ("get_today_assignments", RESEARCHER_TODAY_SQL, ("연구원", *db.today_range()), ()),
+    ("create_dashboard", DASHBOARD_SQL, db.today_range(), ("SCAN assignments USING COVERING INDEX",)),
+]
+
+_FULL_SCAN = re.compile(r"^SCAN \w+")
+
+
+def query_plan(conn, sql, params):
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+
+def check(conn):
+    """쿼리별 (이름, 계획 목록, 문제 단계 목록)"""
+    results = []
+    for name, sql, params, allowed in CHECKS:
+        plan = query_plan(conn, sql, params)
+        problems = [step for step in plan
+                    if _FULL_SCAN.match(step) and not any(step.startswith(a) for a in allowed)]
+        results.append((name, plan, problems))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="배정 조회 쿼리 실행 계획 점검")
+    parser.add_argument("--db", help="점검할 DB 파일 (기본: schema.sql로 만든 빈 임시 DB)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db.DB_PATH = pathlib.Path(args.db) if args.db else pathlib.Path(tmp) / "plan_check.db"
+        try:
+            db.init_db()
+            results = check(connect(db.DB_PATH))
+        finally:
+            # 임시 폴더를 지우기 전에 닫아야 Windows에서 lab.db/-wal/-shm 삭제가 실패하지 않음
+            close(db.DB_PATH)
+
+    failed = 0
+    for name, plan, problems in results:
+        print(f"{'❌' if problems else '✅'} {name}")
+        for step in plan:
+            print(f"     {'!! ' if step in problems else ''}{step}")
+        failed += bool(problems)
+    if failed:
+        print(f"\n❌ 인덱스를 쓰지 않는 쿼리 {failed}개")
+        return 1
+    print("\n✅ 모든 쿼리가 인덱스를 사용합니다")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -7,16 +7,36 @@
 
 import os
 import sys
-import sqlite3
 import pandas as pd
 from pathlib import Path
 from datetime import datetime
 import logging
 
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path: sys.path.insert(0, str(ROOT))
+
+from scripts.connection import connect
+from scripts.db import today_range
+
 # 로깅 설정
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# 연구원의 오늘 배정 작업 (researcher, assigned_at 인덱스 범위 조회)
+RESEARCHER_TODAY_SQL = """
+    SELECT 
+        a.sample_no,
+        a.item,
+        a.assigned_at,
+        s.site_name,
+        s.collected_at
+    FROM assignments a
+    JOIN samples s ON s.sample_no = a.sample_no AND s.item = a.item
+    WHERE a.researcher = ? 
+    AND a.assigned_at >= ? AND a.assigned_at < ?
+    ORDER BY a.assigned_at
+"""
+
 class TaskCompletionHandler:
     def __init__(self, shared_path=r"\\samyang\homes\SAMYANG\Drive\SAMYANG\연구분석\공통분석실\데이터정리\1_TEST"):
         self.shared_path = Path(shared_path)
@@ -50,23 +70,9 @@ class TaskCompletionHandler:
     def get_today_assignments(self, researcher):
         """오늘 배정된 작업 목록 조회"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            
-            assignments = pd.read_sql_query("""
-                SELECT 
-                    a.sample_no,
-                    a.item,
-                    a.assigned_at,
-                    s.site_name,
-                    s.collected_at
-                FROM assignments a
-                JOIN samples s ON a.sample_no = s.sample_no
-                WHERE a.researcher = ? 
-                AND date(a.assigned_at) = date('now', 'localtime')
-                ORDER BY a.assigned_at
-            """, conn, params=(researcher,))
-            
-            conn.close()
+            conn = connect(self.db_path)
+            
+            assignments = pd.read_sql_query(RESEARCHER_TODAY_SQL, conn, params=(researcher, *today_range()))
             return assignments
             
         except Exception as e:
@@ -119,24 +125,21 @@ class TaskCompletionHandler:
             return
         
         try:
-            conn = sqlite3.connect(self.db_path)
-            
             completed_count = 0
-            for idx in completed_indices:
-                row = assignments.loc[idx]
-                
-                # 데이터베이스에 완료 상태 업데이트
-                conn.execute("""
-                    UPDATE assignments 
-                    SET status = 'completed', completed_at = ?
-                    WHERE sample_no = ? AND item = ? AND researcher = ?
-                """, (datetime.now(), row['sample_no'], row['item'], researcher))
-                
-                completed_count += 1
-                print(f"✅ 완료 처리: {row['sample_no']} - {row['item']}")
-            
-            conn.commit()
-            conn.close()
+            # 한 트랜잭션으로 처리 (실패하면 롤백되어 쓰기 잠금이 남지 않음)
+            with connect(self.db_path) as conn:
+                for idx in completed_indices:
+                    row = assignments.loc[idx]
+                    
+                    # 데이터베이스에 완료 상태 업데이트
+                    conn.execute("""
+                        UPDATE assignments 
+                        SET status = 'completed', completed_at = ?
+                        WHERE sample_no = ? AND item = ? AND researcher = ?
+                    """, (datetime.now(), row['sample_no'], row['item'], researcher))
+                    
+                    completed_count += 1
+                    print(f"✅ 완료 처리: {row['sample_no']} - {row['item']}")
             
             print(f"\n🎉 {completed_count}건의 작업이 완료 처리되었습니다!")
             
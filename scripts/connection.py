@@ -0,0 +1,65 @@
+"""
+lab.db 공용 연결 모듈
+
+모든 모듈은 sqlite3.connect 대신 connect()를 사용한다.
+- WAL 저널: 읽기(완료 처리, 공유폴더 동기화)와 쓰기(정시 작업)가 서로를 막지 않음
+- busy_timeout: 쓰기 잠금이 겹치면 바로 실패하지 않고 기다림
+- synchronous=NORMAL, cache_size, mmap_size 조정
+- 프로세스/스레드/DB 파일별로 연결을 하나 만들어 재사용 (close()하지 말고 `with conn:`으로 트랜잭션만 구분)
+
+WAL은 같은 PC의 로컬 디스크에서만 안전하므로 DB 파일을 공유폴더에 두지 않는다.
+"""
+
+import os
+import pathlib
+import sqlite3
+import threading
+
+BASE = pathlib.Path(__file__).resolve().parents[1]
+DB_PATH = BASE / "storage" / "lab.db"
+
+BUSY_TIMEOUT_MS = int(os.getenv("EIMS_DB_BUSY_TIMEOUT_MS", "30000"))
+CACHE_SIZE_KB = int(os.getenv("EIMS_DB_CACHE_KB", "65536"))
+MMAP_SIZE_MB = int(os.getenv("EIMS_DB_MMAP_MB", "256"))
+
+_local = threading.local()
+
+
+def _configure(conn: sqlite3.Connection) -> None:
+    conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+    conn.execute("PRAGMA journal_mode = WAL")  # DB 파일에 기록되므로 한 번 바뀌면 유지
+    conn.execute("PRAGMA synchronous = NORMAL")  # WAL에서는 체크포인트 시에만 fsync
+    conn.execute(f"PRAGMA cache_size = -{CACHE_SIZE_KB}")
+    conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE_MB * 1024 * 1024}")
+    conn.execute("PRAGMA temp_store = MEMORY")
+
+
+def _connections() -> dict:
+    """현재 스레드의 {DB 경로: 연결} (fork된 자식 프로세스는 부모 연결을 쓰지 않음)"""
+    if getattr(_local, "pid", None) != os.getpid():
+        _local.pid = os.getpid()
+        _local.connections = {}
+    return _local.connections
+
+
+def connect(path=None) -> sqlite3.Connection:
+    """설정이 적용된 연결 반환 (같은 스레드에서는 같은 연결을 재사용)"""
+    path = pathlib.Path(path or DB_PATH).resolve()
+    connections = _connections()
+    conn = connections.get(path)
+    if conn is None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT_MS / 1000)
+        _configure(conn)
+        connections[path] = conn
+    return conn
+
+
+def close(path=None) -> None:
+    """현재 스레드의 연결 닫기 (path가 없으면 전부) - 파일을 교체/삭제하기 전에 호출"""
+    connections = _connections()
+    targets = [pathlib.Path(path).resolve()] if path else list(connections)
+    for target in targets:
+        conn = connections.pop(target, None)
+        if conn is not None:
+            conn.close()
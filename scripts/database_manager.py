@@ -1,9 +1,16 @@
 import sqlite3
 import shutil
 import gzip
+import sys
+import tempfile
 from datetime import datetime, timedelta
 from pathlib import Path
 
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path: sys.path.insert(0, str(ROOT))
+
+from scripts.connection import connect
+
 class DatabaseManager:
     """데이터베이스 관리 클래스"""
     
@@ -18,23 +25,55 @@ class DatabaseManager:
             raise FileNotFoundError(f"데이터베이스 파일을 찾을 수 없습니다: {self.db_path}")
         
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        # 같은 초에 만든 백업(예: 복원 직전 백업)이 기존 파일을 덮어쓰지 않도록 구분
+        if any(self.backup_dir.glob(f"lab_backup_{timestamp}.*")):
+            timestamp += datetime.now().strftime("_%f")
         
+        # WAL 모드에서는 최근 변경이 -wal 파일에 있으므로 파일 복사 대신 SQLite 백업 API로 일관된 사본 생성
         if compress:
             backup_filename = f"lab_backup_{timestamp}.db.gz"
             backup_path = self.backup_dir / backup_filename
             
-            # 압축 백업
-            with open(self.db_path, 'rb') as f_in:
-                with gzip.open(backup_path, 'wb') as f_out:
-                    shutil.copyfileobj(f_in, f_out)
+            # 임시 사본을 만든 뒤 압축
+            with tempfile.TemporaryDirectory() as tmp:
+                snapshot = Path(tmp) / "lab.db"
+                self._copy_database(connect(self.db_path), snapshot)
+                with open(snapshot, 'rb') as f_in:
+                    with gzip.open(backup_path, 'wb') as f_out:
+                        shutil.copyfileobj(f_in, f_out)
         else:
             backup_filename = f"lab_backup_{timestamp}.db"
             backup_path = self.backup_dir / backup_filename
-            shutil.copy2(self.db_path, backup_path)
+            self._copy_database(connect(self.db_path), backup_path)
         
         print(f"✅ 데이터베이스 백업 완료: {backup_path}")
         return backup_path
     
+    @staticmethod
+    def _copy_database(source, target_path):
+        """연결된 DB 전체를 target_path 파일로 복사 (다른 연결이 쓰는 중에도 일관된 시점)"""
+        target = sqlite3.connect(target_path)
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+    
+    def _restore_from(self, backup_path):
+        """백업 파일(.db 또는 .db.gz) 내용을 사용 중인 DB에 덮어쓰기 (파일 교체 대신 백업 API 사용)"""
+        with tempfile.TemporaryDirectory() as tmp:
+            if backup_path.suffix == '.gz':
+                # 압축 해제 후 복원
+                snapshot = Path(tmp) / "lab.db"
+                with gzip.open(backup_path, 'rb') as f_in:
+                    with open(snapshot, 'wb') as f_out:
+                        shutil.copyfileobj(f_in, f_out)
+                backup_path = snapshot
+            source = sqlite3.connect(backup_path)
+            try:
+                source.backup(connect(self.db_path))
+            finally:
+                source.close()
+    
     def cleanup_old_backups(self, retention_days=30):
         """오래된 백업 파일 정리"""
         cutoff_date = datetime.now() - timedelta(days=retention_days)
@@ -72,14 +111,7 @@ class DatabaseManager:
         current_backup = self.backup_database()
         
         try:
-            if backup_path.suffix == '.gz':
-                # 압축 해제 후 복원
-                with gzip.open(backup_path, 'rb') as f_in:
-                    with open(self.db_path, 'wb') as f_out:
-                        shutil.copyfileobj(f_in, f_out)
-            else:
-                # 직접 복사
-                shutil.copy2(backup_path, self.db_path)
+            self._restore_from(backup_path)
             
             print(f"✅ 데이터베이스 복원 완료: {backup_filename}")
             print(f"📋 복원 전 백업: {current_backup}")
@@ -88,7 +120,7 @@ class DatabaseManager:
             print(f"❌ 복원 실패: {e}")
             # 복원 전 상태로 되돌리기
             if current_backup.exists():
-                shutil.copy2(current_backup, self.db_path)
+                self._restore_from(current_backup)
                 print("🔄 복원 전 상태로 되돌렸습니다.")
 
 # 사용 예시
@@ -1,62 +1,281 @@
 import sqlite3, pathlib
-from datetime import datetime
+from datetime import datetime, timedelta
+
+import pandas as pd
 
 from pandas.io import sql
 from sqlalchemy.sql.functions import now
 
+from .connection import connect, DB_PATH
+from . import migrations
+
 BASE = pathlib.Path(__file__).resolve().parents[1]
-DB_PATH = BASE / "storage" / "lab.db"
 DB_PATH.parent.mkdir(parents=True, exist_ok=True)
 
 
 def init_db():
-    with sqlite3.connect(DB_PATH) as conn:
-        sql = (BASE / "sql" / "schema.sql").read_text(encoding="utf-8")
-        conn.executescript(sql)
+    """테이블 생성(schema.sql) 후 대기 중인 스키마 마이그레이션 적용"""
+    conn = connect(DB_PATH)
+    sql = (BASE / "sql" / "schema.sql").read_text(encoding="utf-8")
+    conn.executescript(sql)
+    migrations.migrate(conn)
+
+# upsert_samples가 저장하는 컬럼과, 그중 내용 변경 판단에 쓰는 컬럼 (raw_path/created_at 제외)
+_SAMPLE_COLUMNS = ["sample_no", "site_name", "collected_at", "kind", "item", "status", "uniq_key", "raw_path", "row_hash"]
+_CONTENT_COLUMNS = ["sample_no", "site_name", "collected_at", "kind", "item", "status", "row_hash"]
+
+def _content_differs(old, new):
+    """SQL 조건: 기존 행과 새 행의 내용이 다르거나 기존 행이 삭제 표시됨 (NULL도 비교)"""
+    return " OR ".join([f"{old}.{c} IS NOT {new}.{c}" for c in _CONTENT_COLUMNS] + [f"{old}.removed_at IS NOT NULL"])
 
 def upsert_samples(df, source_path:str):
+    """표준화된 행을 한 트랜잭션으로 일괄 저장하고 {"inserted", "updated", "unchanged"} 건수 반환
+
+    임시 테이블에 executemany로 넣은 뒤 한 번의 INSERT ... ON CONFLICT로 합치며,
+    내용이 같은 행은 건드리지 않는다 (created_at은 처음 저장한 시각 유지).
+    df에 raw_path 컬럼이 있으면 행별 원본 경로로 사용하고, uniq_key가 중복되면 마지막 행을 쓴다.
+    """
+    counts = {"inserted": 0, "updated": 0, "unchanged": 0}
+    if df is None or len(df) == 0:
+        return counts
+    frame = df.reindex(columns=_SAMPLE_COLUMNS).astype(object)
+    if "raw_path" not in df.columns:
+        frame["raw_path"] = source_path
+    frame = frame.drop_duplicates(subset="uniq_key", keep="last")
+    frame = frame.where(frame.notna(), None)
+
     now = datetime.now().isoformat(timespec="seconds")
-    with sqlite3.connect(DB_PATH) as conn:
-        for _, row in df.iterrows():
-            conn.execute("""
-                INSERT INTO samples (sample_no, site_name, collected_at, kind, item, status, uniq_key, raw_path, created_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ON CONFLICT(uniq_key) DO UPDATE SET
-                site_name=excluded.site_name,
-                collected_at=excluded.collected_at,
-                kind=excluded.kind,
-                item=excluded.item,
-                status=excluded.status,
-                raw_path=excluded.raw_path,
-                created_at=excluded.created_at
-            """, (row.get("sample_no"), row.get("site_name"), row.get("collected_at"), row.get("kind"), row.get("item"), row.get("status"), row.get("uniq_key"), source_path, now))
+    columns = ", ".join(_SAMPLE_COLUMNS)
+    with connect(DB_PATH) as conn:
+        conn.execute(f"CREATE TEMP TABLE IF NOT EXISTS incoming_samples ({columns})")
+        conn.execute("DELETE FROM incoming_samples")
+        conn.executemany(
+            f"INSERT INTO incoming_samples ({columns}) VALUES ({', '.join('?' * len(_SAMPLE_COLUMNS))})",
+            frame.itertuples(index=False, name=None),
+        )
+        inserted, updated, unchanged = conn.execute(f"""
+            SELECT COALESCE(SUM(s.id IS NULL), 0),
+                   COALESCE(SUM(s.id IS NOT NULL AND ({_content_differs("s", "i")})), 0),
+                   COALESCE(SUM(s.id IS NOT NULL AND NOT ({_content_differs("s", "i")})), 0)
+            FROM incoming_samples i LEFT JOIN samples s ON s.uniq_key = i.uniq_key
+        """).fetchone()
+        conn.execute(f"""
+            INSERT INTO samples ({columns}, created_at)
+            SELECT {columns}, ? FROM incoming_samples WHERE true
+            ON CONFLICT(uniq_key) DO UPDATE SET
+            sample_no=excluded.sample_no,
+            site_name=excluded.site_name,
+            collected_at=excluded.collected_at,
+            kind=excluded.kind,
+            item=excluded.item,
+            status=excluded.status,
+            raw_path=excluded.raw_path,
+            row_hash=excluded.row_hash,
+            removed_at=NULL
+            WHERE {_content_differs("samples", "excluded")}
+        """, (now,))
+        conn.execute("DELETE FROM incoming_samples")
+    counts.update(inserted=inserted, updated=updated, unchanged=unchanged)
+    return counts
 
+def get_row_hashes(keys, batch_size=500):
+    """uniq_key별 저장된 행 해시 조회 {uniq_key: row_hash} (삭제 표시된 행 제외)"""
+    keys = list(keys)
+    found = {}
+    with connect(DB_PATH) as conn:
+        for i in range(0, len(keys), batch_size):
+            batch = keys[i:i + batch_size]
+            placeholders = ",".join("?" * len(batch))
+            cur = conn.execute(f"""
+                SELECT uniq_key, row_hash FROM samples
+                WHERE uniq_key IN ({placeholders}) AND removed_at IS NULL
+            """, batch)
+            found.update(cur.fetchall())
+    return found
 
-def today_loads():
-    with sqlite3.connect(DB_PATH) as conn:
+def get_unassigned_keys(keys, batch_size=500):
+    """keys 중 저장은 됐지만 배정이 없는 행의 uniq_key 집합 (삭제 표시된 행 제외)
+
+    저장 후 배정 전에 실패한 실행의 행을 다음 실행에서 다시 배정하는 데 사용
+    """
+    keys = list(keys)
+    found = set()
+    with connect(DB_PATH) as conn:
+        for i in range(0, len(keys), batch_size):
+            batch = keys[i:i + batch_size]
+            placeholders = ",".join("?" * len(batch))
+            cur = conn.execute(f"""
+                SELECT s.uniq_key FROM samples s
+                WHERE s.uniq_key IN ({placeholders}) AND s.removed_at IS NULL
+                AND NOT EXISTS (
+                    SELECT 1 FROM assignments a WHERE a.sample_no IS s.sample_no AND a.item IS s.item
+                )
+            """, batch)
+            found.update(r[0] for r in cur.fetchall())
+    return found
+
+def get_window_keys(date_from, date_to):
+    """채취일이 조회기간(YYYY-MM-DD, 양 끝 포함) 안에 있는 현재 행의 uniq_key 집합"""
+    end = (datetime.strptime(date_to, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
+    with connect(DB_PATH) as conn:
         cur = conn.execute("""
-            SELECT researcher, COUNT(*)
-            FROM assignments
-            WHERE date(assigned_at) = date('now', 'localtime')
-            GROUP BY researcher
-        """)
+            SELECT uniq_key FROM samples
+            WHERE collected_at >= ? AND collected_at < ? AND removed_at IS NULL
+        """, (date_from, end))
+        return {r[0] for r in cur.fetchall()}
+
+def mark_removed(keys, batch_size=500):
+    """원본에서 사라진 행에 삭제 시각 표시 (행은 남겨 두고, 다시 나타나면 upsert에서 해제)"""
+    keys = list(keys)
+    now = datetime.now().isoformat(timespec="seconds")
+    with connect(DB_PATH) as conn:
+        for i in range(0, len(keys), batch_size):
+            batch = keys[i:i + batch_size]
+            placeholders = ",".join("?" * len(batch))
+            conn.execute(f"""
+                UPDATE samples SET removed_at = ? WHERE uniq_key IN ({placeholders}) AND removed_at IS NULL
+            """, [now, *batch])
+
+# iter_samples가 반환하는 컬럼 (run_assign 등 배정에 필요한 시료 정보)
+_QUERY_COLUMNS = ["id", "sample_no", "site_name", "collected_at", "kind", "item", "status", "uniq_key"]
+
+def _in_filter(column, value, where, params):
+    """값 하나 또는 목록을 = / IN 조건으로 추가 (None이면 조건 없음)"""
+    if value is None:
+        return
+    values = [value] if isinstance(value, str) else list(value)
+    where.append(f"{column} IN ({','.join('?' * len(values))})")
+    params.extend(values)
+
+def iter_samples(date_from=None, date_to=None, status=None, item=None, site=None,
+                 chunk_size=5000, include_removed=False):
+    """조건에 맞는 시료를 chunk_size행씩 DataFrame으로 반환하는 제너레이터 (id 순)
+
+    date_from/date_to는 채취일(YYYY-MM-DD, 양 끝 포함), status/item/site는 값 하나 또는 목록.
+    커서에서 fetchmany로 필요한 만큼만 읽으므로 테이블 크기와 무관하게 한 번에 chunk_size행만 메모리에 둔다.
+    """
+    where, params = [], []
+    if date_from:
+        where.append("collected_at >= ?")
+        params.append(date_from)
+    if date_to:
+        end = (datetime.strptime(date_to, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
+        where.append("collected_at < ?")
+        params.append(end)
+    _in_filter("status", status, where, params)
+    _in_filter("item", item, where, params)
+    _in_filter("site_name", site, where, params)
+    if not include_removed:
+        where.append("removed_at IS NULL")
+
+    query = f"SELECT {', '.join(_QUERY_COLUMNS)} FROM samples"
+    if where:
+        query += " WHERE " + " AND ".join(where)
+    cur = connect(DB_PATH).execute(query + " ORDER BY id", params)
+    try:
+        while True:
+            rows = cur.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield pd.DataFrame.from_records(rows, columns=_QUERY_COLUMNS)
+    finally:
+        cur.close()
+
+def get_samples_df(**filters):
+    """iter_samples와 같은 조건의 결과를 DataFrame 하나로 반환 (작은 조회용, 대량 처리는 iter_samples 사용)"""
+    chunks = list(iter_samples(**filters))
+    if not chunks:
+        return pd.DataFrame(columns=_QUERY_COLUMNS)
+    return pd.concat(chunks, ignore_index=True)
+
+def last_download():
+    """마지막으로 처리(또는 no-op 판정)된 다운로드의 지문"""
+    with connect(DB_PATH) as conn:
+        cur = conn.cursor()
+        cur.row_factory = sqlite3.Row  # 공유 연결이므로 연결이 아닌 커서에만 적용
+        row = cur.execute("""
+            SELECT path, file_sha256, rows_sha256, row_count, changed_rows, status, created_at
+            FROM downloads ORDER BY id DESC LIMIT 1
+        """).fetchone()
+        return dict(row) if row else None
+
+def record_download(path, file_sha256, rows_sha256, row_count, changed_rows, status):
+    """다운로드 지문 기록 (status: processed / noop)"""
+    now = datetime.now().isoformat(timespec="seconds")
+    with connect(DB_PATH) as conn:
+        conn.execute("""
+            INSERT INTO downloads (path, file_sha256, rows_sha256, row_count, changed_rows, status, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, (str(path), file_sha256, rows_sha256, row_count, changed_rows, status, now))
+
+def get_watermark(name="samples"):
+    """마지막으로 수집 완료된 시점 (YYYY-MM-DD, 없으면 None)"""
+    with connect(DB_PATH) as conn:
+        row = conn.execute("SELECT value FROM watermarks WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+def set_watermark(value, name="samples"):
+    """수집 완료 시점 갱신 (기존 값보다 뒤로 돌아가지 않음)"""
+    now = datetime.now().isoformat(timespec="seconds")
+    with connect(DB_PATH) as conn:
+        conn.execute("""
+            INSERT INTO watermarks (name, value, updated_at) VALUES (?, ?, ?)
+            ON CONFLICT(name) DO UPDATE SET
+            value=max(value, excluded.value),
+            updated_at=excluded.updated_at
+        """, (name, value, now))
+
+
+def today_range():
+    """오늘 하루의 반열린 구간 (오늘, 내일) - assigned_at >= ? AND assigned_at < ? 에 사용
+
+    date(assigned_at) = date('now', 'localtime')처럼 컬럼을 함수로 감싸면 인덱스를 쓰지 못하므로
+    저장 형식(YYYY-MM-DDTHH:MM:SS)과 같은 문자열 범위로 비교한다.
+    """
+    today = datetime.now().date()
+    return today.isoformat(), (today + timedelta(days=1)).isoformat()
+
+TODAY_LOADS_SQL = """
+    SELECT researcher, COUNT(*)
+    FROM assignments
+    WHERE assigned_at >= ? AND assigned_at < ?
+    GROUP BY researcher
+"""
+
+def today_loads():
+    with connect(DB_PATH) as conn:
+        cur = conn.execute(TODAY_LOADS_SQL, today_range())
         return dict(cur.fetchall())
 
-def get_existing_assignments():
-    """이미 배정된 작업 조회 (sample_no_item 키 형태로 반환)"""
-    with sqlite3.connect(DB_PATH) as conn:
-        cur = conn.execute("""
-            SELECT DISTINCT sample_no || '_' || item as key
-            FROM assignments
-        """)
-        return set(row[0] for row in cur.fetchall())
+def get_existing_assignments(pairs=None, batch_size=400):
+    """이미 배정된 작업 조회 (sample_no_item 키 형태로 반환)
+
+    pairs((sample_no, item) 목록)를 주면 그 안에서만 조회하여, 배정 전체를 메모리에 올리지 않는다.
+    """
+    with connect(DB_PATH) as conn:
+        if pairs is None:
+            cur = conn.execute("""
+                SELECT DISTINCT sample_no || '_' || item as key
+                FROM assignments
+            """)
+            return set(row[0] for row in cur.fetchall())
+        pairs = list(pairs)
+        found = set()
+        for i in range(0, len(pairs), batch_size):
+            batch = pairs[i:i + batch_size]
+            values = ",".join(["(?, ?)"] * len(batch))
+            cur = conn.execute(f"""
+                SELECT sample_no || '_' || item FROM assignments
+                WHERE (sample_no, item) IN (VALUES {values})
+            """, [v for pair in batch for v in pair])
+            found.update(row[0] for row in cur.fetchall())
+        return found
 
 def save_assignments(rows):
     now = datetime.now().isoformat(timespec="seconds")
-    with sqlite3.connect(DB_PATH) as conn:
-        for r in rows:
-            conn.execute("""
-            INSERT OR IGNORE INTO assignments (sample_no, item, researcher, assigned_at, method)
-            VALUES (?, ?, ?, ?, ?)
-            """, (r.get("sample_no"), r.get("item"), r.get("researcher"), now, r.get("method", "rule+rr")))
-    
\ No newline at end of file
+    with connect(DB_PATH) as conn:
+        conn.executemany("""
+        INSERT OR IGNORE INTO assignments (sample_no, item, researcher, assigned_at, method)
+        VALUES (?, ?, ?, ?, ?)
+        """, [(r.get("sample_no"), r.get("item"), r.get("researcher"), now, r.get("method", "rule+rr"))
+              for r in rows])
@@ -0,0 +1,226 @@
+"""
+EIMS 엑셀출력 요청 직접 재생 (브라우저 없이 HTTP로 다운로드)
+
+브라우저 경로에서 '엑셀출력' 클릭 시 발생한 요청(메서드/URL/폼 데이터)을
+레시피로 저장해 두고, 저장된 세션 쿠키와 함께 같은 요청을 재생한다.
+응답 본문은 메모리에 올리지 않고 청크 단위로 파일에 바로 기록한다.
+"""
+
+import json
+import logging
+import pathlib
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+# 엑셀 파일 시그니처 (xlsx: zip, xls: OLE2)
+EXCEL_MAGICS = (b"PK\x03\x04", b"\xd0\xcf\x11\xe0")
+# 재생 시 그대로 넘길 요청 헤더
+REPLAY_HEADERS = ("content-type", "referer", "origin", "accept", "accept-language", "user-agent")
+
+_local = threading.local()
+
+
+class DirectExportError(Exception):
+    """직접 다운로드 실패 (세션 만료, HTML 응답 등) - 브라우저 경로로 대체해야 함"""
+
+
+def get_session(pool_size=8):
+    """스레드별로 재사용되는 커넥션 풀 세션"""
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        _local.session = session
+    return session
+
+
+def load_cookies(session, state_path):
+    """Playwright storage_state 파일의 쿠키를 requests 세션에 복원"""
+    state_path = pathlib.Path(state_path)
+    if not state_path.exists():
+        raise DirectExportError(f"저장된 세션이 없습니다: {state_path}")
+    state = json.loads(state_path.read_text(encoding="utf-8"))
+    now = time.time()
+    loaded = 0
+    for c in state.get("cookies", []):
+        expires = c.get("expires", -1)
+        if expires not in (-1, None) and expires < now:
+            continue
+        session.cookies.set(
+            c["name"], c["value"],
+            domain=c.get("domain", ""), path=c.get("path", "/"),
+            secure=c.get("secure", False),
+        )
+        loaded += 1
+    if not loaded:
+        raise DirectExportError("유효한 세션 쿠키가 없습니다.")
+    return loaded
+
+
+def load_recipe(path):
+    """저장된 엑셀출력 요청 레시피 로드 (없으면 None)"""
+    path = pathlib.Path(path)
+    if not path.exists():
+        return None
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        logger.warning(f"엑셀출력 요청 레시피를 읽을 수 없음: {e}")
+        return None
+
+
+def save_recipe(path, request, **extra):
+    """Playwright Request 객체에서 재생에 필요한 정보만 추려 저장"""
+    headers = {k: v for k, v in request.headers.items() if k.lower() in REPLAY_HEADERS}
+    recipe = {
+        "method": request.method,
+        "url": request.url,
+        "post_data": request.post_data,
+        "headers": headers,
+        "captured_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        **extra,
+    }
+    path = pathlib.Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(recipe, ensure_ascii=False, indent=2), encoding="utf-8")
+    return recipe
+
+
+# 조회기간 폼 필드 이름 (레시피에 캡처 당시 입력란 이름이 있으면 그것을 사용)
+DATE_FROM_PARAMS = ("dateFrom", "date_from", "startDate", "searchSdate")
+DATE_TO_PARAMS = ("dateTo", "date_to", "endDate", "searchEdate")
+
+
+def _date_forms(d):
+    """같은 날짜의 표기 변형 (2025-10-21, 20251021, 2025.10.21, 2025/10/21)"""
+    return [d, d.replace("-", ""), d.replace("-", "."), d.replace("-", "/")]
+
+
+def _substitute_query(query, fields, replaced):
+    """fields({필드 이름: (이전 날짜, 새 날짜)})에 해당하는 값만 같은 표기의 새 날짜로 교체
+
+    교체한 필드 이름은 replaced에 추가한다.
+    """
+    pairs = []
+    for key, value in parse_qsl(query, keep_blank_values=True):
+        if key in fields:
+            old, new = fields[key]
+            for old_form, new_form in zip(_date_forms(old), _date_forms(new)):
+                if value == old_form:
+                    value = new_form
+                    replaced.add(key)
+                    break
+        pairs.append((key, value))
+    return urlencode(pairs)
+
+
+def with_dates(recipe, date_from, date_to):
+    """캡처 당시의 조회기간을 date_from~date_to로 바꾼 레시피 사본 반환
+
+    조회기간 필드(DATE_FROM_PARAMS/DATE_TO_PARAMS 또는 레시피의 from_param/to_param)만 바꾸며,
+    시작일과 종료일을 모두 바꾸지 못하면 이전 기간을 그대로 받게 되므로 DirectExportError를 낸다.
+    """
+    old_from, old_to = recipe.get("date_from"), recipe.get("date_to")
+    if not old_from or not old_to:
+        raise DirectExportError("레시피에 조회기간 정보가 없어 기간을 바꿀 수 없습니다.")
+
+    from_params = [recipe["from_param"]] if recipe.get("from_param") else DATE_FROM_PARAMS
+    to_params = [recipe["to_param"]] if recipe.get("to_param") else DATE_TO_PARAMS
+    fields = {name: (old_from, date_from) for name in from_params}
+    fields.update({name: (old_to, date_to) for name in to_params})
+    replaced = set()
+
+    new = dict(recipe, date_from=date_from, date_to=date_to)
+    parts = urlsplit(recipe["url"])
+    if parts.query:
+        query = _substitute_query(parts.query, fields, replaced)
+        new["url"] = urlunsplit(parts._replace(query=query))
+    content_type = (recipe.get("headers") or {}).get("content-type", "")
+    if recipe.get("post_data") and "json" not in content_type.lower():
+        new["post_data"] = _substitute_query(recipe["post_data"], fields, replaced)
+
+    missing = [label for label, names in (("시작일", from_params), ("종료일", to_params))
+               if not replaced.intersection(names)]
+    if missing:
+        raise DirectExportError(f"엑셀출력 요청에서 조회기간({', '.join(missing)})을 찾지 못했습니다.")
+    return new
+
+
+def download_export(recipe, save_to, session=None, timeout=60, chunk_size=64 * 1024):
+    """레시피대로 엑셀출력 요청을 보내고 응답을 save_to에 스트리밍 저장, 받은 바이트 수 반환"""
+    session = session or get_session()
+    save_to = pathlib.Path(save_to)
+    tmp_path = save_to.with_name(save_to.name + ".part")
+    post_data = recipe.get("post_data")
+
+    try:
+        resp = session.request(
+            recipe.get("method", "GET"),
+            recipe["url"],
+            data=post_data.encode("utf-8") if post_data else None,
+            headers=recipe.get("headers") or {},
+            stream=True,
+            timeout=timeout,
+        )
+    except requests.RequestException as e:
+        raise DirectExportError(f"엑셀출력 요청 실패: {e}") from e
+
+    with resp:
+        if resp.status_code != 200:
+            raise DirectExportError(f"엑셀출력 응답 코드 {resp.status_code}")
+        content_type = resp.headers.get("Content-Type", "").lower()
+        if "text/html" in content_type:
+            # 세션이 만료되면 로그인 페이지 HTML이 내려옴
+            raise DirectExportError(f"엑셀 대신 HTML 응답 (세션 만료 가능성): {resp.url}")
+
+        size = 0
+        try:
+            with open(tmp_path, "wb") as f:
+                for chunk in resp.iter_content(chunk_size=chunk_size):
+                    if not chunk:
+                        continue
+                    if size == 0 and not chunk.startswith(EXCEL_MAGICS):
+                        raise DirectExportError("응답이 엑셀 파일 형식이 아닙니다.")
+                    f.write(chunk)
+                    size += len(chunk)
+            if size == 0:
+                raise DirectExportError("응답 본문이 비어 있습니다.")
+            tmp_path.replace(save_to)
+        except (requests.RequestException, OSError) as e:
+            raise DirectExportError(f"응답 저장 실패: {e}") from e
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+    return size
+
+
+def probe_url(url, timeout=5):
+    """가벼운 접속 확인: 응답 헤더까지의 시간(초), 접속 불가/5xx면 None (본문은 받지 않음)"""
+    started = time.perf_counter()
+    try:
+        with requests.get(url, timeout=timeout, stream=True, allow_redirects=True) as r:
+            if r.status_code >= 500:
+                return None
+    except requests.RequestException:
+        return None
+    return time.perf_counter() - started
+
+
+def probe_urls(urls, timeout=5):
+    """후보 URL을 동시에 확인하여 {url: 응답시간(초) 또는 None} 반환"""
+    urls = list(urls)
+    if not urls:
+        return {}
+    with ThreadPoolExecutor(max_workers=len(urls)) as pool:
+        return dict(zip(urls, pool.map(lambda u: probe_url(u, timeout), urls)))
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+오프라인 EIMS 대역 서버
+실제 EIMS 사이트 없이 fetch_excel_df 전체 경로(로그인 → notify.do → field_water.do → 엑셀출력)를
+실행할 수 있도록 같은 경로/선택자를 가진 페이지와 지정한 행 수의 xlsx를 내려주는 로컬 HTTP 서버
+응답마다 지연(ms)을 넣어 느린 사이트 상황도 재현 가능
+
+사용법:
+    python scripts/eims_standin.py --port 8765 --rows 5000 --latency-ms 200
+    # 다른 터미널에서 (대역 서버를 대상으로 스크래핑)
+    set EIMS_LOGIN_URLS=http://127.0.0.1:8765/init.go
+    set EIMS_FIELD_URL=http://127.0.0.1:8765/ms/field_water.do
+
+--pages-dir 폴더에 init.go.html, notify.do.html, field_water.do.html 파일이 있으면
+내장 페이지 대신 그 파일(실제 사이트에서 저장한 페이지)을 내려준다.
+"""
+
+import argparse
+import io
+import pathlib
+import random
+import secrets
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+SESSION_COOKIE = "JSESSIONID"
+
+# 생성 데이터에 쓰는 측정항목 (sql/item_rules.csv의 담당자별 항목이 고루 섞이도록)
+SAMPLE_ITEMS = [
+    "총질소", "총인", "부유물질", "화학적산소요구량", "생물화학적산소요구량",
+    "수소이온농도", "총유기탄소", "구리", "납", "아연", "노말헥산 추출물질",
+    "색도", "탁도", "총대장균군", "벤젠", "톨루엔", "페놀류", "시안",
+]
+SAMPLE_SITES = ["A하수처리장", "B폐수처리시설", "C정수장", "D산업단지", "E축산처리장"]
+SAMPLE_KINDS = ["방류수", "유입수", "원수"]
+EXPORT_HEADER = ["접수번호", "측정대상사업장", "채취일시", "종류", "측정항목", "상태"]
+
+LOGIN_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>EIMS 로그인</title>
+<link rel="stylesheet" href="/static/style.css"></head>
+<body>
+<form method="post" action="/loginProc.go">
+  <input type="text" id="editx_emp_id" name="editx_emp_id">
+  <input type="password" id="old_password" name="old_password">
+  <button type="submit">로그인</button>
+</form>
+</body></html>
+"""
+
+NOTIFY_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>공지사항</title>
+<link rel="stylesheet" href="/static/style.css"></head>
+<body><h1>공지사항</h1><a href="/ms/field_water.do">현장수질</a><img src="/static/logo.png"></body></html>
+"""
+
+FIELD_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>현장수질</title>
+<link rel="stylesheet" href="/static/style.css"></head>
+<body>
+<form id="searchForm" method="post" action="/ms/field_water_excel.do">
+  <input type="text" id="dateFrom" name="dateFrom" value="{date_from}">
+  <input type="text" id="dateTo" name="dateTo" value="{date_to}">
+  <button type="button" onclick="location.href='/ms/field_water.do?dateFrom='
+    + document.getElementById('dateFrom').value + '&dateTo=' + document.getElementById('dateTo').value">조회</button>
+  <button type="submit">엑셀출력</button>
+</form>
+<img src="/static/logo.png">
+</body></html>
+"""
+
+
+def build_export(rows, date_from, date_to, seed=0):
+    """EIMS 엑셀출력과 같은 형식(제목 행 + 헤더 행 + 데이터)의 xlsx 바이트 생성"""
+    from openpyxl import Workbook
+
+    rng = random.Random(f"{seed}:{date_from}:{date_to}")
+    start = datetime.strptime(date_from, "%Y-%m-%d")
+    span_days = max(1, (datetime.strptime(date_to, "%Y-%m-%d") - start).days + 1)
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("현장수질")
+    ws.append([f"현장수질 측정 현황 ({date_from} ~ {date_to})"])
+    ws.append(EXPORT_HEADER)
+
+    # 시료 하나에 측정항목 여러 개 (실제 엑셀처럼 접수번호가 반복)
+    sample = 0
+    written = 0
+    while written < rows:
+        sample += 1
+        sample_no = f"{start:%Y%m%d}-{sample:06d}"
+        site = rng.choice(SAMPLE_SITES)
+        kind = rng.choice(SAMPLE_KINDS)
+        collected = start + timedelta(days=rng.randrange(span_days), minutes=rng.randrange(24 * 60))
+        for item in rng.sample(SAMPLE_ITEMS, min(rows - written, rng.randint(3, 8))):
+            ws.append([sample_no, site, collected.strftime("%Y-%m-%d %H:%M"), kind, item, "접수"])
+            written += 1
+
+    buf = io.BytesIO()
+    wb.save(buf)
+    return buf.getvalue()
+
+
+class StandinServer:
+    """백그라운드 스레드에서 도는 대역 서버
+
+    rows, latency_ms는 실행 중에도 바꿀 수 있다 (벤치마크에서 크기별로 재사용).
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, rows=1000, latency_ms=0, pages_dir=None):
+        self.rows = rows
+        self.latency_ms = latency_ms
+        self.pages_dir = pathlib.Path(pages_dir) if pages_dir else None
+        self.sessions = set()
+        self.requests = 0
+        self._exports = {}
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def login_url(self):
+        return f"{self.base_url}/init.go"
+
+    @property
+    def field_url(self):
+        return f"{self.base_url}/ms/field_water.do"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def page(self, name, default):
+        if self.pages_dir and (self.pages_dir / f"{name}.html").exists():
+            return (self.pages_dir / f"{name}.html").read_text(encoding="utf-8")
+        return default
+
+    def export_bytes(self, date_from, date_to):
+        """같은 조건의 엑셀은 한 번만 생성 (생성 시간이 측정에 섞이지 않도록)"""
+        key = (self.rows, date_from, date_to)
+        with self._lock:
+            if key not in self._exports:
+                self._exports[key] = build_export(self.rows, date_from, date_to)
+            return self._exports[key]
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _delay(self):
+                with server._lock:
+                    server.requests += 1
+                if server.latency_ms:
+                    time.sleep(server.latency_ms / 1000)
+
+            def _logged_in(self):
+                for part in self.headers.get("Cookie", "").split(";"):
+                    name, _, value = part.strip().partition("=")
+                    if name == SESSION_COOKIE and value in server.sessions:
+                        return True
+                return False
+
+            def _send(self, status, body=b"", content_type="text/html; charset=utf-8", headers=None):
+                if isinstance(body, str):
+                    body = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _redirect(self, location, headers=None):
+                self._send(302, b"", headers=dict(headers or {}, Location=location))
+
+            def _form(self):
+                length = int(self.headers.get("Content-Length", 0))
+                return {k: v[0] for k, v in parse_qs(self.rfile.read(length).decode("utf-8")).items()}
+
+            def do_GET(self):
+                self._delay()
+                url = urlsplit(self.path)
+                query = {k: v[0] for k, v in parse_qs(url.query).items()}
+
+                if url.path in ("/", "/init.go"):
+                    self._send(200, server.page("init.go", LOGIN_PAGE))
+                elif url.path.startswith("/static/"):
+                    self._send(200, b"\0" * 2048, "application/octet-stream")
+                elif not self._logged_in():
+                    self._redirect("/init.go")
+                elif url.path == "/ms/public/notify.do":
+                    self._send(200, server.page("notify.do", NOTIFY_PAGE))
+                elif url.path == "/ms/field_water.do":
+                    today = datetime.now().strftime("%Y-%m-%d")
+                    html = server.page("field_water.do", FIELD_PAGE)
+                    self._send(200, html.replace("{date_from}", query.get("dateFrom", today))
+                                        .replace("{date_to}", query.get("dateTo", today)))
+                else:
+                    self._send(404, "not found", "text/plain; charset=utf-8")
+
+            def do_POST(self):
+                self._delay()
+                url = urlsplit(self.path)
+                form = self._form()
+
+                if url.path == "/loginProc.go":
+                    if not form.get("editx_emp_id") or not form.get("old_password"):
+                        self._redirect("/init.go?error=1")
+                        return
+                    token = secrets.token_hex(16)
+                    with server._lock:
+                        server.sessions.add(token)
+                    self._redirect("/ms/public/notify.do",
+                                   {"Set-Cookie": f"{SESSION_COOKIE}={token}; Path=/; HttpOnly"})
+                elif not self._logged_in():
+                    # 실제 사이트처럼 세션 만료 시 엑셀 대신 로그인 HTML 반환
+                    self._send(200, server.page("init.go", LOGIN_PAGE))
+                elif url.path == "/ms/field_water_excel.do":
+                    today = datetime.now().strftime("%Y-%m-%d")
+                    body = server.export_bytes(form.get("dateFrom", today), form.get("dateTo", today))
+                    self._send(200, body,
+                               "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                               {"Content-Disposition": 'attachment; filename="field_water.xlsx"'})
+                else:
+                    self._send(404, "not found", "text/plain; charset=utf-8")
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="오프라인 EIMS 대역 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--rows", type=int, default=1000, help="엑셀출력 행 수")
+    parser.add_argument("--latency-ms", type=int, default=0, help="응답마다 넣을 지연(ms)")
+    parser.add_argument("--pages-dir", help="저장된 실제 페이지(init.go.html 등) 폴더")
+    args = parser.parse_args()
+
+    server = StandinServer(args.host, args.port, args.rows, args.latency_ms, args.pages_dir)
+    print(f"EIMS 대역 서버: {server.login_url} (행 {args.rows}, 지연 {args.latency_ms}ms)")
+    print(f"  EIMS_LOGIN_URLS={server.login_url}")
+    print(f"  EIMS_FIELD_URL={server.field_url}")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,158 @@
+import os
+import pathlib
+import numpy as np
+import pandas as pd
+from typing import Iterator, List
+
+from .normalize import HEADER_ITEM_CANDIDATES
+
+try:
+    from python_calamine import CalamineWorkbook  # 선택: 설치되어 있으면 가장 빠른 엔진 사용
+except ImportError:
+    CalamineWorkbook = None
+
+
+# 헤더 행을 찾을 때 확인하는 상단 행 수 (normalize._promote_header_row와 동일)
+HEADER_SCAN_ROWS = 10
+DEFAULT_CHUNK_ROWS = int(os.getenv("EIMS_READ_CHUNK_ROWS", "5000"))
+
+# pd.read_excel이 기본으로 결측값(NaN) 처리하는 문자열 (na_values 기본값)
+NA_STRINGS = frozenset([
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+])
+
+
+def _iter_raw_rows(path: pathlib.Path) -> Iterator[tuple]:
+    """첫 시트의 행을 값 튜플로 하나씩 반환 (워크북 전체를 메모리에 올리지 않음)"""
+    if CalamineWorkbook is not None:
+        sheet = CalamineWorkbook.from_path(str(path)).get_sheet_by_index(0)
+        for row in sheet.iter_rows():
+            yield tuple(row)
+        return
+
+    if path.suffix.lower() == ".xls":
+        # openpyxl은 xls를 읽지 못하므로 pandas(xlrd)로 대체
+        for row in pd.read_excel(path, header=None).itertuples(index=False, name=None):
+            yield row
+        return
+
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        ws = wb.worksheets[0]
+        ws.reset_dimensions()  # 생성 프로그램이 기록한 시트 범위가 틀린 경우에도 끝까지 읽기
+        for row in ws.iter_rows(values_only=True):
+            yield row
+    finally:
+        wb.close()
+
+
+def _is_blank(v) -> bool:
+    return v is None or (isinstance(v, float) and pd.isna(v)) or (isinstance(v, str) and v.strip() == "")
+
+
+def _find_header(rows: List[tuple]) -> int:
+    """상단 행 중 '측정항목' 등의 키워드가 있는 행 번호 (없으면 0: 첫 행을 헤더로 사용)"""
+    for i, row in enumerate(rows):
+        values = [str(v).strip() for v in row if not _is_blank(v)]
+        if any(any(cand in v for cand in HEADER_ITEM_CANDIDATES) for v in values):
+            return i
+    return 0
+
+
+def _column_names(header: tuple) -> List[str]:
+    """pd.read_excel과 같은 규칙으로 컬럼명 생성 (빈 칸은 Unnamed: n, 중복은 .1, .2 ...)"""
+    names: List[str] = []
+    seen = {}
+    for i, v in enumerate(header):
+        name = f"Unnamed: {i}" if _is_blank(v) else str(v)
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+
+def _cell(v):
+    """pd.read_excel과 같은 셀 값으로 변환
+
+    빈 칸(None/빈 문자열)과 결측 문자열은 NaN, 정수인 실수(calamine은 정수 셀도 12345.0으로 반환)는 int
+    """
+    if v is None:
+        return np.nan
+    if isinstance(v, str):
+        return np.nan if v in NA_STRINGS else v
+    if isinstance(v, float) and v.is_integer():
+        return int(v)
+    return v
+
+
+def _fit(row: tuple, width: int) -> tuple:
+    row = tuple(_cell(v) for v in row)
+    if len(row) == width:
+        return row
+    return (row + (np.nan,) * width)[:width]
+
+
+def _chain(first, rest):
+    yield from first
+    yield from rest
+
+
+def iter_excel_chunks(path, chunksize: int = DEFAULT_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """엑셀 파일을 chunksize 행 단위 DataFrame으로 나누어 반환
+
+    헤더 행은 상단 HEADER_SCAN_ROWS 행을 읽는 동안 한 번만 찾고,
+    이후 행은 청크 단위로만 메모리에 유지하므로 파일 크기와 무관하게 메모리가 일정하다.
+    모든 청크의 컬럼은 같으며, 빈 행은 건너뛴다.
+    셀 값과 컬럼 자료형은 pd.read_excel(path)와 같게 맞춘다: 헤더가 첫 행이면 컬럼별로 추론하고,
+    헤더 위에 제목 행이 있으면 pd.read_excel에서도 헤더 문자열이 데이터에 섞이므로 object로 둔다.
+    """
+    path = pathlib.Path(path)
+    rows = _iter_raw_rows(path)
+
+    top: List[tuple] = []
+    for row in rows:
+        top.append(row)
+        if len(top) >= HEADER_SCAN_ROWS:
+            break
+    if not top:
+        return
+
+    header_idx = _find_header(top)
+    columns = _column_names(top[header_idx])
+    width = len(columns)
+    dtype = None if header_idx == 0 else object
+
+    def _batches():
+        batch: List[tuple] = []
+        for row in _chain(top[header_idx + 1:], rows):
+            if all(_is_blank(v) for v in row):
+                continue
+            batch.append(_fit(row, width))
+            if len(batch) >= chunksize:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    emitted = False
+    for batch in _batches():
+        emitted = True
+        yield pd.DataFrame(batch, columns=columns, dtype=dtype)
+    if not emitted:
+        yield pd.DataFrame(columns=columns, dtype=dtype)
+
+
+def read_excel_streaming(path, chunksize: int = DEFAULT_CHUNK_ROWS) -> pd.DataFrame:
+    """iter_excel_chunks 결과를 하나의 DataFrame으로 합침 (pd.read_excel 대체)"""
+    chunks = list(iter_excel_chunks(path, chunksize))
+    if not chunks:
+        return pd.DataFrame()
+    if len(chunks) == 1:
+        return chunks[0]
+    return pd.concat(chunks, ignore_index=True)
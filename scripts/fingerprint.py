@@ -0,0 +1,57 @@
+import hashlib
+import pandas as pd
+from typing import Iterable
+
+
+# 변경 여부 판단에 사용하는 표준 컬럼 (raw_path/created_at 등 메타 정보는 제외)
+TRACKED_COLUMNS = ["sample_no", "site_name", "collected_at", "kind", "item", "status"]
+
+
+def file_sha256(path, chunk_size: int = 1024 * 1024) -> str:
+    """다운로드 파일 전체의 SHA-256"""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def row_hashes(df: pd.DataFrame) -> pd.Series:
+    """정규화된 행별 내용 해시 (16자리 hex, 행 순서와 무관)"""
+    cols = [c for c in TRACKED_COLUMNS if c in df.columns]
+    hashed = pd.util.hash_pandas_object(df[cols].astype(str), index=False)
+    return hashed.map("{:016x}".format)
+
+
+class RowDigest:
+    """(uniq_key, 행 해시) 집합의 순서 무관 지문을 배치 단위로 누적
+
+    쌍마다 서로 다른 키로 64비트 해시 두 개를 구해 더해 가므로
+    전체 행을 메모리에 모으거나 정렬하지 않아도 된다.
+    """
+
+    _HASH_KEYS = ("eims-row-digest1", "eims-row-digest2")  # 16바이트 키
+
+    def __init__(self):
+        self.count = 0
+        self._sums = [0, 0]
+
+    def update(self, keys: Iterable[str], hashes: Iterable[str]) -> None:
+        pairs = pd.Series(list(keys), dtype=object).astype(str) + ":" + pd.Series(list(hashes), dtype=object).astype(str)
+        if pairs.empty:
+            return
+        self.count += len(pairs)
+        for i, hash_key in enumerate(self._HASH_KEYS):
+            hashed = pd.util.hash_pandas_object(pairs, index=False, hash_key=hash_key)
+            # uint64 합은 자리 넘침이 나도 2^64 나머지이므로 순서와 무관
+            self._sums[i] = (self._sums[i] + int(hashed.sum())) % (1 << 64)
+
+    def hexdigest(self) -> str:
+        return hashlib.sha256(f"{self.count}:{self._sums[0]:016x}:{self._sums[1]:016x}".encode("ascii")).hexdigest()
+
+
+def frame_digest(keys: Iterable[str], hashes: Iterable[str]) -> str:
+    """(uniq_key, 행 해시) 집합 전체의 지문 - 행 순서가 바뀌어도 같은 값"""
+    digest = RowDigest()
+    digest.update(keys, hashes)
+    return digest.hexdigest()
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+lab.db 스키마 버전 관리 (db.init_db()에서 자동 실행)
+
+sql/schema.sql은 새 DB용 테이블 정의이고, 기존 DB를 최신 구조로 맞추는 변경은
+아래 MIGRATIONS에 번호 순서대로 추가한다. 적용한 번호는 schema_version 테이블에 기록되어
+다음 실행부터는 건너뛴다.
+- 컬럼/인덱스 추가처럼 테이블 복사 없이 그 자리에서 적용하는 변경으로 작성
+- 각 마이그레이션은 새 DB(schema.sql에 이미 반영됨)에서도 문제없도록 작성 (있으면 건너뜀)
+
+사용법:
+    python scripts/migrations.py            # 현재 버전과 적용 대기 목록
+    python scripts/migrations.py apply      # 대기 중인 마이그레이션 적용
+"""
+
+import argparse
+import sys
+import pathlib
+from datetime import datetime
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path: sys.path.insert(0, str(ROOT))
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+# ---- 변경 도우미 ----
+
+def _columns(conn, table):
+    return {r[1] for r in conn.execute(f"PRAGMA table_info({table})")}
+
+
+def _add_column(conn, table, column, decl):
+    """없는 컬럼만 추가 (ALTER TABLE ADD COLUMN은 기존 행을 다시 쓰지 않음)"""
+    if column not in _columns(conn, table):
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
+
+
+def _has_unique_index(conn, table, columns):
+    """table에 columns와 정확히 같은 UNIQUE 제약/인덱스가 있는지"""
+    for index in conn.execute(f"PRAGMA index_list({table})").fetchall():
+        name, unique = index[1], index[2]
+        if unique and [r[2] for r in conn.execute(f"PRAGMA index_info({name})")] == list(columns):
+            return True
+    return False
+
+
+# ---- 마이그레이션 (번호는 한 번 배포하면 바꾸지 않음) ----
+
+def _samples_row_hash(conn):
+    _add_column(conn, "samples", "row_hash", "TEXT")
+
+
+def _samples_removed_at(conn):
+    _add_column(conn, "samples", "removed_at", "TEXT")
+
+
+def _assignments_unique(conn):
+    """(sample_no, item) 중복 배정 방지 - 테이블 재생성 대신 UNIQUE 인덱스 추가 (migrate_add_unique.py 대체)"""
+    if _has_unique_index(conn, "assignments", ("sample_no", "item")):
+        return
+    removed = conn.execute("""
+        DELETE FROM assignments
+        WHERE id NOT IN (SELECT MIN(id) FROM assignments GROUP BY sample_no, item)
+    """).rowcount
+    if removed:
+        logger.info(f"중복 배정 {removed}건 제거 (먼저 배정된 것 유지)")
+    conn.execute("CREATE UNIQUE INDEX ux_assignments_sample_item ON assignments(sample_no, item)")
+
+
+def _assignments_completion(conn):
+    """완료 처리(complete_tasks.py)가 기록하는 컬럼"""
+    _add_column(conn, "assignments", "status", "TEXT")
+    _add_column(conn, "assignments", "completed_at", "TEXT")
+
+
+def _assignment_query_indexes(conn):
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_assignments_researcher_assigned_at ON assignments(researcher, assigned_at)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_assignments_assigned_at ON assignments(assigned_at)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_samples_sample_no_item ON samples(sample_no, item)")
+
+
+MIGRATIONS = [
+    (1, "samples.row_hash", _samples_row_hash),
+    (2, "samples.removed_at", _samples_removed_at),
+    (3, "assignments unique (sample_no, item)", _assignments_unique),
+    (4, "assignments.status, completed_at", _assignments_completion),
+    (5, "assignment query indexes", _assignment_query_indexes),
+]
+
+
+# ---- 실행 ----
+
+def _ensure_version_table(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version(
+          version INTEGER PRIMARY KEY, name TEXT, applied_at TEXT
+        )
+    """)
+    conn.commit()
+
+
+def current_version(conn):
+    _ensure_version_table(conn)
+    return conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
+
+
+def pending(conn):
+    version = current_version(conn)
+    return [m for m in MIGRATIONS if m[0] > version]
+
+
+def migrate(conn):
+    """대기 중인 마이그레이션을 순서대로 적용하고 적용한 번호 목록 반환
+
+    마이그레이션마다 BEGIN IMMEDIATE 트랜잭션 하나로 실행하고 같은 트랜잭션에서 버전을 기록하므로,
+    실패하면 그 마이그레이션은 통째로 롤백되고 여러 프로세스가 동시에 시작해도 한 번만 적용된다.
+    """
+    applied = []
+    for version, name, func in pending(conn):
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # 잠금을 얻는 사이 다른 프로세스가 적용했으면 건너뜀
+            if conn.execute("SELECT 1 FROM schema_version WHERE version = ?", (version,)).fetchone():
+                conn.rollback()
+                continue
+            func(conn)
+            conn.execute("INSERT INTO schema_version (version, name, applied_at) VALUES (?, ?, ?)",
+                         (version, name, datetime.now().isoformat(timespec="seconds")))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            logger.error(f"마이그레이션 {version} ({name}) 실패")
+            raise
+        logger.info(f"마이그레이션 {version} 적용: {name}")
+        applied.append(version)
+    return applied
+
+
+def main():
+    from scripts import db
+    from scripts.connection import connect
+
+    parser = argparse.ArgumentParser(description="lab.db 스키마 마이그레이션")
+    parser.add_argument("command", nargs="?", choices=["status", "apply"], default="status")
+    parser.add_argument("--db", help="대상 DB 파일 (기본: storage/lab.db)")
+    args = parser.parse_args()
+    if args.db:
+        db.DB_PATH = pathlib.Path(args.db)
+
+    if args.command == "apply":
+        db.init_db()  # schema.sql 적용 후 migrate() 실행
+    conn = connect(db.DB_PATH)
+    print(f"현재 스키마 버전: {current_version(conn)} (최신 {MIGRATIONS[-1][0]})")
+    for version, name, _ in pending(conn):
+        print(f"  대기: {version} {name}")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
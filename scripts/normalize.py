@@ -1,8 +1,20 @@
+import hashlib
+import json
+import os
+import pathlib
+import re
+import sys
+import tempfile
+import numpy as np
 import pandas as pd
-from typing import List
+from typing import Iterable, Iterator, List, Mapping, Optional
+
+from .fingerprint import row_hashes
 
 
 HEADER_ITEM_CANDIDATES: List[str] = ["측정항목", "항목", "분석항목"]
+_HEADER_PATTERN = "|".join(map(re.escape, HEADER_ITEM_CANDIDATES))
+_DIGITS = re.compile(r"\d")
 
 # 한글 컬럼명 -> 표준 컬럼명 매핑(동의어 포함)
 SYNONYM_COLMAP = {
@@ -36,71 +48,340 @@ def _clean_headers(headers: List[str]) -> List[str]:
     return cleaned
 
 
-def _promote_header_row(df: pd.DataFrame) -> pd.DataFrame:
-    # 상단에 설명 행이 포함된 경우, '측정항목' 등의 키워드가 있는 행을 찾아 헤더로 승격
-    for i in range(min(10, len(df))):
-        row_values = [str(v).strip() for v in list(df.iloc[i].values)]
-        if any(any(cand in v for cand in HEADER_ITEM_CANDIDATES) for v in row_values):
-            # 헤더 행을 찾았으면 그 행을 컬럼명으로 사용하고 다음 행부터 데이터로 사용
-            df = df.iloc[i + 1 :].copy()
-            df.columns = _clean_headers(row_values)
-            return df
-    
-    # 기본: 현재 헤더 정리만 적용
-    df = df.copy()
-    df.columns = _clean_headers(list(df.columns))
-    return df
+def _find_header_row(df: pd.DataFrame) -> Optional[int]:
+    """상단 10행 중 '측정항목' 등의 키워드가 있는 첫 행 번호 (없으면 None)"""
+    top = df.head(10)
+    if top.empty:
+        return None
+    # str(v)로 한 번에 변환한 뒤 키워드 포함 여부를 행 단위로 집계
+    cells = pd.Series(top.to_numpy(dtype=str).ravel())
+    hits = cells.str.contains(_HEADER_PATTERN, regex=True).to_numpy().reshape(top.shape).any(axis=1)
+    return int(hits.argmax()) if hits.any() else None
+
+
+def _discover_layout(df: pd.DataFrame) -> dict:
+    """헤더 행 위치와 최종 컬럼명(공백 정리 + 동의어 매핑)을 찾음"""
+    # 상단에 설명 행이 포함된 경우, '측정항목' 등의 키워드가 있는 행을 헤더로 승격
+    header_row = _find_header_row(df)
+    if header_row is not None:
+        source = [str(v).strip() for v in df.iloc[header_row].values]
+    else:
+        # 기본: 현재 헤더 정리만 적용
+        source = [str(c) for c in df.columns]
+    columns = [SYNONYM_COLMAP.get(c, c) for c in _clean_headers(source)]
+    return {"header_row": header_row, "source": source, "columns": columns}
+
+
+def _layout_fingerprint(df: pd.DataFrame) -> str:
+    """컬럼 구성 지문 (제목 행에 들어가는 조회 날짜 등 숫자는 무시)"""
+    labels = "\x1f".join(_DIGITS.sub("#", str(c)) for c in df.columns)
+    return hashlib.sha1(f"{df.shape[1]}\x1e{labels}".encode("utf-8")).hexdigest()[:16]
+
+
+def _layout_matches(df: pd.DataFrame, layout: dict) -> bool:
+    """저장된 레이아웃의 헤더 값이 이 파일에서도 같은 자리에 있는지 확인"""
+    header_row = layout["header_row"]
+    if header_row is None:
+        return [str(c) for c in df.columns] == layout["source"]
+    if len(df) <= header_row:
+        return False
+    return [str(v).strip() for v in df.iloc[header_row].values] == layout["source"]
 
 
-def _apply_synonym_mapping(df: pd.DataFrame) -> pd.DataFrame:
-    rename_map = {}
-    for col in df.columns:
-        std = SYNONYM_COLMAP.get(col)
-        if std:
-            rename_map[col] = std
-    if rename_map:
-        df = df.rename(columns=rename_map)
+class LayoutCache:
+    """지문별 헤더 행 위치/컬럼명 캐시
+
+    path가 없으면 프로세스 안에서만 쓰는 메모리 캐시이고, path를 주면 처음 쓸 때 JSON 파일에서
+    읽어 오고 save()를 호출할 때만 파일에 쓴다 (normalize()는 파일을 쓰지 않음).
+    """
+
+    def __init__(self, path=None, max_entries: int = 100):
+        self.path = pathlib.Path(path) if path else None
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = None
+        self._dirty = False
+
+    @property
+    def entries(self) -> dict:
+        if self._entries is None:
+            self._entries = {}
+            if self.path is not None:
+                try:
+                    self._entries = json.loads(self.path.read_text(encoding="utf-8"))
+                except (OSError, ValueError):
+                    pass
+        return self._entries
+
+    def resolve(self, df: pd.DataFrame) -> dict:
+        """알려진 레이아웃이면 저장된 값을, 아니면 새로 찾아 학습한 값을 반환"""
+        fingerprint = _layout_fingerprint(df)
+        layout = self.entries.get(fingerprint)
+        if layout is not None and _layout_matches(df, layout):
+            self.hits += 1
+            return layout
+
+        self.misses += 1
+        layout = _discover_layout(df)
+        self.entries.pop(fingerprint, None)
+        self.entries[fingerprint] = layout
+        while len(self.entries) > self.max_entries:
+            self.entries.pop(next(iter(self.entries)))
+        self._dirty = True
+        return layout
+
+    def save(self):
+        """새로 학습한 레이아웃이 있으면 파일에 저장 (임시 파일에 쓴 뒤 교체하므로 동시에 써도 깨지지 않음)"""
+        if self.path is None or not self._dirty:
+            return
+        tmp = None
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=self.path.name, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self.entries, f, ensure_ascii=False, indent=2)
+            os.replace(tmp, self.path)
+            self._dirty = False
+        except OSError:
+            # 캐시 저장 실패는 다음 실행에서 다시 찾으면 되므로 무시
+            if tmp is not None and os.path.exists(tmp):
+                os.remove(tmp)
+
+
+# 기본 캐시는 메모리 전용 (파일 캐시는 job.py가 LAYOUT_CACHE_PATH로 만들어 normalize에 넘김)
+layout_cache = LayoutCache()
+LAYOUT_CACHE_PATH = (
+    pathlib.Path(os.getenv("EIMS_STORAGE_DIR", str(pathlib.Path(__file__).resolve().parents[1] / "storage")))
+    / "cache" / "normalize_layouts.json"
+)
+
+
+def _apply_layout(df: pd.DataFrame, layout: dict) -> pd.DataFrame:
+    """헤더 행 아래부터를 데이터로 하고 최종 컬럼명 적용 (데이터 복사 없이 새 객체)"""
+    header_row = layout["header_row"]
+    df = df.iloc[header_row + 1 :] if header_row is not None else df.copy(deep=False)
+    df.columns = layout["columns"]
     return df
 
 
-def normalize(df: pd.DataFrame) -> pd.DataFrame:
-    df = _promote_header_row(df)
-    df = _apply_synonym_mapping(df)
+def _column(df: pd.DataFrame, name: str) -> pd.Series:
+    """컬럼 하나 (동의어 매핑으로 같은 이름이 여러 개면 첫 번째 컬럼 사용)"""
+    col = df[name]
+    if isinstance(col, pd.DataFrame):
+        col = col.iloc[:, 0]
+    return col
+
+
+def _strip_strings(values: np.ndarray) -> np.ndarray:
+    """object 배열에 str(v).strip() 적용한 결과
+
+    문자열 컬럼은 고유값에만 strip을 적용한 뒤 코드로 펼치므로
+    측정항목/사업장처럼 값 종류가 적은 컬럼은 행 수와 거의 무관하게 처리된다.
+    """
+    if pd.api.types.infer_dtype(values, skipna=True) != "string":
+        return pd.Series(values, copy=False).astype(str).str.strip().to_numpy()
+
+    codes, uniques = pd.factorize(values)
+    out = pd.Index(uniques).str.strip().to_numpy(dtype=object).take(codes)
+    missing = codes == -1
+    if missing.any():
+        # 결측값은 원래처럼 'None' / 'nan' 문자열로
+        out[missing] = [str(v) for v in values[missing]]
+    return out
+
+
+# 범주형 출력 모드에서 코드+카테고리로 저장하는 저카디널리티 컬럼
+CATEGORICAL_COLUMNS = ["site_name", "kind", "item", "status"]
+
+
+class CategoryRegistry:
+    """컬럼별 카테고리 목록 (배치 간 공유)
+
+    카테고리는 뒤에 추가만 하므로 먼저 만든 배치의 코드도 계속 유효하고,
+    값 문자열은 intern하여 모든 배치가 같은 객체를 참조한다.
+    """
+
+    def __init__(self):
+        self._codes = {}
+        self._values = {}
+
+    def codes_for(self, column: str, values: List[str]) -> np.ndarray:
+        index = self._codes.setdefault(column, {})
+        categories = self._values.setdefault(column, [])
+        out = np.empty(len(values), dtype=np.int32)
+        for i, v in enumerate(values):
+            code = index.get(v)
+            if code is None:
+                code = index[v] = len(categories)
+                categories.append(sys.intern(v))
+            out[i] = code
+        return out
+
+    def dtype(self, column: str) -> pd.CategoricalDtype:
+        return pd.CategoricalDtype(self._values.get(column, []))
+
 
+category_registry = CategoryRegistry()
+
+
+def _categorize(values: np.ndarray, column: str, registry: CategoryRegistry) -> pd.Categorical:
+    """_strip_strings와 같은 값을 공유 카테고리의 코드로 변환 (행별 문자열 배열을 만들지 않음)"""
+    if pd.api.types.infer_dtype(values, skipna=True) != "string":
+        values = _strip_strings(values)
+
+    codes, uniques = pd.factorize(values)
+    mapping = registry.codes_for(column, list(pd.Index(uniques, dtype=object).str.strip()))
+    out = mapping.take(codes) if len(mapping) else np.zeros(len(codes), dtype=np.int32)
+    missing = codes == -1
+    if missing.any():
+        out[missing] = registry.codes_for(column, [str(v) for v in values[missing]])
+    return pd.Categorical.from_codes(out, dtype=registry.dtype(column))
+
+
+def _as_str(values) -> np.ndarray:
+    if isinstance(values, np.ndarray) and values.dtype == object:
+        return values  # _strip_strings를 거쳐 이미 문자열
+    if isinstance(values, pd.Categorical):
+        return np.asarray(values, dtype=object)
+    return pd.Series(values, copy=False).astype(str).to_numpy(dtype=object)
+
+
+def _join_keys(parts: List[np.ndarray]) -> np.ndarray:
+    key = parts[0]
+    for p in parts[1:]:
+        key = key + "_" + p
+    return key
+
+
+def _normalize_frame(df: pd.DataFrame, registry: Optional[CategoryRegistry] = None) -> pd.DataFrame:
+    """레이아웃(헤더/컬럼명)이 적용된 프레임을 표준 컬럼 프레임으로 변환
+
+    registry를 넘기면 CATEGORICAL_COLUMNS는 그 카테고리를 쓰는 범주형으로 만든다.
+    """
     # 유지 컬럼 구성: item은 필수, 나머지는 존재하는 것만 유지
     desired = ["sample_no", "site_name", "collected_at", "kind", "item", "status"]
     keep = [c for c in desired if c in df.columns]
     if "item" not in keep:
         raise ValueError("필수 컬럼 'item(측정항목)'을 찾을 수 없습니다.")
 
-    df = df[keep].copy()
-
-    for c in df.columns:
-        try:
-            if df[c].dtype == object:
-                df[c] = df[c].astype(str).str.strip()
-        except AttributeError:
-            # 컬럼이 중복되어 DataFrame이 반환되는 경우
-            continue
+    # 필요한 컬럼만 배열로 꺼내 문자열 정리 (중간 DataFrame 복사 없음)
+    columns = {}
+    for c in keep:
+        col = _column(df, c)
+        if registry is not None and c in CATEGORICAL_COLUMNS:
+            columns[c] = _categorize(col.to_numpy(dtype=object), c, registry)
+        elif col.dtype == object or pd.api.types.is_string_dtype(col.dtype):
+            columns[c] = _strip_strings(col.to_numpy(dtype=object))
+        else:
+            columns[c] = col.array
 
     # uniq_key 생성: sample_no 있으면 sample_no+item, 없으면 site_name/collected_at 조합
-    if "sample_no" in df.columns:
-        df["uniq_key"] = df["sample_no"].astype(str) + "_" + df["item"].astype(str)
+    if "sample_no" in columns:
+        key_cols = ["sample_no", "item"]
     else:
-        parts: List[str] = []
-        if "site_name" in df.columns:
-            parts.append(df["site_name"].astype(str))
-        if "collected_at" in df.columns:
-            parts.append(df["collected_at"].astype(str))
-        parts.append(df["item"].astype(str))
-        if parts:
-            combined = parts[0]
-            for p in parts[1:]:
-                combined = combined + "_" + p
-            df["uniq_key"] = combined
+        key_cols = [c for c in ("site_name", "collected_at") if c in columns] + ["item"]
+    columns["uniq_key"] = _join_keys([_as_str(columns[c]) for c in key_cols])
+
+    # 공백/결측 item 제거 (빈 값이 있을 때만 배열을 걸러냄)
+    valid = _as_str(columns["item"]) != ""
+    if not valid.all():
+        columns = {c: v[valid] for c, v in columns.items()}
+
+    # 결과 DataFrame은 한 번만 생성
+    return pd.DataFrame(columns, index=pd.RangeIndex(len(columns["item"])))
+
+
+def normalize(df: pd.DataFrame, categorical: bool = False, cache: Optional[LayoutCache] = None) -> pd.DataFrame:
+    """categorical=True면 site_name/kind/item/status를 공유 카테고리의 범주형으로 반환
+
+    cache: 헤더 위치/컬럼 매핑 캐시 (없으면 모듈 기본 메모리 캐시)
+    """
+    registry = category_registry if categorical else None
+    cache = cache if cache is not None else layout_cache
+    # 헤더 위치/컬럼 매핑은 같은 구성의 파일이면 캐시에서 바로 적용
+    return _normalize_frame(_apply_layout(df, cache.resolve(df)), registry)
+
+
+def normalize_chunks(chunks: Iterable[pd.DataFrame], categorical: bool = False,
+                     cache: Optional[LayoutCache] = None) -> Iterator[pd.DataFrame]:
+    """원본 청크를 차례로 표준화하여 반환 (전체 프레임을 만들지 않음)
+
+    헤더 위치와 컬럼 매핑은 첫 청크에서 한 번만 정하고,
+    이후 청크에는 같은 컬럼명만 적용한다. 빈 결과 청크는 건너뛴다.
+    """
+    registry = category_registry if categorical else None
+    cache = cache if cache is not None else layout_cache
+    layout = None
+    for chunk in chunks:
+        if layout is None:
+            layout = cache.resolve(chunk)
+            df = _apply_layout(chunk, layout)
+            layout = dict(layout, header_row=None)
         else:
-            df["uniq_key"] = df.index.astype(str)
+            df = _apply_layout(chunk, layout)
+        out = _normalize_frame(df, registry)
+        if len(out):
+            yield out
+
+
+def concat_normalized(frames: Iterable[pd.DataFrame]) -> pd.DataFrame:
+    """표준화 결과 여러 개를 합침 (범주형 컬럼은 카테고리를 맞춰 범주형 그대로 유지)"""
+    frames = list(frames)
+    if not frames:
+        return pd.DataFrame()
+    for c in CATEGORICAL_COLUMNS:
+        dtypes = [f[c].dtype for f in frames if c in f.columns and isinstance(f[c].dtype, pd.CategoricalDtype)]
+        if len(dtypes) < 2:
+            continue
+        # 공유 카테고리는 추가만 되므로 대개 가장 긴 목록이 나머지를 모두 포함
+        categories = list(dict.fromkeys(v for dtype in dtypes for v in dtype.categories))
+        frames = [
+            f.assign(**{c: f[c].cat.set_categories(categories)})
+            if c in f.columns and isinstance(f[c].dtype, pd.CategoricalDtype) else f
+            for f in frames
+        ]
+    return pd.concat(frames, ignore_index=True)
+
+
+# 직전 상태 대비 변경 유형
+CHANGE_INSERT = "insert"
+CHANGE_UPDATE = "update"
+CHANGE_DELETE = "delete"
+# 내용은 같지만 아직 배정되지 않은 행 (저장 후 배정 전에 실패한 실행의 행)
+CHANGE_UNASSIGNED = "unassigned"
+
+
+def diff_rows(df: pd.DataFrame, known: Mapping[str, str], previous_keys: Optional[Iterable[str]] = None,
+              unassigned: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """표준화 결과를 직전 상태와 비교해 바뀐 행만 change_type과 함께 반환
+
+    known: 직전 상태의 {uniq_key: row_hash}. 없는 키는 insert, 해시가 다르면 update,
+    같으면 제외한다. unassigned에 있는 키는 해시가 같아도 unassigned로 남긴다.
+    previous_keys를 주면 그중 이번 결과에 없는 키를 delete 행
+    (uniq_key와 change_type만 채움)으로 뒤에 붙인다.
+    """
+    if "row_hash" not in df.columns:
+        df = df.assign(row_hash=row_hashes(df))
+    stored = df["uniq_key"].map(known)
+    changed = (df["row_hash"] != stored).to_numpy()
+    pending = ~changed
+    if unassigned is None:
+        pending[:] = False
+    else:
+        pending &= df["uniq_key"].isin(list(unassigned)).to_numpy()
+    keep = changed | pending
+    delta = df[keep].copy()
+    delta["change_type"] = np.select([pending[keep], stored[keep].isna().to_numpy()],
+                                     [CHANGE_UNASSIGNED, CHANGE_INSERT], CHANGE_UPDATE)
+    if previous_keys is not None:
+        removed = removed_rows(previous_keys, df["uniq_key"])
+        if len(removed):
+            delta = pd.concat([delta, removed], ignore_index=True)
+    return delta.reset_index(drop=True)
+
 
-    # 공백/결측 item 제거
-    df = df[df["item"].astype(str).str.strip() != ""].reset_index(drop=True)
-    return df
\ No newline at end of file
+def removed_rows(previous_keys: Iterable[str], current_keys: Iterable[str]) -> pd.DataFrame:
+    """직전 상태에는 있었지만 이번 결과에 없는 키 (change_type=delete)"""
+    gone = sorted(set(previous_keys).difference(current_keys))
+    return pd.DataFrame({"uniq_key": pd.Series(gone, dtype=object), "change_type": CHANGE_DELETE})
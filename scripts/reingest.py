@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+보관된 다운로드 일괄 재적재
+storage/archive(및 storage/downloads)의 엑셀 파일을 여러 프로세스에서 동시에 읽어 표준화하고,
+다운로드 시각 순서대로 배치 단위(배치당 한 트랜잭션)로 DB에 저장하여 lab.db를 다시 구성
+같은 uniq_key는 가장 나중에 받은 파일의 내용이 남는다
+
+사용법:
+    python scripts/reingest.py --workers 4 --batch-files 20
+    python scripts/reingest.py --db storage/lab_rebuilt.db --since 2025-09-01 --assign
+"""
+
+import argparse
+import os
+import re
+import sys
+import pathlib
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path: sys.path.insert(0, str(ROOT))
+
+import pandas as pd
+
+from scripts import db, staging
+from scripts.excel_reader import read_excel_streaming
+from scripts.normalize import normalize, concat_normalized
+from scripts.fingerprint import row_hashes
+from scripts.structured_logger import logger
+
+STORAGE_DIR = pathlib.Path(os.getenv("EIMS_STORAGE_DIR", str(ROOT / "storage")))
+SOURCE_DIRS = [STORAGE_DIR / "archive", STORAGE_DIR / "downloads"]
+DEFAULT_BATCH_FILES = 20
+# scrape_eims가 붙이는 다운로드 시각 (field_water_<조회시작일>_<epoch>.xlsx)
+_EPOCH_SUFFIX = re.compile(r"_(\d{9,})$")
+
+
+def download_time(path: pathlib.Path) -> float:
+    """파일명의 다운로드 시각(epoch), 없으면 수정 시각"""
+    match = _EPOCH_SUFFIX.search(path.stem)
+    return float(match.group(1)) if match else path.stat().st_mtime
+
+
+def list_sources(dirs=None, since=None):
+    """재적재 대상 엑셀 파일 (다운로드 시각 순, since=YYYY-MM-DD 이후 받은 것만)"""
+    paths = {p for d in (dirs or SOURCE_DIRS) for p in pathlib.Path(d).glob("*.xls*")}
+    ordered = sorted(paths, key=lambda p: (download_time(p), p.name))
+    if since:
+        cutoff = datetime.strptime(since, "%Y-%m-%d").timestamp()
+        ordered = [p for p in ordered if download_time(p) >= cutoff]
+    return ordered
+
+
+def _parse(path):
+    """작업 프로세스: 파일 하나를 표준화하여 (경로, DataFrame, 오류) 반환"""
+    try:
+        df = staging.load_normalized(path)
+        if df is None:
+            df = normalize(read_excel_streaming(path))
+        if "row_hash" not in df.columns:
+            df["row_hash"] = row_hashes(df)
+        df["raw_path"] = str(path)
+        return str(path), df, None
+    except Exception as e:
+        return str(path), None, f"{type(e).__name__}: {e}"
+
+
+def _write_batch(results, assign):
+    """배치 하나를 합쳐 uniq_key별 마지막 행만 남기고 한 트랜잭션으로 저장, (저장 건수, 최신 채취일) 반환"""
+    frames = []
+    for path, df, error in results:
+        if error:
+            logger.log_event("reingest_file_failed", path=path, error=error)
+            print(f"  ⚠️ {pathlib.Path(path).name}: {error}")
+        elif len(df):
+            frames.append(df)
+    if not frames:
+        return {}, None
+
+    merged = concat_normalized(frames).drop_duplicates(subset="uniq_key", keep="last").reset_index(drop=True)
+    saved = db.upsert_samples(merged, None)
+    if assign:
+        from scripts.assign import run_assign
+        run_assign(merged)
+
+    latest = pd.to_datetime(merged["collected_at"], errors="coerce").max() if "collected_at" in merged else None
+    return saved, None if latest is None or pd.isna(latest) else latest.date().isoformat()
+
+
+def reingest(paths, workers=None, batch_files=DEFAULT_BATCH_FILES, assign=False):
+    """파일 목록(다운로드 시각 순)을 재적재하고 처리 통계 반환
+
+    표준화는 프로세스 풀에서 병렬로 하되, 저장은 배치 순서대로 하나씩 하므로
+    나중 파일의 내용이 앞선 파일을 덮어쓴다. 다음 배치는 현재 배치를 저장하는 동안 미리 읽는다.
+    """
+    db.init_db()
+    batches = [paths[i:i + batch_files] for i in range(0, len(paths), batch_files)]
+    stats = {"files": len(paths), "rows": 0, "inserted": 0, "updated": 0, "unchanged": 0,
+             "parse_wait_s": 0.0, "write_s": 0.0}
+    watermark = None
+    started = time.perf_counter()
+
+    logger.log_event("reingest_started", files=len(paths), batches=len(batches), workers=workers)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = [pool.submit(_parse, p) for p in batches[0]] if batches else []
+        for i, batch in enumerate(batches, 1):
+            waited = time.perf_counter()
+            results = [f.result() for f in pending]
+            stats["parse_wait_s"] += time.perf_counter() - waited
+            pending = [pool.submit(_parse, p) for p in batches[i]] if i < len(batches) else []
+
+            written = time.perf_counter()
+            saved, latest = _write_batch(results, assign)
+            write_s = time.perf_counter() - written
+            rows = sum(saved.values())
+            stats["write_s"] += write_s
+            stats["rows"] += rows
+            for key, count in saved.items():
+                stats[key] += count
+            if latest:
+                watermark = max(watermark or latest, latest)
+
+            elapsed = time.perf_counter() - started
+            logger.log_event("reingest_batch", batch=i, files=len(batch), rows=rows, write_s=round(write_s, 3), **saved)
+            print(f"  배치 {i}/{len(batches)}: 파일 {len(batch)}개, {rows}행 "
+                  f"(누적 {stats['rows'] / elapsed:.0f}행/s)")
+
+    if watermark:
+        db.set_watermark(min(watermark, datetime.now().date().isoformat()))
+    stats["elapsed_s"] = time.perf_counter() - started
+    logger.log_event("reingest_completed", **{k: round(v, 3) if isinstance(v, float) else v for k, v in stats.items()})
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="보관된 다운로드 일괄 재적재")
+    parser.add_argument("--dirs", nargs="+", help="엑셀 파일 폴더 (기본: storage/archive, storage/downloads)")
+    parser.add_argument("--since", help="이 날짜(YYYY-MM-DD) 이후 받은 파일만")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="표준화 프로세스 수")
+    parser.add_argument("--batch-files", type=int, default=DEFAULT_BATCH_FILES, help="한 트랜잭션으로 저장할 파일 수")
+    parser.add_argument("--db", help="저장할 DB 파일 (기본: storage/lab.db)")
+    parser.add_argument("--assign", action="store_true", help="저장 후 작업 배정도 수행")
+    args = parser.parse_args()
+
+    if args.db:
+        db.DB_PATH = pathlib.Path(args.db)
+    paths = list_sources(args.dirs, args.since)
+    if not paths:
+        print("재적재할 파일이 없습니다.")
+        return 0
+
+    print(f"재적재 시작: 파일 {len(paths)}개 → {db.DB_PATH} (프로세스 {args.workers}개)")
+    stats = reingest(paths, args.workers, max(1, args.batch_files), args.assign)
+    elapsed = stats["elapsed_s"] or 1e-9
+    print(f"✅ 재적재 완료: 파일 {stats['files']}개, {stats['rows']}행, {elapsed:.1f}s "
+          f"({stats['files'] / elapsed:.1f}파일/s, {stats['rows'] / elapsed:.0f}행/s, "
+          f"표준화 대기 {stats['parse_wait_s']:.1f}s, 저장 {stats['write_s']:.1f}s)")
+    print(f"   신규 {stats['inserted']}행, 변경 {stats['updated']}행, 동일 {stats['unchanged']}행")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
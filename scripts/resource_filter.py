@@ -0,0 +1,107 @@
+"""
+스크래핑용 요청 차단 (Playwright route)
+
+엑셀출력 버튼까지 가는 데 필요 없는 이미지/폰트/스타일시트/미디어와
+EIMS 외부 호스트(추적 스크립트 등) 요청을 중단하고, 실행마다 차단·절약량을 집계한다.
+차단된 요청은 실제 크기를 알 수 없으므로, 차단 없이 실행한 디버그 프로필에서
+관찰한 리소스 유형별 평균 크기로 절약 바이트를 추정한다.
+"""
+
+import json
+import logging
+import pathlib
+from collections import Counter
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BLOCKED_TYPES = ("image", "font", "stylesheet", "media")
+
+
+def registrable_domain(host):
+    """www.xn--lu5b7kx8m.kr -> xn--lu5b7kx8m.kr (국가 도메인 2단계까지만 고려한 단순 규칙)"""
+    labels = (host or "").lower().split(".")
+    return ".".join(labels[-2:])
+
+
+class ResourceStats:
+    """컨텍스트 단위 요청 집계 (report() 호출 시 초기화)"""
+
+    def __init__(self, sizes_path=None):
+        self.sizes_path = pathlib.Path(sizes_path) if sizes_path else None
+        self.reset()
+
+    def reset(self):
+        self.blocked = Counter()
+        self.blocked_hosts = Counter()
+        self.loaded = Counter()
+        self.loaded_bytes = Counter()
+
+    def on_response(self, response):
+        rtype = response.request.resource_type
+        self.loaded[rtype] += 1
+        try:
+            self.loaded_bytes[rtype] += int(response.headers.get("content-length", 0))
+        except ValueError:
+            pass
+
+    def _load_sizes(self):
+        if self.sizes_path and self.sizes_path.exists():
+            try:
+                return json.loads(self.sizes_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                pass
+        return {}
+
+    def _save_sizes(self):
+        """차단 없이 실행한 경우 리소스 유형별 평균 크기 저장 (차단 시 절약량 추정용)"""
+        if not self.sizes_path:
+            return
+        sizes = self._load_sizes()
+        for rtype, count in self.loaded.items():
+            if count and self.loaded_bytes[rtype]:
+                sizes[rtype] = self.loaded_bytes[rtype] // count
+        try:
+            self.sizes_path.write_text(json.dumps(sizes, indent=2), encoding="utf-8")
+        except OSError as e:
+            logger.warning(f"리소스 크기 통계 저장 실패: {e}")
+
+    def report(self, blocking):
+        """이번 실행의 요청/바이트 집계를 반환하고 카운터 초기화"""
+        if blocking:
+            sizes = self._load_sizes()
+            saved_bytes = sum(sizes.get(rtype, 0) * n for rtype, n in self.blocked.items())
+        else:
+            self._save_sizes()
+            saved_bytes = 0
+
+        summary = {
+            "requests_loaded": sum(self.loaded.values()),
+            "bytes_loaded": sum(self.loaded_bytes.values()),
+            "requests_blocked": sum(self.blocked.values()),
+            "blocked_by_type": dict(self.blocked),
+            "blocked_third_party_hosts": dict(self.blocked_hosts),
+            "bytes_saved_estimate": saved_bytes,
+        }
+        self.reset()
+        return summary
+
+
+def install_resource_filter(context, stats, allowed_hosts, blocked_types=DEFAULT_BLOCKED_TYPES):
+    """컨텍스트의 모든 요청에 차단 규칙 적용 (EIMS 도메인의 문서/스크립트/XHR만 통과)"""
+    allowed_domains = {registrable_domain(h) for h in allowed_hosts}
+    blocked_types = set(blocked_types)
+
+    def handle(route):
+        request = route.request
+        host = urlsplit(request.url).hostname
+        third_party = bool(host) and registrable_domain(host) not in allowed_domains
+        if request.resource_type in blocked_types or third_party:
+            stats.blocked[request.resource_type] += 1
+            if third_party:
+                stats.blocked_hosts[host] += 1
+            route.abort()
+        else:
+            route.continue_()
+
+    context.route("**/*", handle)
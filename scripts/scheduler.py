@@ -25,6 +25,34 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# 상주 워커(scrape_worker.py)가 떠 있으면 워커에 실행을 요청하고, 없으면 job.py를 새로 실행
+USE_WORKER = os.environ.get("EIMS_USE_WORKER", "1") == "1"
+
+def _run_via_worker():
+    """상주 워커에 실행 요청 (워커가 없거나 응답하지 않으면 None → job.py로 대체)"""
+    from multiprocessing import AuthenticationError
+    from scrape_worker import send_command, RUN_TIMEOUT_SECONDS
+    try:
+        result = send_command("run", timeout=RUN_TIMEOUT_SECONDS)
+    except ConnectionRefusedError:
+        logger.info("상주 워커 없음 - job.py를 직접 실행합니다.")
+        return None
+    except TimeoutError:
+        # 워커가 저장 후 배정 전에 멈췄어도 다운로드 기록/워터마크는 배정이 끝나야 남으므로
+        # job.py가 같은 기간을 다시 받아 저장만 되고 배정되지 않은 행까지 배정한다
+        # (배정은 (sample_no, item) UNIQUE라 워커가 늦게 끝나도 중복 저장되지 않음)
+        logger.error(f"상주 워커가 {RUN_TIMEOUT_SECONDS:.0f}초 안에 응답하지 않음 - job.py를 직접 실행합니다.")
+        return None
+    except (EOFError, AuthenticationError, OSError) as e:
+        logger.error(f"상주 워커 요청 실패 ({type(e).__name__}: {e}) - job.py를 직접 실행합니다.")
+        return None
+    
+    if result.get("ok"):
+        logger.info(f"✅ EIMS 자동화 성공 (워커, {result.get('elapsed')}초)")
+    else:
+        logger.error(f"❌ EIMS 자동화 실패 (워커): {result}")
+    return result
+
 def run_eims_automation():
     """EIMS 자동화 시스템 실행"""
     try:
@@ -34,6 +62,9 @@ def run_eims_automation():
         project_root = Path(__file__).parent.parent
         os.chdir(project_root)
         
+        if USE_WORKER and _run_via_worker() is not None:
+            return
+        
         # job.py 실행
         result = subprocess.run([sys.executable, 'sql/job.py'], 
                               capture_output=True, 
@@ -1,7 +1,14 @@
 from playwright.sync_api import sync_playwright
 from dotenv import load_dotenv
-import os, time, pandas as pd, pathlib, logging
+import os, time, json, pandas as pd, pathlib, logging
 from datetime import datetime
+from urllib.parse import urlsplit
+
+from . import eims_http
+from .excel_reader import read_excel_streaming, iter_excel_chunks, DEFAULT_CHUNK_ROWS
+from .structured_logger import logger as slog
+from .resource_filter import ResourceStats, install_resource_filter, DEFAULT_BLOCKED_TYPES
+from .selector_cache import SelectorCache, layout_fingerprint
 
 # 로깅 설정
 logging.basicConfig(
@@ -26,446 +33,838 @@ if not ID or not PW:
         f"EIMS_ID/EIMS_PW가 비어 있습니다. {BASE / '.env'} 파일을 확인하세요."
     )
 
-# BASE = pathlib.Path(__file__).resolve().parents[1]
-DL_DIR = BASE / "storage" / "downloads"
+# 다운로드/세션 저장 폴더 (벤치마크·오프라인 테스트 시 EIMS_STORAGE_DIR로 분리)
+STORAGE_DIR = pathlib.Path(os.getenv("EIMS_STORAGE_DIR", str(BASE / "storage")))
+DL_DIR = STORAGE_DIR / "downloads"
 DL_DIR.mkdir(parents=True, exist_ok=True)
 
-# 가능한 로그인 URL들
+# 가능한 로그인 URL들 (EIMS_LOGIN_URLS=쉼표 구분 목록으로 대체 가능, 예: 로컬 대역 서버)
 LOGIN_URLS = [
     # "https://xn--lu5b7kx8m.kr/login.go",
     # "https://www.xn--lu5b7kx8m.kr/login.go", 
     # "https://www.xn--lu5b7kx8m.kr/init.go",
     "https://xn--lu5b7kx8m.kr/init.go"
 ]
-FIELD_URL = "https://www.xn--lu5b7kx8m.kr/ms/field_water.do"
+if os.getenv("EIMS_LOGIN_URLS"):
+    LOGIN_URLS = [u.strip() for u in os.getenv("EIMS_LOGIN_URLS").split(",") if u.strip()]
+FIELD_URL = os.getenv("EIMS_FIELD_URL", "https://www.xn--lu5b7kx8m.kr/ms/field_water.do")
+
+# 로그인 세션 저장 위치 (쿠키/localStorage) - 다음 실행 시 재사용
+SESSION_DIR = STORAGE_DIR / "session"
+SESSION_DIR.mkdir(parents=True, exist_ok=True)
+SESSION_STATE_PATH = SESSION_DIR / "eims_state.json"
+# 저장된 세션을 재사용할 최대 시간 (이보다 오래되면 바로 재로그인)
+SESSION_MAX_AGE_HOURS = float(os.getenv("EIMS_SESSION_MAX_AGE_HOURS", "12"))
+# 로그인 URL 후보 접속 확인 결과 캐시 (유효 시간 동안 다시 확인하지 않고 죽은 후보는 건너뜀)
+LOGIN_PROBE_PATH = SESSION_DIR / "login_probe.json"
+LOGIN_PROBE_TTL_MINUTES = float(os.getenv("EIMS_LOGIN_PROBE_TTL_MINUTES", "60"))
+# 로그인에 성공한 선택자 (페이지 구조 지문별)
+SELECTOR_CACHE_PATH = SESSION_DIR / "login_selectors.json"
+
+# 단계별 대기 한도(ms) - 고정 대기 없이 조건이 충족되는 즉시 다음 단계로 진행
+# 환경변수 EIMS_TIMEOUT_<단계>_MS 로 조정 가능 (예: EIMS_TIMEOUT_LOGIN_SUBMIT_MS=30000)
+PHASE_TIMEOUTS_MS = {
+    "session_check": 15000,   # 저장 세션으로 목표 페이지 확인
+    "login_probe": 5000,      # 로그인 URL 후보 동시 접속 확인 (후보별)
+    "login_page": 30000,      # 로그인 페이지 로딩 + 입력칸 표시
+    "login_enter": 5000,      # Enter 제출 후 이동 확인 (실패 시 버튼 클릭으로 재시도)
+    "login_submit": 30000,    # 로그인 버튼 클릭 후 로그인 페이지를 벗어날 때까지
+    "field_page": 30000,      # field_water.do 이동 + 엑셀출력 버튼 표시
+    "search": 30000,          # 조회기간 입력 후 조회 결과 갱신
+    "download": 60000,        # 엑셀출력 클릭 후 다운로드 이벤트
+}
+# 아이디/비밀번호 입력 시 키 입력 간격(ms)
+TYPE_DELAY_MS = int(os.getenv("EIMS_TYPE_DELAY_MS", "30"))
+
+EXCEL_BUTTON = 'button:has-text("엑셀출력")'
+DATE_FROM_INPUT = '#dateFrom'
+DATE_TO_INPUT = '#dateTo'
+SEARCH_BUTTON = 'button:has-text("조회")'
+
+# 다운로드 방식: auto = 저장된 세션/요청으로 HTTP 직접 다운로드 후 실패 시 브라우저,
+#               browser = 항상 브라우저로 엑셀출력 버튼 클릭
+DOWNLOAD_MODE = os.getenv("EIMS_DOWNLOAD_MODE", "auto").lower()
+# 브라우저 경로에서 캡처한 엑셀출력 요청 (HTTP 직접 다운로드 시 재생)
+EXPORT_RECIPE_PATH = SESSION_DIR / "export_request.json"
+LOGIN_FAILURE_KEYWORDS = ["login", "init"]
+
+# 로그인 화면 선택자 후보 (앞쪽부터 시도, 성공한 선택자는 페이지 구조 지문별로 학습)
+USER_FIELD_SELECTORS = [
+    '#editx_emp_id',
+    'input[name="editx_emp_id"]',
+    'input[id="editx_emp_id"]',
+    'input[name*="emp"]',
+    'input[name*="user"]',
+    'input[name*="id"]',
+    'input[type="text"]'
+]
+PASSWORD_FIELD_SELECTORS = [
+    '#old_password',
+    'input[name="old_password"]',
+    'input[id="old_password"]',
+    'input[type="password"]'
+]
+LOGIN_BUTTON_SELECTORS = [
+    'input[type="submit"]',
+    'button[type="submit"]',
+    'button:has-text("로그인")',
+    'button:has-text("확인")',
+    'input[value*="로그인"]',
+    'input[value*="확인"]'
+]
+LOGIN_BUTTON_KEYWORDS = ["login", "로그인", "확인", "submit"]
+
+# 브라우저 실행 프로필: production = 헤드리스 + 불필요한 리소스 차단 + 작은 뷰포트,
+#                     debug = 기존처럼 브라우저 창을 띄우고 모든 리소스 로드
+SCRAPE_PROFILES = {
+    "production": {
+        "headless": True,
+        "viewport": {'width': 1280, 'height': 800},
+        "block_resources": True,
+    },
+    "debug": {
+        "headless": False,  # 디버깅을 위해 브라우저 창 표시
+        "viewport": {'width': 1920, 'height': 1080},
+        "block_resources": False,
+    },
+}
+PROFILE_NAME = os.getenv("EIMS_PROFILE", "production").lower()
+PROFILE = SCRAPE_PROFILES.get(PROFILE_NAME, SCRAPE_PROFILES["production"])
+# 차단할 리소스 유형 (쉼표 구분, 예: EIMS_BLOCK_TYPES=image,font,media)
+BLOCKED_TYPES = [t.strip() for t in os.getenv("EIMS_BLOCK_TYPES", ",".join(DEFAULT_BLOCKED_TYPES)).split(",") if t.strip()]
+# 디버그 프로필에서 관찰한 리소스 유형별 평균 크기 (차단 시 절약량 추정용)
+RESOURCE_SIZES_PATH = SESSION_DIR / "resource_sizes.json"
+# 컨텍스트별 요청 집계
+_resource_stats = {}
 
 def today(): 
     return datetime.now().strftime("%Y-%m-%d")
 
-def fetch_excel_df(date_from=None, date_to=None):
-    date_from = date_from or today()
-    date_to = date_to or today()
-    
-    logger.info(f"엑셀 다운로드 시작: {date_from} ~ {date_to}")
 
-    browser = None
-    context = None
-    page = None
-    
+def _budget(phase):
+    """단계별 대기 한도(ms) - 환경변수가 있으면 우선"""
+    return int(os.getenv(f"EIMS_TIMEOUT_{phase.upper()}_MS", PHASE_TIMEOUTS_MS[phase]))
+
+
+def _is_login_url(url):
+    return any(keyword in url.lower() for keyword in LOGIN_FAILURE_KEYWORDS)
+
+
+def _wait_left_login_page(page, timeout):
+    """로그인 페이지를 벗어날 때까지(URL 변경) 대기, 한도 내에 벗어나면 True"""
     try:
-        with sync_playwright() as p:
-            logger.info("브라우저 시작 중...")
-            browser = p.chromium.launch(
-                headless=False,  # 디버깅을 위해 브라우저 창 표시
-                args=[
-                    '--no-sandbox', 
-                    '--disable-dev-shm-usage',
-                    '--disable-blink-features=AutomationControlled',  # 자동화 감지 방지
-                    '--disable-web-security',
-                    '--disable-features=VizDisplayCompositor',
-                    '--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-                ]
-            )
-            context = browser.new_context(
-                accept_downloads=True,
-                viewport={'width': 1920, 'height': 1080},  # 뷰포트 설정
-                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                extra_http_headers={
-                    'Accept-Language': 'ko-KR,ko;q=0.9,en;q=0.8'
-                }
-            )
-            page = context.new_page()
-            
-            # 페이지 로딩 타임아웃 설정
-            page.set_default_timeout(60000)  # 60초로 증가
-            page.set_default_navigation_timeout(60000)
-            # 올바른 로그인 페이지 찾기
-            login_success = False
-            for login_url in LOGIN_URLS:
+        page.wait_for_url(lambda url: not _is_login_url(url), timeout=timeout)
+        page.wait_for_load_state("domcontentloaded", timeout=timeout)
+        return True
+    except Exception:
+        return False
+
+
+def _launch_browser(p):
+    """크롬 브라우저 실행"""
+    logger.info(f"브라우저 시작 중... (프로필: {PROFILE_NAME})")
+    return p.chromium.launch(
+        headless=PROFILE["headless"],
+        args=[
+            '--no-sandbox', 
+            '--disable-dev-shm-usage',
+            '--disable-blink-features=AutomationControlled',  # 자동화 감지 방지
+            '--disable-web-security',
+            '--disable-features=VizDisplayCompositor',
+            '--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+        ]
+    )
+
+
+def _load_session_state():
+    """재사용 가능한 저장 세션 파일 경로 반환 (없거나 너무 오래되면 None)"""
+    if not SESSION_STATE_PATH.exists():
+        logger.info("저장된 세션 없음 - 로그인 필요")
+        return None
+    age_hours = (time.time() - SESSION_STATE_PATH.stat().st_mtime) / 3600
+    if age_hours > SESSION_MAX_AGE_HOURS:
+        logger.info(f"저장된 세션이 오래됨 ({age_hours:.1f}시간) - 로그인 필요")
+        return None
+    return str(SESSION_STATE_PATH)
+
+
+def _new_context(browser, storage_state=None):
+    """브라우저 컨텍스트 생성 (저장 세션이 있으면 쿠키/localStorage 복원)"""
+    context = browser.new_context(
+        accept_downloads=True,
+        viewport=PROFILE["viewport"],  # 뷰포트 설정
+        user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+        extra_http_headers={
+            'Accept-Language': 'ko-KR,ko;q=0.9,en;q=0.8'
+        },
+        storage_state=storage_state
+    )
+
+    stats = ResourceStats(RESOURCE_SIZES_PATH)
+    context.on("response", stats.on_response)
+    if PROFILE["block_resources"]:
+        allowed_hosts = [urlsplit(u).hostname for u in LOGIN_URLS + [FIELD_URL]]
+        install_resource_filter(context, stats, allowed_hosts, BLOCKED_TYPES)
+    _resource_stats[context] = stats
+    return context
+
+
+def _report_resource_stats(context):
+    """이번 실행에서 로드/차단된 요청 수와 바이트 로그"""
+    stats = _resource_stats.get(context)
+    if stats is None:
+        return None
+    summary = stats.report(blocking=PROFILE["block_resources"])
+    logger.info(
+        f"요청 통계: 로드 {summary['requests_loaded']}건/{summary['bytes_loaded']} bytes, "
+        f"차단 {summary['requests_blocked']}건 (추정 절약 {summary['bytes_saved_estimate']} bytes) "
+        f"{summary['blocked_by_type']}"
+    )
+    return summary
+
+
+def _save_session(context):
+    """로그인된 세션 상태를 storage/session 아래에 저장"""
+    try:
+        context.storage_state(path=str(SESSION_STATE_PATH))
+        logger.info(f"✅ 세션 저장 완료: {SESSION_STATE_PATH}")
+    except Exception as e:
+        logger.warning(f"세션 저장 실패 (다음 실행 시 재로그인): {e}")
+
+
+def invalidate_session():
+    """저장된 세션 삭제 (다음 실행 시 전체 로그인 수행)"""
+    try:
+        SESSION_STATE_PATH.unlink()
+        logger.info("저장된 세션 삭제")
+    except FileNotFoundError:
+        pass
+
+
+def _session_is_valid(page):
+    """저장 세션으로 목표 페이지에 바로 접근 가능한지 가볍게 확인"""
+    try:
+        logger.info("저장된 세션 유효성 확인 중...")
+        timeout = _budget("session_check")
+        page.goto(FIELD_URL, wait_until="domcontentloaded", timeout=timeout)
+        # 엑셀출력 버튼(세션 유효) 또는 비밀번호 입력칸(세션 만료) 중 먼저 보이는 쪽으로 판단
+        page.wait_for_selector(f'{EXCEL_BUTTON}, input[type="password"]', state="visible", timeout=timeout)
+        if "field_water" in page.url.lower() and not _is_login_url(page.url):
+            if page.query_selector('input[type="password"]') is None:
+                logger.info("✅ 저장된 세션 유효 - 로그인 생략")
+                return True
+        logger.info(f"저장된 세션 만료 (현재 URL: {page.url})")
+    except Exception as e:
+        logger.warning(f"세션 확인 실패: {e}")
+    return False
+
+
+def _load_login_probe():
+    """유효 시간 안의 접속 확인 결과 {url: 응답시간 또는 None} (없거나 후보 목록이 바뀌면 None)"""
+    try:
+        cached = json.loads(LOGIN_PROBE_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if cached.get("urls") != LOGIN_URLS:
+        return None
+    if time.time() - cached.get("probed_at", 0) > LOGIN_PROBE_TTL_MINUTES * 60:
+        return None
+    return cached.get("results")
+
+
+def invalidate_login_probe():
+    """접속 확인 캐시 삭제 (다음 로그인 시 후보를 다시 확인)"""
+    try:
+        LOGIN_PROBE_PATH.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def _login_candidates():
+    """로그인 URL 후보를 응답이 빠른 순으로 반환 (접속 불가 후보 제외)
+
+    후보가 여러 개일 때만 동시에 접속 확인하며, 결과는 LOGIN_PROBE_TTL_MINUTES 동안 재사용한다.
+    모든 후보가 응답하지 않으면 기존 순서대로 전부 시도한다.
+    """
+    if len(LOGIN_URLS) < 2:
+        return list(LOGIN_URLS)
+
+    results = _load_login_probe()
+    if results is None:
+        with slog.span("login_probe", candidates=len(LOGIN_URLS)) as span:
+            results = eims_http.probe_urls(LOGIN_URLS, timeout=_budget("login_probe") / 1000)
+            span["alive"] = sum(1 for t in results.values() if t is not None)
+        try:
+            LOGIN_PROBE_PATH.write_text(json.dumps(
+                {"urls": LOGIN_URLS, "probed_at": time.time(), "results": results}, indent=2), encoding="utf-8")
+        except OSError as e:
+            logger.warning(f"로그인 URL 확인 결과 저장 실패: {e}")
+    else:
+        logger.info("로그인 URL 확인 결과 캐시 사용")
+
+    alive = sorted((t, url) for url, t in results.items() if t is not None)
+    dead = [url for url, t in results.items() if t is None]
+    if dead:
+        logger.info(f"응답 없는 로그인 URL 제외: {dead}")
+    if not alive:
+        logger.warning("응답하는 로그인 URL이 없음 - 모든 후보를 순서대로 시도")
+        return list(LOGIN_URLS)
+    return [url for _, url in alive]
+
+
+def _usable(elem):
+    return elem.is_visible() and elem.is_enabled()
+
+
+def _is_login_button(elem):
+    text = elem.inner_text().lower().strip()
+    value = elem.get_attribute("value") or ""
+    logger.info(f"버튼 확인: 텍스트='{text}', 값='{value}'")
+    return any(keyword in text or keyword in value.lower() for keyword in LOGIN_BUTTON_KEYWORDS) and _usable(elem)
+
+
+def _find_element(page, role, selectors, cache, fingerprint, accept=_usable):
+    """학습된 선택자를 먼저 시도하고, 없거나 맞지 않으면 후보 목록에서 찾기 -> (요소, 선택자)"""
+    known = cache.get(fingerprint, role)
+    if known:
+        try:
+            for elem in page.query_selector_all(known):
+                if accept(elem):
+                    cache.hits += 1
+                    return elem, known
+        except Exception:
+            pass
+        logger.info(f"학습된 {role} 선택자가 맞지 않음: {known}")
+        cache.forget(fingerprint, role)
+
+    cache.misses += 1
+    for selector in selectors:
+        if selector == known:
+            continue
+        try:
+            for elem in page.query_selector_all(selector):
                 try:
-                    logger.info(f"로그인 페이지 시도 중: {login_url}")
-                    page.goto(login_url, timeout=60000)
-                    
-                    # 페이지가 완전히 로드될 때까지 충분히 대기
-                    logger.info("페이지 로딩 대기 중...")
-                    page.wait_for_timeout(5000)  # 5초 대기
-                    page.wait_for_load_state("domcontentloaded", timeout=30000)
-                    page.wait_for_load_state("networkidle", timeout=30000)
-                    
-                    # 로그인 필드 찾기 - 더 유연한 방식
-                    logger.info("로그인 필드 찾는 중...")
-                    
-                    # 여러 방법으로 사용자 필드 찾기
-                    user_selectors = [
-                        '#editx_emp_id',
-                        'input[name="editx_emp_id"]',
-                        'input[id="editx_emp_id"]',
-                        'input[name*="emp"]',
-                        'input[name*="user"]',
-                        'input[name*="id"]',
-                        'input[type="text"]'
-                    ]
-                    
-                    password_selectors = [
-                        '#old_password',
-                        'input[name="old_password"]',
-                        'input[id="old_password"]',
-                        'input[type="password"]'
-                    ]
-                    
-                    user_field = None
-                    password_field = None
-                    
-                    # 사용자 필드 찾기
-                    for selector in user_selectors:
-                        try:
-                            elements = page.query_selector_all(selector)
-                            for elem in elements:
-                                if elem.is_visible() and elem.is_enabled():
-                                    user_field = elem
-                                    logger.info(f"사용자 필드 발견: {selector}")
-                                    break
-                            if user_field:
-                                break
-                        except:
-                            continue
-                    
-                    # 비밀번호 필드 찾기
-                    for selector in password_selectors:
-                        try:
-                            elements = page.query_selector_all(selector)
-                            for elem in elements:
-                                if elem.is_visible() and elem.is_enabled():
-                                    password_field = elem
-                                    logger.info(f"비밀번호 필드 발견: {selector}")
-                                    break
-                            if password_field:
-                                break
-                        except:
-                            continue
-                    
-                    if user_field and password_field:
-                        logger.info(f"✅ 로그인 페이지 발견: {login_url}")
-                        
-                        # 로그인 시도 - 완전히 수정된 구조
-                        logger.info("로그인 정보 입력 시작...")
-                        
-                        # 페이지가 안정화될 때까지 대기
-                        page.wait_for_timeout(2000)
-                        
-                        # 요소가 실제로 상호작용 가능한지 다시 확인
-                        if not user_field.is_visible() or not user_field.is_enabled():
-                            logger.warning("사용자 필드가 상호작용 불가능, 다시 찾는 중...")
-                            user_field = page.query_selector('#editx_emp_id')
-                            if not user_field:
-                                user_field = page.query_selector('input[name="editx_emp_id"]')
-                        
-                        if not password_field.is_visible() or not password_field.is_enabled():
-                            logger.warning("비밀번호 필드가 상호작용 불가능, 다시 찾는 중...")
-                            password_field = page.query_selector('#old_password')
-                            if not password_field:
-                                password_field = page.query_selector('input[name="old_password"]')
-                        
-                        if not user_field or not password_field:
-                            logger.error("로그인 필드를 찾을 수 없음")
-                            continue
-                        
-                        # 요소를 화면에 보이도록 스크롤
-                        user_field.scroll_into_view_if_needed()
-                        password_field.scroll_into_view_if_needed()
-                        
-                        # 추가 대기
-                        page.wait_for_timeout(1000)
-                        
-                        # 사용자 ID 입력
-                        logger.info("사용자 ID 입력 중...")
-                        user_field.click()
-                        page.wait_for_timeout(500)
-                        user_field.fill("")  # 기존 내용 클리어
-                        page.wait_for_timeout(500)
-                        user_field.type(ID, delay=200)  # 더 천천히 타이핑
-                        
-                        # 비밀번호 입력
-                        logger.info("비밀번호 입력 중...")
-                        password_field.click()
-                        page.wait_for_timeout(500)
-                        password_field.fill("")  # 기존 내용 클리어
-                        page.wait_for_timeout(500)
-                        password_field.type(PW, delay=200)  # 더 천천히 타이핑
-                        
-                        logger.info("✅ 로그인 정보 입력 완료")
-                        
-                        # 로그인 버튼 찾기 및 클릭
-                        logger.info("로그인 버튼 찾는 중...")
-                        
-                        # 방법 1: Enter 키로 먼저 시도 (가장 안정적)
-                        logger.info("방법 1: Enter 키로 로그인 시도")
-                        password_field.press("Enter")
-                        logger.info("✅ Enter 키로 로그인 시도 완료")
-                        
-                        # 방법 2: 버튼 클릭으로 시도
-                        logger.info("방법 2: 로그인 버튼 클릭 시도")
-                        button_selectors = [
-                            'input[type="submit"]',
-                            'button[type="submit"]',
-                            'button:has-text("로그인")',
-                            'button:has-text("확인")',
-                            'input[value*="로그인"]',
-                            'input[value*="확인"]'
-                        ]
-                        
-                        login_clicked = False
-                        for selector in button_selectors:
-                            try:
-                                buttons = page.query_selector_all(selector)
-                                for btn in buttons:
-                                    try:
-                                        text = btn.inner_text().lower().strip()
-                                        value = btn.get_attribute("value") or ""
-                                        logger.info(f"버튼 확인: 텍스트='{text}', 값='{value}'")
-                                        
-                                        if any(keyword in text or keyword in value.lower() for keyword in ["login", "로그인", "확인", "submit"]):
-                                            if btn.is_visible() and btn.is_enabled():
-                                                btn.scroll_into_view_if_needed()
-                                                page.wait_for_timeout(1000)
-                                                btn.click()
-                                                logger.info(f"✅ 로그인 버튼 클릭: '{text or value}'")
-                                                login_clicked = True
-                                                break
-                                    except Exception as e:
-                                        logger.warning(f"버튼 클릭 실패: {e}")
-                                        continue
-                                if login_clicked:
-                                    break
-                            except:
-                                continue
-                        
-                        if not login_clicked:
-                            logger.warning("로그인 버튼을 찾을 수 없음")
-                        
-                        logger.info("✅ 로그인 버튼 클릭 완료")
-                        # 로그인 후 페이지 이동 대기
-                        logger.info("로그인 후 페이지 로딩 대기 중...")
-                        
-                        # 로그인 처리 대기 - 더 긴 시간
-                        logger.info("로그인 처리 대기 중... (10초)")
-                        page.wait_for_timeout(10000)  # 10초 대기
-                        
-                        # 페이지 로딩 상태 확인
-                        logger.info("페이지 로딩 상태 확인 중...")
-                        try:
-                            page.wait_for_load_state("networkidle", timeout=30000)
-                            logger.info("네트워크 대기 완료")
-                        except:
-                            logger.warning("네트워크 대기 타임아웃, 계속 진행")
-                        
-                        # 추가 대기
-                        page.wait_for_timeout(3000)
-                        
-                        # 로그인 성공 여부 확인
-                        current_url = page.url
-                        logger.info(f"현재 URL: {current_url}")
-                        
-                        # 페이지 제목 확인
-                        try:
-                            page_title = page.title()
-                            logger.info(f"페이지 제목: {page_title}")
-                        except:
-                            logger.warning("페이지 제목을 가져올 수 없음")
-                        
-                        # 로그인 성공 조건 확인 - notify.do 포함
-                        success_keywords = ["main", "home", "dashboard", "menu", "ms/field_water", "field_water", "notify.do", "ms/"]
-                        failure_keywords = ["login", "init"]
-                        
-                        is_success = any(keyword in current_url.lower() for keyword in success_keywords)
-                        is_failure = any(keyword in current_url.lower() for keyword in failure_keywords)
-                        
-                        logger.info(f"성공 키워드 매칭: {is_success}")
-                        logger.info(f"실패 키워드 매칭: {is_failure}")
-                        
-                        if is_success or not is_failure:
-                            logger.info("✅ 로그인 성공!")
-                            
-                            # 현재 URL이 이미 목표 페이지인지 확인
-                            if "field_water" in current_url.lower():
-                                logger.info("✅ 이미 목표 페이지에 도달됨! 추가 이동 불필요")
-                                login_success = True
-                                break
-                            
-                            login_success = True
-                            break
-                        else:
-                            # 로그인 실패 시 오류 메시지 확인
-                            logger.info("로그인 실패 - 오류 메시지 확인 중...")
-                            try:
-                                error_elements = page.query_selector_all('.error, .alert, .warning, [class*="error"], [class*="alert"], .msg, .message, .fail')
-                                if error_elements:
-                                    for elem in error_elements:
-                                        error_text = elem.inner_text().strip()
-                                        if error_text:
-                                            logger.warning(f"로그인 오류 메시지: {error_text}")
-                            except:
-                                pass
-                            
-                            # 페이지 내용 일부 확인
-                            try:
-                                page_content = page.content()
-                                if "로그인" in page_content or "login" in page_content.lower():
-                                    logger.warning("페이지에 로그인 관련 내용이 여전히 있음")
-                                else:
-                                    logger.info("페이지에 로그인 관련 내용이 없음 - 성공 가능성 있음")
-                            except:
-                                pass
-                            
-                            logger.warning("로그인 실패 - 여전히 로그인 페이지에 있음")
-                    
+                    if accept(elem):
+                        cache.learn(fingerprint, role, selector)
+                        return elem, selector
                 except Exception as e:
-                    logger.error(f"로그인 페이지 시도 실패 {login_url}: {e}")
+                    logger.warning(f"{role} 요소 확인 실패: {e}")
+        except Exception:
+            continue
+    return None, None
+
+
+def _login(page):
+    """응답이 빠른 로그인 URL부터 차례로 시도하여 로그인 (성공 시 True)"""
+    cache = SelectorCache(SELECTOR_CACHE_PATH)
+    fingerprint = None
+    # 올바른 로그인 페이지 찾기
+    login_success = False
+    for login_url in _login_candidates():
+        try:
+            logger.info(f"로그인 페이지 시도 중: {login_url}")
+            page.goto(login_url, wait_until="domcontentloaded", timeout=_budget("login_page"))
+
+            # 고정 대기 대신 비밀번호 입력칸이 실제로 보일 때까지 대기
+            logger.info("로그인 입력칸 표시 대기 중...")
+            page.wait_for_selector('input[type="password"]', state="visible", timeout=_budget("login_page"))
+
+            # 로그인 필드 찾기 - 같은 구조의 페이지에서 성공했던 선택자부터 시도
+            logger.info("로그인 필드 찾는 중...")
+            fingerprint = layout_fingerprint(page)
+
+            user_field, selector = _find_element(page, "user", USER_FIELD_SELECTORS, cache, fingerprint)
+            if user_field:
+                logger.info(f"사용자 필드 발견: {selector}")
+
+            password_field, selector = _find_element(page, "password", PASSWORD_FIELD_SELECTORS, cache, fingerprint)
+            if password_field:
+                logger.info(f"비밀번호 필드 발견: {selector}")
+
+            if user_field and password_field:
+                logger.info(f"✅ 로그인 페이지 발견: {login_url}")
+
+                # 로그인 시도 - 완전히 수정된 구조
+                logger.info("로그인 정보 입력 시작...")
+
+                # 요소가 실제로 상호작용 가능한지 다시 확인
+                if not user_field.is_visible() or not user_field.is_enabled():
+                    logger.warning("사용자 필드가 상호작용 불가능, 다시 찾는 중...")
+                    user_field = page.query_selector('#editx_emp_id')
+                    if not user_field:
+                        user_field = page.query_selector('input[name="editx_emp_id"]')
+
+                if not password_field.is_visible() or not password_field.is_enabled():
+                    logger.warning("비밀번호 필드가 상호작용 불가능, 다시 찾는 중...")
+                    password_field = page.query_selector('#old_password')
+                    if not password_field:
+                        password_field = page.query_selector('input[name="old_password"]')
+
+                if not user_field or not password_field:
+                    logger.error("로그인 필드를 찾을 수 없음")
                     continue
-            
-            if not login_success:
-                logger.error("모든 로그인 URL에서 로그인에 실패했습니다.")
-                raise Exception("모든 로그인 URL에서 로그인에 실패했습니다.")
-
-            # 목표 페이지 확인 및 이동 (필요한 경우만)
-            current_url = page.url
-            logger.info(f"현재 URL: {current_url}")
-            
-            if "field_water" in current_url.lower():
-                logger.info("✅ 이미 목표 페이지에 있음! 이동 불필요")
-            else:
-                logger.info("목표 페이지로 이동 필요")
-                
-                # 같은 도메인으로 이동 (올바른 경로로)
-                if "notify.do" in current_url:
-                    # notify.do에서 field_water.do로 이동 (public 폴더에서 ms 폴더로)
-                    target_url = current_url.replace("/ms/public/notify.do", "/ms/field_water.do")
-                else:
-                    target_url = current_url.replace("/ms/", "/ms/field_water.do")
-                
-                logger.info(f"같은 도메인으로 이동: {target_url}")
-                
+
+                # 요소를 화면에 보이도록 스크롤
+                user_field.scroll_into_view_if_needed()
+                password_field.scroll_into_view_if_needed()
+
+                # 사용자 ID 입력
+                logger.info("사용자 ID 입력 중...")
+                user_field.click()
+                user_field.fill("")  # 기존 내용 클리어
+                user_field.type(ID, delay=TYPE_DELAY_MS)
+
+                # 비밀번호 입력
+                logger.info("비밀번호 입력 중...")
+                password_field.click()
+                password_field.fill("")  # 기존 내용 클리어
+                password_field.type(PW, delay=TYPE_DELAY_MS)
+
+                logger.info("✅ 로그인 정보 입력 완료")
+
+                # 로그인 버튼 찾기 및 클릭
+                logger.info("로그인 버튼 찾는 중...")
+
+                # 방법 1: Enter 키로 먼저 시도 (가장 안정적)
+                logger.info("방법 1: Enter 키로 로그인 시도")
+                password_field.press("Enter")
+                logger.info("✅ Enter 키로 로그인 시도 완료")
+
+                # Enter로 로그인 페이지를 벗어나면 버튼 클릭은 생략
+                left_login = _wait_left_login_page(page, _budget("login_enter"))
+
+                # 방법 2: 버튼 클릭으로 시도 (Enter로 이동하지 않은 경우만)
+                login_clicked = False
+                if not left_login:
+                    logger.info("방법 2: 로그인 버튼 클릭 시도")
+                    btn, selector = _find_element(page, "button", LOGIN_BUTTON_SELECTORS, cache, fingerprint,
+                                                  accept=_is_login_button)
+                    if btn:
+                        try:
+                            btn.scroll_into_view_if_needed()
+                            btn.click()
+                            logger.info(f"✅ 로그인 버튼 클릭: {selector}")
+                            login_clicked = True
+                        except Exception as e:
+                            logger.warning(f"버튼 클릭 실패: {e}")
+
+                if login_clicked:
+                    logger.info("로그인 후 페이지 이동 대기 중...")
+                    _wait_left_login_page(page, _budget("login_submit"))
+                elif not left_login:
+                    logger.warning("로그인 버튼을 찾을 수 없음")
+
+                # 로그인 성공 여부 확인
+                current_url = page.url
+                logger.info(f"현재 URL: {current_url}")
+
+                # 페이지 제목 확인
                 try:
-                    # 실제 페이지 이동 전후 URL 확인
-                    logger.info(f"이동 전 실제 URL: {page.url}")
-                    page.goto(target_url, timeout=60000)
-                    logger.info(f"page.goto() 완료")
-                    
-                    page.wait_for_load_state("networkidle", timeout=30000)
-                    logger.info(f"네트워크 대기 완료")
-                    
-                    final_url = page.url
-                    logger.info(f"이동 후 실제 URL: {final_url}")
-                    
-                    # 페이지 제목도 확인
+                    page_title = page.title()
+                    logger.info(f"페이지 제목: {page_title}")
+                except:
+                    logger.warning("페이지 제목을 가져올 수 없음")
+
+                # 로그인 성공 조건 확인 - notify.do 포함
+                success_keywords = ["main", "home", "dashboard", "menu", "ms/field_water", "field_water", "notify.do", "ms/"]
+
+                is_success = any(keyword in current_url.lower() for keyword in success_keywords)
+                is_failure = _is_login_url(current_url)
+
+                logger.info(f"성공 키워드 매칭: {is_success}")
+                logger.info(f"실패 키워드 매칭: {is_failure}")
+
+                if is_success or not is_failure:
+                    logger.info("✅ 로그인 성공!")
+
+                    # 현재 URL이 이미 목표 페이지인지 확인
+                    if "field_water" in current_url.lower():
+                        logger.info("✅ 이미 목표 페이지에 도달됨! 추가 이동 불필요")
+                        login_success = True
+                        break
+
+                    login_success = True
+                    break
+                else:
+                    # 로그인 실패 시 오류 메시지 확인
+                    logger.info("로그인 실패 - 오류 메시지 확인 중...")
                     try:
-                        page_title = page.title()
-                        logger.info(f"페이지 제목: {page_title}")
+                        error_elements = page.query_selector_all('.error, .alert, .warning, [class*="error"], [class*="alert"], .msg, .message, .fail')
+                        if error_elements:
+                            for elem in error_elements:
+                                error_text = elem.inner_text().strip()
+                                if error_text:
+                                    logger.warning(f"로그인 오류 메시지: {error_text}")
                     except:
-                        logger.warning("페이지 제목을 가져올 수 없음")
-                    
-                    if "field_water" in final_url.lower():
-                        logger.info("✅ 목표 페이지 도달 성공!")
-                    else:
-                        logger.error(f"❌ 목표 페이지 도달 실패: {final_url}")
-                        logger.error(f"예상 URL: {target_url}")
-                        logger.error(f"실제 URL: {final_url}")
-                        raise Exception(f"목표 페이지에 도달할 수 없습니다: {final_url}")
-                        
-                except Exception as e:
-                    logger.error(f"목표 페이지 이동 실패: {e}")
-                    logger.error(f"현재 URL: {page.url}")
-                    raise
-            
-            logger.info("✅ 목표 페이지 준비 완료")
-
-            # (필요 시) 날짜 필터 셀렉터 채우기
-            # page.fill('#dateFrom', date_from)
-            # page.fill('#dateTo', date_to)
-            # page.click('button:has-text("조회")')
-
-            # 엑셀 출력 버튼 클릭 - 현재 페이지 확인 후
-            logger.info("엑셀출력 버튼 클릭 시도 중...")
-            
-            # 현재 페이지 URL 재확인
-            current_page_url = page.url
-            logger.info(f"엑셀 버튼 클릭 전 현재 URL: {current_page_url}")
-            
-            if "field_water" not in current_page_url.lower():
-                logger.error(f"❌ 목표 페이지가 아님! 현재 URL: {current_page_url}")
-                raise Exception(f"목표 페이지에 있지 않습니다. 현재 URL: {current_page_url}")
-            
-            # 다운로드 이벤트 리스너 설정
-            downloads = []
-            def handle_download(download):
-                downloads.append(download)
-                logger.info(f"다운로드 이벤트 감지: {download.suggested_filename}")
-            
-            page.on("download", handle_download)
-            
-            # 엑셀 출력 버튼 클릭
-            try:
-                logger.info("엑셀출력 버튼 클릭 시도")
-                with page.expect_download(timeout=30000) as dl_info:
-                    page.click('button:has-text("엑셀출력")')
-                download = dl_info.value
-                logger.info(f"✅ 다운로드 성공: {download.suggested_filename}")
-            except Exception as e:
-                logger.error(f"엑셀출력 버튼 클릭 실패: {e}")
-                raise Exception("엑셀 다운로드 버튼을 클릭할 수 없습니다.")
-            
-            filename = f"field_water_{date_from}_{int(time.time())}.xlsx"
-            save_to = DL_DIR / filename
-            
-            logger.info(f"저장할 파일 경로: {save_to}")
-            
-            # 파일 저장 - 이전 방식대로 단순하게
+                        pass
+
+                    # 페이지 내용 일부 확인
+                    try:
+                        page_content = page.content()
+                        if "로그인" in page_content or "login" in page_content.lower():
+                            logger.warning("페이지에 로그인 관련 내용이 여전히 있음")
+                        else:
+                            logger.info("페이지에 로그인 관련 내용이 없음 - 성공 가능성 있음")
+                    except:
+                        pass
+
+                    logger.warning("로그인 실패 - 여전히 로그인 페이지에 있음")
+
+        except Exception as e:
+            logger.error(f"로그인 페이지 시도 실패 {login_url}: {e}")
+            continue
+
+    if login_success:
+        cache.save()
+    else:
+        cache.discard()
+        # 캐시된 확인 결과가 틀렸을 수 있으므로 다음 로그인 때 다시 확인
+        invalidate_login_probe()
+    logger.info(f"로그인 선택자 캐시: 적중 {cache.hits}, 미적중 {cache.misses} (지문 {fingerprint})")
+    slog.log_event("login_selectors", run_id=slog.run_id, fingerprint=fingerprint, ok=login_success, **cache.stats())
+    return login_success
+
+
+def _goto_field_page(page):
+    """로그인 후 현장수질(field_water.do) 페이지로 이동"""
+    # 목표 페이지 확인 및 이동 (필요한 경우만)
+    current_url = page.url
+    logger.info(f"현재 URL: {current_url}")
+
+    if "field_water" in current_url.lower():
+        logger.info("✅ 이미 목표 페이지에 있음! 이동 불필요")
+    else:
+        logger.info("목표 페이지로 이동 필요")
+
+        # 같은 도메인으로 이동 (올바른 경로로)
+        if "notify.do" in current_url:
+            # notify.do에서 field_water.do로 이동 (public 폴더에서 ms 폴더로)
+            target_url = current_url.replace("/ms/public/notify.do", "/ms/field_water.do")
+        else:
+            target_url = current_url.replace("/ms/", "/ms/field_water.do")
+
+        logger.info(f"같은 도메인으로 이동: {target_url}")
+
+        try:
+            # 실제 페이지 이동 전후 URL 확인
+            logger.info(f"이동 전 실제 URL: {page.url}")
+            page.goto(target_url, wait_until="domcontentloaded", timeout=_budget("field_page"))
+            logger.info(f"page.goto() 완료")
+
+            final_url = page.url
+            logger.info(f"이동 후 실제 URL: {final_url}")
+
+            # 페이지 제목도 확인
             try:
-                logger.info(f"파일 저장 중: {save_to}")
-                download.save_as(str(save_to))
-                logger.info("✅ 파일 저장 완료")
-                
-                # 파일 확인
-                if save_to.exists():
-                    file_size = save_to.stat().st_size
-                    logger.info(f"파일 크기: {file_size} bytes")
-                    if file_size > 0:
-                        logger.info("✅ 파일 다운로드 성공!")
-                    else:
-                        logger.error("❌ 파일이 비어있음!")
-                        raise Exception("다운로드된 파일이 비어있습니다.")
-                else:
-                    logger.error("❌ 파일이 저장되지 않음!")
-                    raise Exception("파일 저장에 실패했습니다.")
-                    
-            except Exception as e:
-                logger.error(f"파일 저장 중 오류 발생: {e}")
-                raise
+                page_title = page.title()
+                logger.info(f"페이지 제목: {page_title}")
+            except:
+                logger.warning("페이지 제목을 가져올 수 없음")
+
+            if "field_water" in final_url.lower():
+                logger.info("✅ 목표 페이지 도달 성공!")
+            else:
+                logger.error(f"❌ 목표 페이지 도달 실패: {final_url}")
+                logger.error(f"예상 URL: {target_url}")
+                logger.error(f"실제 URL: {final_url}")
+                raise Exception(f"목표 페이지에 도달할 수 없습니다: {final_url}")
+
+        except Exception as e:
+            logger.error(f"목표 페이지 이동 실패: {e}")
+            logger.error(f"현재 URL: {page.url}")
+            raise
+
+    # 엑셀출력 버튼이 보이면 다운로드 준비 완료
+    page.wait_for_selector(EXCEL_BUTTON, state="visible", timeout=_budget("field_page"))
+    logger.info("✅ 목표 페이지 준비 완료")
+
+
+def _apply_date_filter(page, date_from, date_to):
+    """조회기간 입력 후 조회 (입력칸이 없는 화면이면 False)"""
+    if page.query_selector(DATE_FROM_INPUT) is None or page.query_selector(DATE_TO_INPUT) is None:
+        logger.warning("조회기간 입력칸이 없어 기본 화면 그대로 다운로드합니다.")
+        return False
+
+    logger.info(f"조회기간 설정: {date_from} ~ {date_to}")
+    with slog.span("search"):
+        page.fill(DATE_FROM_INPUT, date_from)
+        page.fill(DATE_TO_INPUT, date_to)
+        page.click(SEARCH_BUTTON)
+        try:
+            page.wait_for_load_state("networkidle", timeout=_budget("search"))
+        except Exception:
+            logger.warning("조회 결과 대기 한도 초과, 계속 진행")
+        page.wait_for_selector(EXCEL_BUTTON, state="visible", timeout=_budget("search"))
+    return True
+
+
+def _new_download_path(date_from):
+    return DL_DIR / f"field_water_{date_from}_{int(time.time())}.xlsx"
+
+
+def _download_excel(page, date_from, date_to):
+    """엑셀출력 버튼으로 파일을 내려받아 storage/downloads에 저장 후 경로 반환"""
+    # 엑셀 출력 버튼 클릭 - 현재 페이지 확인 후
+    logger.info("엑셀출력 버튼 클릭 시도 중...")
+
+    # 현재 페이지 URL 재확인
+    current_page_url = page.url
+    logger.info(f"엑셀 버튼 클릭 전 현재 URL: {current_page_url}")
+
+    if "field_water" not in current_page_url.lower():
+        logger.error(f"❌ 목표 페이지가 아님! 현재 URL: {current_page_url}")
+        raise Exception(f"목표 페이지에 있지 않습니다. 현재 URL: {current_page_url}")
+
+    # 클릭 중 발생한 요청을 기록해 두었다가 다운로드 요청을 레시피로 저장
+    requests_seen = []
+    on_request = requests_seen.append
+    page.on("request", on_request)
+
+    # 엑셀 출력 버튼 클릭 후 다운로드 이벤트 대기
+    try:
+        logger.info("엑셀출력 버튼 클릭 시도")
+        with slog.span("export", mode="browser"):
+            with page.expect_download(timeout=_budget("download")) as dl_info:
+                page.click(EXCEL_BUTTON)
+            download = dl_info.value
+        logger.info(f"✅ 다운로드 성공: {download.suggested_filename}")
+    except Exception as e:
+        logger.error(f"엑셀출력 버튼 클릭 실패: {e}")
+        raise Exception("엑셀 다운로드 버튼을 클릭할 수 없습니다.")
+    finally:
+        page.remove_listener("request", on_request)
+
+    export_request = next((r for r in reversed(requests_seen) if r.url == download.url), None)
+    if export_request:
+        # 재생 시 기간을 바꿀 수 있도록 요청에 실린 실제 조회기간 값을 함께 저장
+        form_from, form_to = date_from, date_to
+        from_param = to_param = None
+        if page.query_selector(DATE_FROM_INPUT) and page.query_selector(DATE_TO_INPUT):
+            form_from = page.input_value(DATE_FROM_INPUT) or date_from
+            form_to = page.input_value(DATE_TO_INPUT) or date_to
+            from_param = page.get_attribute(DATE_FROM_INPUT, "name")
+            to_param = page.get_attribute(DATE_TO_INPUT, "name")
+        eims_http.save_recipe(EXPORT_RECIPE_PATH, export_request, date_from=form_from, date_to=form_to,
+                              from_param=from_param, to_param=to_param)
+        logger.info(f"엑셀출력 요청 저장: {export_request.method} {export_request.url}")
+
+    save_to = _new_download_path(date_from)
+
+    logger.info(f"저장할 파일 경로: {save_to}")
+
+    # 파일 저장 - 이전 방식대로 단순하게
+    try:
+        logger.info(f"파일 저장 중: {save_to}")
+        with slog.span("save") as span:
+            download.save_as(str(save_to))
+            span["bytes"] = save_to.stat().st_size if save_to.exists() else 0
+        logger.info("✅ 파일 저장 완료")
+
+        # 파일 확인
+        if save_to.exists():
+            file_size = save_to.stat().st_size
+            logger.info(f"파일 크기: {file_size} bytes")
+            if file_size > 0:
+                logger.info("✅ 파일 다운로드 성공!")
+            else:
+                logger.error("❌ 파일이 비어있음!")
+                raise Exception("다운로드된 파일이 비어있습니다.")
+        else:
+            logger.error("❌ 파일이 저장되지 않음!")
+            raise Exception("파일 저장에 실패했습니다.")
+
+    except Exception as e:
+        logger.error(f"파일 저장 중 오류 발생: {e}")
+        raise
+
+    return save_to
+
+
+def _direct_download(date_from, date_to):
+    """저장된 세션 쿠키로 엑셀출력 요청을 직접 재생 (브라우저 미사용)"""
+    recipe = eims_http.load_recipe(EXPORT_RECIPE_PATH)
+    if recipe is None:
+        raise eims_http.DirectExportError("저장된 엑셀출력 요청이 없습니다.")
+    if _load_session_state() is None:
+        raise eims_http.DirectExportError("재사용 가능한 세션이 없습니다.")
+
+    recipe = eims_http.with_dates(recipe, date_from, date_to)
+
+    session = eims_http.get_session()
+    eims_http.load_cookies(session, SESSION_STATE_PATH)
+    save_to = _new_download_path(date_from)
+    logger.info(f"HTTP 직접 다운로드: {recipe['method']} {recipe['url']}")
+    # HTTP 경로는 요청과 파일 저장이 한 번에 일어나므로 export 단계로 함께 측정
+    with slog.span("export", mode="http") as span:
+        size = eims_http.download_export(recipe, save_to, session=session, timeout=_budget("download") / 1000)
+        span["bytes"] = size
+    logger.info(f"✅ HTTP 직접 다운로드 완료: {save_to} ({size} bytes)")
+    return save_to
+
+
+def prepare_field_page(context, check_session=True):
+    """컨텍스트의 페이지를 로그인된 field_water.do 화면으로 준비 (필요할 때만 로그인)"""
+    page = context.pages[0] if context.pages else context.new_page()
+
+    # 페이지 로딩 타임아웃 설정
+    page.set_default_timeout(60000)  # 60초로 증가
+    page.set_default_navigation_timeout(60000)
+
+    # 1) 저장된(또는 살아 있는) 세션이 있으면 먼저 재사용 시도
+    if check_session:
+        with slog.span("session_check") as span:
+            span["valid"] = _session_is_valid(page)
+        if span["valid"]:
+            return page
+        context.clear_cookies()
+        invalidate_session()
+
+    # 2) 세션이 없거나 만료된 경우에만 전체 로그인 수행
+    with slog.span("login"):
+        if not _login(page):
+            logger.error("모든 로그인 URL에서 로그인에 실패했습니다.")
+            raise Exception("모든 로그인 URL에서 로그인에 실패했습니다.")
 
-            # 엑셀 파일 읽기
-            logger.info("엑셀 파일 읽기 시도 중...")
+    with slog.span("navigate"):
+        _goto_field_page(page)
+    _save_session(context)
+    return page
+
+
+def download_with_context(context, date_from, date_to, check_session=True):
+    """이미 열린 브라우저 컨텍스트로 조회기간 설정 후 엑셀 다운로드, (저장 경로, 조회기간 적용 여부) 반환
+
+    조회기간 입력칸이 없어 기본 화면을 그대로 받았으면 적용 여부는 False
+    """
+    page = prepare_field_page(context, check_session)
+    applied = _apply_date_filter(page, date_from, date_to)
+    save_to = _download_excel(page, date_from, date_to)
+    _report_resource_stats(context)
+    return save_to, applied
+
+
+def _browser_download(date_from, date_to):
+    """브라우저로 로그인(또는 세션 재사용) 후 엑셀출력 버튼을 눌러 다운로드, (저장 경로, 조회기간 적용 여부) 반환"""
+    with sync_playwright() as p:
+        browser = _launch_browser(p)
+        context = None
+        try:
+            storage_state = _load_session_state()
+            context = _new_context(browser, storage_state)
+            return download_with_context(context, date_from, date_to, check_session=storage_state is not None)
+
+        finally:
+            # 브라우저 정리 (Playwright 종료 전에 닫아야 함)
             try:
-                df = pd.read_excel(save_to)
-                logger.info(f"엑셀 데이터 로드 완료: {len(df)} 행")
-                df.attrs["source_path"] = str(save_to)
-                return df
+                if context:
+                    logger.info("컨텍스트 정리 중...")
+                    _resource_stats.pop(context, None)
+                    context.close()
+                logger.info("브라우저 정리 중...")
+                browser.close()
             except Exception as e:
-                logger.error(f"엑셀 파일 읽기 실패: {e}")
-                raise
-                
+                logger.error(f"브라우저 정리 중 오류: {e}")
+
+
+def download_excel(date_from=None, date_to=None, context=None):
+    """엑셀 파일을 내려받아 (저장 경로, 조회기간 적용 여부) 반환 (HTTP 직접 다운로드 → 실패 시 브라우저)
+
+    context를 넘기면 브라우저를 새로 띄우지 않고 해당 컨텍스트(상주 워커의 브라우저)를 사용.
+    조회기간에 없는 기존 행을 삭제로 표시하는 것은 적용 여부가 True일 때만 안전하다.
+    """
+    date_from = date_from or today()
+    date_to = date_to or today()
+
+    if DOWNLOAD_MODE != "browser":
+        try:
+            # with_dates가 시작일/종료일을 모두 바꾼 요청이므로 조회기간 적용됨
+            return _direct_download(date_from, date_to), True
+        except eims_http.DirectExportError as e:
+            logger.info(f"HTTP 직접 다운로드 불가, 브라우저로 대체: {e}")
+
+    if context is not None:
+        return download_with_context(context, date_from, date_to)
+    return _browser_download(date_from, date_to)
+
+
+def read_excel(save_to):
+    """다운로드한 엑셀 파일을 DataFrame으로 읽기 (attrs["source_path"]에 경로 기록)"""
+    logger.info("엑셀 파일 읽기 시도 중...")
+    try:
+        # 워크북 전체 객체 모델 대신 행 단위 스트리밍으로 읽기 (헤더 행 자동 감지)
+        with slog.span("read_excel", bytes=pathlib.Path(save_to).stat().st_size) as span:
+            df = read_excel_streaming(save_to)
+            span["rows"] = len(df)
+        logger.info(f"엑셀 데이터 로드 완료: {len(df)} 행")
+        df.attrs["source_path"] = str(save_to)
+        return df
+    except Exception as e:
+        logger.error(f"엑셀 파일 읽기 실패: {e}")
+        raise
+
+
+def fetch_excel_df(date_from=None, date_to=None, context=None):
+    """엑셀을 내려받아 DataFrame으로 반환 (attrs["source_path"]: 파일 경로, attrs["window_confirmed"]: 조회기간 적용 여부)"""
+    date_from = date_from or today()
+    date_to = date_to or today()
+    
+    logger.info(f"엑셀 다운로드 시작: {date_from} ~ {date_to}")
+    slog.start_run()
+
+    try:
+        save_to, confirmed = download_excel(date_from, date_to, context=context)
+
+        df = read_excel(save_to)
+        df.attrs["window_confirmed"] = confirmed
+        return df
+
     except Exception as e:
         logger.error(f"전체 프로세스 중 오류 발생: {e}")
         raise
+
+
+def fetch_excel_chunks(date_from=None, date_to=None, context=None, chunksize=DEFAULT_CHUNK_ROWS):
+    """엑셀을 내려받아 (파일 경로, chunksize 행 단위 원본 DataFrame 반복자, 조회기간 적용 여부) 반환
+
+    fetch_excel_df와 달리 파일 전체를 DataFrame으로 만들지 않으므로 큰 내보내기에서도 메모리가 일정하다.
+    """
+    date_from = date_from or today()
+    date_to = date_to or today()
+
+    logger.info(f"엑셀 다운로드 시작 (청크 처리): {date_from} ~ {date_to}")
+    slog.start_run()
+
+    try:
+        save_to, confirmed = download_excel(date_from, date_to, context=context)
+    except Exception as e:
+        logger.error(f"전체 프로세스 중 오류 발생: {e}")
+        raise
+    return str(save_to), _timed_chunks(save_to, chunksize), confirmed
+
+
+def _timed_chunks(save_to, chunksize):
+    """iter_excel_chunks를 감싸 청크를 읽는 데 든 시간만 합산해 read_excel 단계로 기록
+
+    청크 사이의 표준화/저장/배정 시간은 제외하며, 끝까지 읽거나 중단될 때 한 번 기록한다.
+    """
+    elapsed = 0.0
+    rows = 0
+    ok = True
+    chunks = iter_excel_chunks(save_to, chunksize)
+    try:
+        while True:
+            started = time.perf_counter()
+            try:
+                chunk = next(chunks)
+            except StopIteration:
+                break
+            except Exception:
+                ok = False
+                raise
+            finally:
+                elapsed += time.perf_counter() - started
+            rows += len(chunk)
+            yield chunk
     finally:
-        # 브라우저 정리
-        try:
-            if page:
-                logger.info("페이지 정리 중...")
-            if context:
-                logger.info("컨텍스트 정리 중...")
-                context.close()
-            if browser:
-                logger.info("브라우저 정리 중...")
-                browser.close()
-        except Exception as e:
-            logger.error(f"브라우저 정리 중 오류: {e}")
+        slog.log_phase("read_excel", elapsed * 1000, ok, bytes=pathlib.Path(save_to).stat().st_size,
+                       rows=rows, streaming=True)
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+스크래핑 단계별 소요 시간 리포트
+storage/logs/app.log* 의 phase_timing 이벤트를 모아 최근 N회 실행의
+단계별 p50/p95 소요 시간, 다운로드 바이트, 읽은 행 수를 표시
+
+사용법:
+    python scripts/scrape_report.py --runs 20
+"""
+
+import argparse
+import json
+import math
+from collections import OrderedDict, defaultdict
+from pathlib import Path
+
+# 표시 순서 (그 외 단계는 뒤에 이름순)
+PHASE_ORDER = ["session_check", "login_probe", "login", "navigate", "search", "export", "save", "read_excel"]
+# 다른 단계 안에서 측정되는 단계 (parent 필드가 없던 이전 로그용) - 합계에서 제외
+NESTED_PHASES = {"login_probe"}
+
+
+def _is_top_level(event):
+    return not event.get("parent") and event["phase"] not in NESTED_PHASES
+
+
+def _percentile(values, pct):
+    """nearest-rank 방식 백분위수"""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def load_timings(log_dir="storage/logs"):
+    """로그 파일에서 phase_timing 이벤트를 시간순으로 읽기"""
+    events = []
+    files = sorted(Path(log_dir).glob("app.log*"), key=lambda p: p.stat().st_mtime)
+    for path in files:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            for line in f:
+                if '"phase_timing"' not in line:
+                    continue
+                try:
+                    event = json.loads(line[line.index("{"):])
+                except ValueError:
+                    continue
+                if event.get("event_type") == "phase_timing" and event.get("run_id"):
+                    events.append(event)
+    events.sort(key=lambda e: e.get("timestamp", ""))
+    return events
+
+
+def summarize(events, runs=20):
+    """최근 runs회 실행의 단계별 통계 {phase: {...}}"""
+    by_run = OrderedDict()
+    for event in events:
+        by_run.setdefault(event["run_id"], []).append(event)
+    recent = list(by_run.values())[-runs:]
+
+    durations = defaultdict(list)
+    bytes_ = defaultdict(list)
+    rows = defaultdict(list)
+    failures = defaultdict(int)
+    totals = []
+    for run_events in recent:
+        # 중첩 단계(parent 있음)는 바깥 단계 시간에 이미 포함되므로 최상위 단계만 합산
+        totals.append(sum(e["duration_ms"] for e in run_events if _is_top_level(e)))
+        for e in run_events:
+            phase = e["phase"]
+            durations[phase].append(e["duration_ms"])
+            if not e.get("ok", True):
+                failures[phase] += 1
+            if "bytes" in e:
+                bytes_[phase].append(e["bytes"])
+            if "rows" in e:
+                rows[phase].append(e["rows"])
+
+    phases = [p for p in PHASE_ORDER if p in durations] + sorted(set(durations) - set(PHASE_ORDER))
+    summary = OrderedDict()
+    for phase in phases:
+        values = durations[phase]
+        summary[phase] = {
+            "count": len(values),
+            "p50_ms": _percentile(values, 50),
+            "p95_ms": _percentile(values, 95),
+            "failures": failures[phase],
+            "avg_bytes": sum(bytes_[phase]) // len(bytes_[phase]) if bytes_[phase] else None,
+            "avg_rows": sum(rows[phase]) // len(rows[phase]) if rows[phase] else None,
+        }
+    if totals:
+        summary["(total)"] = {
+            "count": len(totals),
+            "p50_ms": _percentile(totals, 50),
+            "p95_ms": _percentile(totals, 95),
+            "failures": 0,
+            "avg_bytes": None,
+            "avg_rows": None,
+        }
+    return len(recent), summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="스크래핑 단계별 소요 시간 리포트")
+    parser.add_argument("--runs", type=int, default=20, help="최근 몇 회 실행을 볼지")
+    parser.add_argument("--log-dir", default="storage/logs", help="로그 폴더")
+    args = parser.parse_args()
+
+    run_count, summary = summarize(load_timings(args.log_dir), args.runs)
+    if not summary:
+        print("phase_timing 기록이 없습니다.")
+        return 0
+
+    print(f"=== 최근 {run_count}회 실행 단계별 소요 시간 ===")
+    print(f"{'단계':<14}{'횟수':>6}{'p50(ms)':>12}{'p95(ms)':>12}{'실패':>6}{'평균 bytes':>14}{'평균 행':>10}")
+    print("-" * 74)
+    for phase, s in summary.items():
+        avg_bytes = "-" if s["avg_bytes"] is None else s["avg_bytes"]
+        avg_rows = "-" if s["avg_rows"] is None else s["avg_rows"]
+        print(f"{phase:<14}{s['count']:>6}{s['p50_ms']:>12.1f}{s['p95_ms']:>12.1f}{s['failures']:>6}{avg_bytes:>14}{avg_rows:>10}")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
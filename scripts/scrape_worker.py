@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+EIMS 상주 스크래퍼 워커
+브라우저와 로그인된 컨텍스트를 계속 띄워 두고, 스케줄러의 "지금 실행" 요청을
+로컬 IPC(multiprocessing.connection)로 받아 바로 처리
+매 실행마다 파이썬 기동, pandas/playwright 임포트, 크롬 실행, 로그인을 반복하지 않음
+
+사용법:
+    python scripts/scrape_worker.py            # 워커 실행
+    python scripts/scrape_worker.py run        # 실행 요청 보내기
+    python scripts/scrape_worker.py stop       # 워커 종료
+"""
+
+import os
+import sys
+import time
+import queue
+import logging
+import pathlib
+import threading
+from multiprocessing.connection import Listener, Client
+from multiprocessing import AuthenticationError
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path: sys.path.insert(0, str(ROOT))
+
+try:
+    import psutil  # 선택: 브라우저 메모리 기준 재시작에 사용
+except ImportError:
+    psutil = None
+
+logger = logging.getLogger(__name__)
+
+WORKER_ADDRESS = ("127.0.0.1", int(os.environ.get("EIMS_WORKER_PORT", "47651")))
+# 실행 요청 응답 대기 한도(초) - 워커가 멈춰 있어도 스케줄러가 무한정 기다리지 않음
+RUN_TIMEOUT_SECONDS = float(os.environ.get("EIMS_WORKER_RUN_TIMEOUT_SECONDS", "1800"))
+# 브라우저 재시작 기준: 실행 후 경과 시간(분), 브라우저 프로세스 메모리 합계(MB)
+MAX_AGE_MINUTES = float(os.environ.get("EIMS_WORKER_MAX_AGE_MINUTES", "360"))
+MAX_RSS_MB = float(os.environ.get("EIMS_WORKER_MAX_RSS_MB", "1500"))
+
+
+def worker_authkey():
+    """워커 IPC 인증 키 (.env/환경변수 EIMS_WORKER_AUTHKEY 또는 config.yaml worker.authkey, 기본값 없음)"""
+    from dotenv import load_dotenv
+    from scripts.config_manager import config
+
+    load_dotenv(ROOT / ".env")
+    key = config.get_env_or_config("EIMS_WORKER_AUTHKEY", "worker.authkey")
+    if not key:
+        raise AuthenticationError("워커 인증 키가 없습니다. .env에 EIMS_WORKER_AUTHKEY를 설정하세요.")
+    return str(key).encode("utf-8")
+
+
+def send_command(cmd, timeout=None):
+    """실행 중인 워커에 명령 전송 후 응답 반환
+
+    워커가 없으면 ConnectionRefusedError, 응답 전에 연결이 끊기면 EOFError,
+    timeout(초) 안에 응답이 없으면 TimeoutError
+    """
+    with Client(WORKER_ADDRESS, authkey=worker_authkey()) as conn:
+        conn.send({"cmd": cmd})
+        if timeout is not None and not conn.poll(timeout):
+            raise TimeoutError(f"워커 응답 대기 시간 초과: {timeout}초")
+        return conn.recv()
+
+
+class WarmBrowser:
+    """실행 사이에도 유지되는 브라우저/컨텍스트"""
+
+    def __init__(self):
+        self._playwright = None
+        self.browser = None
+        self.context = None
+        self.started_at = None
+        self.runs = 0
+
+    def start(self):
+        from playwright.sync_api import sync_playwright
+        from scripts import scrape_eims
+
+        self._playwright = sync_playwright().start()
+        self.browser = scrape_eims._launch_browser(self._playwright)
+        self.context = scrape_eims._new_context(self.browser, scrape_eims._load_session_state())
+        self.started_at = time.time()
+        self.runs = 0
+        logger.info("브라우저 준비 완료")
+
+    def stop(self):
+        if self.context is not None:
+            from scripts import scrape_eims
+            scrape_eims._resource_stats.pop(self.context, None)
+        for close in (lambda: self.context.close(), lambda: self.browser.close(), lambda: self._playwright.stop()):
+            try:
+                close()
+            except Exception:
+                pass
+        self._playwright = self.browser = self.context = None
+
+    def memory_mb(self):
+        """워커 하위 프로세스(Playwright 드라이버, 크롬) 메모리 합계 (psutil 없으면 None)"""
+        if psutil is None:
+            return None
+        total = 0
+        for child in psutil.Process().children(recursive=True):
+            try:
+                total += child.memory_info().rss
+            except psutil.Error:
+                continue
+        return total / (1024 * 1024)
+
+    def recycle_reason(self):
+        if not self.browser.is_connected():
+            return "브라우저 연결 끊김"
+        age_minutes = (time.time() - self.started_at) / 60
+        if age_minutes > MAX_AGE_MINUTES:
+            return f"실행 시간 초과 ({age_minutes:.0f}분)"
+        memory = self.memory_mb()
+        if memory is not None and memory > MAX_RSS_MB:
+            return f"메모리 초과 ({memory:.0f}MB)"
+        return None
+
+    def get_context(self):
+        """재시작 기준을 확인한 뒤 사용할 컨텍스트 반환"""
+        if self.browser is not None:
+            reason = self.recycle_reason()
+            if reason:
+                logger.info(f"브라우저 재시작: {reason}")
+                self.stop()
+        if self.browser is None:
+            self.start()
+        return self.context
+
+
+def _run_once(warm):
+    from scripts.scrape_eims import fetch_excel_df, fetch_excel_chunks
+    from sql.job import run_job
+
+    started = time.time()
+    ok = run_job(
+        fetch=lambda date_from, date_to: fetch_excel_df(date_from, date_to, context=warm.get_context()),
+        fetch_chunks=lambda date_from, date_to: fetch_excel_chunks(date_from, date_to, context=warm.get_context()),
+    )
+    warm.runs += 1
+    if not ok:
+        # 실패 후에는 브라우저 상태를 믿지 않고 다음 실행 때 새로 띄움
+        warm.stop()
+    return {"ok": ok, "elapsed": round(time.time() - started, 1), "runs": warm.runs}
+
+
+def _accept_loop(listener, pending):
+    """연결 수락과 인증만 별도 스레드에서 처리 (실행 중에도 요청한 쪽이 연결 단계에서 멈추지 않음)"""
+    while True:
+        try:
+            pending.put(listener.accept())
+        except AuthenticationError:
+            logger.warning("인증 실패한 연결 무시")
+        except OSError:
+            break  # 리스너 종료
+
+
+def serve():
+    """IPC 요청을 받아 처리하는 메인 루프 (Playwright 동기 API 때문에 실행은 단일 스레드로 처리)"""
+    warm = WarmBrowser()
+    authkey = worker_authkey()
+    logger.info(f"🚀 EIMS 스크래퍼 워커 시작: {WORKER_ADDRESS[0]}:{WORKER_ADDRESS[1]}")
+
+    pending = queue.Queue()
+    with Listener(WORKER_ADDRESS, authkey=authkey) as listener:
+        threading.Thread(target=_accept_loop, args=(listener, pending), daemon=True).start()
+        while True:
+            conn = pending.get()
+            with conn:
+                try:
+                    if not conn.poll(10):
+                        continue
+                    cmd = conn.recv().get("cmd")
+                except (EOFError, OSError, AttributeError):
+                    continue
+
+                if cmd == "run":
+                    logger.info("=== 실행 요청 수신 ===")
+                    try:
+                        result = _run_once(warm)
+                    except Exception as e:
+                        # 실행 중 예외로 워커가 죽지 않도록 오류를 응답하고 브라우저는 다음 실행 때 새로 띄움
+                        logger.exception("실행 중 오류")
+                        warm.stop()
+                        result = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+                    logger.info(f"실행 결과: {result}")
+                    try:
+                        conn.send(result)
+                    except OSError:
+                        logger.warning("요청한 쪽 연결이 끊겨 결과를 보내지 못했습니다.")
+                elif cmd == "ping":
+                    conn.send({"ok": True, "runs": warm.runs, "memory_mb": warm.memory_mb()})
+                elif cmd == "stop":
+                    conn.send({"ok": True})
+                    break
+                else:
+                    conn.send({"ok": False, "error": f"알 수 없는 명령: {cmd}"})
+
+    warm.stop()
+    logger.info("EIMS 스크래퍼 워커 종료")
+
+
+def main():
+    os.chdir(ROOT)
+    pathlib.Path("storage/logs").mkdir(parents=True, exist_ok=True)
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler('storage/logs/worker.log', encoding='utf-8'),
+            logging.StreamHandler()
+        ]
+    )
+
+    if len(sys.argv) > 1:
+        print(send_command(sys.argv[1]))
+        return 0
+
+    try:
+        serve()
+    except KeyboardInterrupt:
+        logger.info("워커가 중단되었습니다.")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
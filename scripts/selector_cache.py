@@ -0,0 +1,79 @@
+"""
+로그인 화면 선택자 학습 캐시
+
+로그인에 성공했을 때 실제로 쓰인 선택자(사용자 ID 칸, 비밀번호 칸, 로그인 버튼)를
+페이지 구조 지문과 함께 저장해 두고, 같은 구조의 페이지에서는 그 선택자를 먼저 시도한다.
+지문이 바뀌었거나(사이트 개편) 저장된 선택자가 맞지 않으면 기존 후보 목록으로 다시 찾는다.
+"""
+
+import hashlib
+import json
+import logging
+import pathlib
+
+logger = logging.getLogger(__name__)
+
+# 폼 입력 요소의 태그/유형/id/name만으로 구조 지문 생성 (값/텍스트 변화에는 영향 없음)
+_LAYOUT_SCRIPT = """
+() => Array.from(document.querySelectorAll('form, input, button, select, textarea'))
+    .map(e => [e.tagName, e.type || '', e.id || '', e.name || ''].join(':'))
+    .join('|')
+"""
+
+
+def layout_fingerprint(page):
+    """현재 페이지의 폼 구조 지문 (16자리 hex, 실패 시 None)"""
+    try:
+        layout = page.evaluate(_LAYOUT_SCRIPT)
+    except Exception as e:
+        logger.warning(f"페이지 구조 지문 생성 실패: {e}")
+        return None
+    return hashlib.sha256(layout.encode("utf-8")).hexdigest()[:16]
+
+
+class SelectorCache:
+    """{지문: {역할: 선택자}} JSON 파일 캐시와 실행별 적중/미적중 집계"""
+
+    def __init__(self, path):
+        self.path = pathlib.Path(path)
+        self.entries = self._load()
+        self.hits = 0
+        self.misses = 0
+        self._learned = {}
+
+    def _load(self):
+        try:
+            return json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def get(self, fingerprint, role):
+        if fingerprint is None:
+            return None
+        return self.entries.get(fingerprint, {}).get(role)
+
+    def learn(self, fingerprint, role, selector):
+        """찾은 선택자를 기억 (로그인 성공이 확인된 뒤 save()로 저장)"""
+        if fingerprint is not None:
+            self._learned.setdefault(fingerprint, {})[role] = selector
+
+    def forget(self, fingerprint, role):
+        """맞지 않는 것으로 확인된 선택자 제거"""
+        self.entries.get(fingerprint, {}).pop(role, None)
+
+    def save(self):
+        for fingerprint, roles in self._learned.items():
+            self.entries.setdefault(fingerprint, {}).update(roles)
+        self._learned = {}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(json.dumps(self.entries, ensure_ascii=False, indent=2), encoding="utf-8")
+        except OSError as e:
+            logger.warning(f"선택자 캐시 저장 실패: {e}")
+
+    def discard(self):
+        """로그인 실패 시 이번에 찾은 선택자는 저장하지 않음"""
+        self._learned = {}
+
+    def stats(self):
+        return {"selector_hits": self.hits, "selector_misses": self.misses}
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+표준화 결과 Parquet 스테이징
+다운로드한 엑셀을 표준화한 결과를 storage/staging/<파일명>.parquet로 원본 정보와 함께 저장해 두고,
+재처리(재저장/재배정)와 분석은 xlsx를 다시 파싱하지 않고 이 파일을 읽는다 (메모리 맵 읽기)
+pyarrow가 없으면 스테이징을 건너뛰고 기존처럼 엑셀에서 읽는다
+
+사용법:
+    python scripts/staging.py list
+    python scripts/staging.py replay --since 2025-10-01         # 스테이징 파일로 DB 저장 + 배정 재실행
+    python scripts/staging.py replay field_water_2025-10-21_1761.parquet --no-assign
+"""
+
+import argparse
+import json
+import os
+import sys
+import pathlib
+from datetime import datetime
+from typing import Iterator, List, Optional
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path: sys.path.insert(0, str(ROOT))
+
+import pandas as pd
+
+try:
+    import pyarrow as pa  # 선택: 설치되어 있을 때만 스테이징 사용
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+STORAGE_DIR = pathlib.Path(os.getenv("EIMS_STORAGE_DIR", str(ROOT / "storage")))
+STAGING_DIR = STORAGE_DIR / "staging"
+# Parquet 스키마 메타데이터 키 (원본 파일 정보 JSON)
+METADATA_KEY = b"eims.source"
+
+
+def available() -> bool:
+    return pq is not None
+
+
+def staged_path(source_path) -> pathlib.Path:
+    """원본 엑셀 경로에 대응하는 스테이징 파일 경로"""
+    return STAGING_DIR / f"{pathlib.Path(source_path).stem}.parquet"
+
+
+class StagedWriter:
+    """표준화 결과를 배치 단위로 한 Parquet 파일에 기록 (청크 처리 중에도 전체 프레임 불필요)
+
+    임시 파일에 쓰고 close()에서 이름을 바꾸므로 중간에 실패하면 스테이징 파일이 남지 않는다.
+    """
+
+    def __init__(self, source_path, file_sha256: Optional[str] = None):
+        self.path = staged_path(source_path)
+        self.rows = 0
+        self._tmp = self.path.with_suffix(".parquet.part")
+        self._source = {
+            "source_path": str(source_path),
+            "file_sha256": file_sha256,
+            "staged_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        self._writer = None
+        self._schema = None
+
+    @staticmethod
+    def _widen_dictionaries(table):
+        """범주형 컬럼의 코드 타입을 int32로 고정
+
+        from_pandas는 카테고리 수에 맞춰 int8/int16 코드를 고르므로, 첫 배치 기준으로 고정하면
+        이후 배치의 카테고리가 127개를 넘을 때 캐스팅이 실패한다.
+        """
+        fields = [pa.field(f.name, pa.dictionary(pa.int32(), f.type.value_type), f.nullable, f.metadata)
+                  if pa.types.is_dictionary(f.type) else f for f in table.schema]
+        schema = pa.schema(fields, metadata=table.schema.metadata)
+        return table if schema.equals(table.schema) else table.cast(schema)
+
+    def write(self, df: pd.DataFrame) -> None:
+        table = self._widen_dictionaries(pa.Table.from_pandas(df, preserve_index=False))
+        if self._writer is None:
+            STAGING_DIR.mkdir(parents=True, exist_ok=True)
+            source = json.dumps(self._source, ensure_ascii=False).encode("utf-8")
+            self._schema = table.schema.with_metadata({**(table.schema.metadata or {}), METADATA_KEY: source})
+            self._writer = pq.ParquetWriter(self._tmp, self._schema)
+        elif not table.schema.equals(self._schema, check_metadata=False):
+            # 배치마다 달라질 수 있는 pandas 메타데이터(카테고리 수 등)는 첫 배치 스키마로 맞춤
+            table = table.cast(self._schema)
+        self._writer.write_table(table)
+        self.rows += len(df)
+
+    def close(self) -> Optional[pathlib.Path]:
+        """파일을 완성하고 경로 반환 (기록한 배치가 없으면 None)"""
+        if self._writer is None:
+            return None
+        self._writer.close()
+        self._tmp.replace(self.path)
+        return self.path
+
+    def abort(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        self._tmp.unlink(missing_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def stage(df: pd.DataFrame, source_path, file_sha256: Optional[str] = None) -> Optional[pathlib.Path]:
+    """표준화된 프레임 하나를 스테이징 (pyarrow가 없으면 None)"""
+    if not available():
+        return None
+    with StagedWriter(source_path, file_sha256) as writer:
+        writer.write(df)
+    return writer.path
+
+
+def read_metadata(path) -> dict:
+    """스테이징 파일의 원본 정보 (source_path, file_sha256, staged_at, rows)"""
+    parquet = pq.ParquetFile(path)
+    metadata = parquet.schema_arrow.metadata or {}
+    source = json.loads(metadata.get(METADATA_KEY, b"{}").decode("utf-8"))
+    return dict(source, rows=parquet.metadata.num_rows)
+
+
+def read_staged(path, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """스테이징 파일을 메모리 맵으로 읽어 DataFrame 반환 (attrs["source_path"]에 원본 경로)"""
+    df = pq.read_table(path, columns=columns, memory_map=True).to_pandas()
+    df.attrs["source_path"] = read_metadata(path).get("source_path", str(path))
+    return df
+
+
+def load_normalized(source_path) -> Optional[pd.DataFrame]:
+    """원본 엑셀의 스테이징 결과가 있으면 읽어서 반환 (없으면 None)"""
+    if not available():
+        return None
+    path = staged_path(source_path)
+    return read_staged(path) if path.exists() else None
+
+
+def list_staged(since: Optional[str] = None) -> List[pathlib.Path]:
+    """스테이징 파일 목록 (오래된 순, since=YYYY-MM-DD 이후 스테이징된 것만)"""
+    if not STAGING_DIR.exists():
+        return []
+    paths = sorted(STAGING_DIR.glob("*.parquet"), key=lambda p: p.stat().st_mtime)
+    if since:
+        cutoff = datetime.strptime(since, "%Y-%m-%d").timestamp()
+        paths = [p for p in paths if p.stat().st_mtime >= cutoff]
+    return paths
+
+
+def iter_staged(paths=None, columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+    """스테이징 파일을 하나씩 읽어 반환 (분석/재처리용)"""
+    for path in paths if paths is not None else list_staged():
+        yield read_staged(path, columns)
+
+
+def replay(paths, assign: bool = True) -> int:
+    """스테이징 파일로 DB 저장(+배정)을 다시 수행하고 처리한 행 수 반환"""
+    from scripts import db
+    from scripts.assign import run_assign
+    from scripts.fingerprint import row_hashes
+
+    db.init_db()
+    total = 0
+    for path in paths:
+        df = read_staged(path)
+        if "row_hash" not in df.columns:
+            df["row_hash"] = row_hashes(df)
+        db.upsert_samples(df, df.attrs["source_path"])
+        if assign:
+            run_assign(df)
+        total += len(df)
+        print(f"  {path.name}: {len(df)}행")
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="표준화 결과 Parquet 스테이징")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="스테이징 파일 목록")
+    replay_parser = sub.add_parser("replay", help="스테이징 파일로 DB 저장/배정 재실행")
+    replay_parser.add_argument("files", nargs="*", help="스테이징 파일 이름 (없으면 전체)")
+    replay_parser.add_argument("--since", help="이 날짜(YYYY-MM-DD) 이후 스테이징된 파일만")
+    replay_parser.add_argument("--no-assign", action="store_true", help="DB 저장만 하고 배정은 생략")
+    args = parser.parse_args()
+
+    if not available():
+        print("❌ pyarrow가 설치되어 있지 않습니다: pip install pyarrow")
+        return 1
+
+    if args.command == "list":
+        for path in list_staged():
+            meta = read_metadata(path)
+            print(f"{path.name}  {meta.get('rows', '?')}행  {meta.get('staged_at', '')}  <- {meta.get('source_path', '')}")
+        return 0
+
+    paths = [STAGING_DIR / name for name in args.files] if args.files else list_staged(args.since)
+    print(f"스테이징 재처리: {len(paths)}개 파일")
+    rows = replay(paths, assign=not args.no_assign)
+    print(f"✅ 재처리 완료: {rows}행")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -1,6 +1,10 @@
 import logging
 import json
 import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 from logging.handlers import RotatingFileHandler
@@ -10,6 +14,8 @@ class StructuredLogger:
     
     def __init__(self, name="eims_automation"):
         self.logger = logging.getLogger(name)
+        self.run_id = None
+        self._local = threading.local()  # 스레드별 진행 중인 span 이름 (중첩 단계의 parent 기록용)
         self._setup_logger()
     
     def _setup_logger(self):
@@ -56,6 +62,41 @@ class StructuredLogger:
         
         self.logger.info(json.dumps(log_data, ensure_ascii=False))
     
+    def start_run(self):
+        """새 실행 ID 발급 (phase_timing 이벤트를 실행 단위로 묶는 데 사용)"""
+        self.run_id = uuid.uuid4().hex[:12]
+        return self.run_id
+    
+    def log_phase(self, phase, duration_ms, ok=True, **fields):
+        """phase_timing 이벤트 기록 (다른 span 안에서 호출되면 parent에 바깥 단계 이름)"""
+        stack = getattr(self._local, "spans", None)
+        if stack:
+            fields.setdefault("parent", stack[-1])
+        self.log_event(
+            "phase_timing",
+            run_id=self.run_id,
+            phase=phase,
+            duration_ms=round(duration_ms, 1),
+            ok=ok,
+            **fields
+        )
+    
+    @contextmanager
+    def span(self, phase, **fields):
+        """단계별 소요 시간 로깅 - with 블록 안에서 반환된 dict에 bytes/rows 등 추가 가능"""
+        stack = self._local.__dict__.setdefault("spans", [])
+        started = time.perf_counter()
+        ok = True
+        stack.append(phase)
+        try:
+            yield fields
+        except BaseException:
+            ok = False
+            raise
+        finally:
+            stack.pop()
+            self.log_phase(phase, (time.perf_counter() - started) * 1000, ok, **fields)
+    
     def log_assignment(self, researcher, count, items):
         """배정 로그"""
         self.log_event(
@@ -92,3 +133,6 @@ if __name__ == "__main__":
     logger.log_assignment("김연구원", 5, ["수은", "페놀"])
     logger.log_download("test.xlsx", 12345, 100)
     logger.log_error("validation_error", "필수 컬럼 누락", column="item")
+    logger.start_run()
+    with logger.span("read_excel") as span:
+        span["rows"] = 100
@@ -7,16 +7,48 @@
 
 import os
 import shutil
-import sqlite3
+import sys
 import pandas as pd
 from pathlib import Path
 from datetime import datetime
 import logging
 
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path: sys.path.insert(0, str(ROOT))
+
+from scripts.connection import connect
+from scripts.db import today_range
+
 # 로깅 설정
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# 오늘 배정된 작업 (assigned_at 범위 조건으로 인덱스 사용, +a.researcher는 정렬용 전체 인덱스 스캔 방지)
+TODAY_ASSIGNMENTS_SQL = """
+    SELECT 
+        a.researcher,
+        a.sample_no,
+        a.item,
+        a.assigned_at,
+        s.site_name,
+        s.collected_at,
+        s.status
+    FROM assignments a
+    JOIN samples s ON s.sample_no = a.sample_no AND s.item = a.item
+    WHERE a.assigned_at >= ? AND a.assigned_at < ?
+    ORDER BY +a.researcher, a.assigned_at
+"""
+
+DASHBOARD_SQL = """
+    SELECT 
+        researcher,
+        COUNT(*) as total_assignments,
+        COUNT(CASE WHEN assigned_at >= ? AND assigned_at < ? THEN 1 END) as today_assignments
+    FROM assignments 
+    GROUP BY researcher
+    ORDER BY total_assignments DESC
+"""
+
 class SharedFolderSync:
     def __init__(self, shared_path=r"\\samyang\homes\SAMYANG\Drive\SAMYANG\연구분석\공통분석실\데이터정리\1_TEST"):
         self.shared_path = Path(shared_path)
@@ -64,7 +96,7 @@ class SharedFolderSync:
         
         # 2) 데이터베이스에서 배정된 연구원도 추가 (보조) - 테스트용 이름들 제외
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = connect(self.db_path)
             db_researchers = pd.read_sql_query("""
                 SELECT DISTINCT researcher 
                 FROM assignments 
@@ -73,7 +105,6 @@ class SharedFolderSync:
                 AND researcher NOT IN ('김연구원', '박연구원', '이연구원')
                 ORDER BY researcher
             """, conn)
-            conn.close()
             
             for researcher in db_researchers['researcher'].tolist():
                 researchers.add(researcher)
@@ -140,25 +171,10 @@ class SharedFolderSync:
     def create_today_assignments(self):
         """오늘 배정된 작업을 연구원별로 파일 생성"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = connect(self.db_path)
             
             # 오늘 배정된 작업 조회
-            assignments = pd.read_sql_query("""
-                SELECT 
-                    a.researcher,
-                    a.sample_no,
-                    a.item,
-                    a.assigned_at,
-                    s.site_name,
-                    s.collected_at,
-                    s.status
-                FROM assignments a
-                JOIN samples s ON a.sample_no = s.sample_no
-                WHERE date(a.assigned_at) = date('now', 'localtime')
-                ORDER BY a.researcher, a.assigned_at
-            """, conn)
-            
-            conn.close()
+            assignments = pd.read_sql_query(TODAY_ASSIGNMENTS_SQL, conn, params=today_range())
             
             if assignments.empty:
                 logger.info("오늘 배정된 작업이 없습니다.")
@@ -206,20 +222,10 @@ class SharedFolderSync:
     def create_dashboard(self):
         """전체 현황 대시보드 생성"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = connect(self.db_path)
             
             # 전체 현황 조회
-            dashboard_data = pd.read_sql_query("""
-                SELECT 
-                    researcher,
-                    COUNT(*) as total_assignments,
-                    COUNT(CASE WHEN date(assigned_at) = date('now', 'localtime') THEN 1 END) as today_assignments
-                FROM assignments 
-                GROUP BY researcher
-                ORDER BY total_assignments DESC
-            """, conn)
-            
-            conn.close()
+            dashboard_data = pd.read_sql_query(DASHBOARD_SQL, conn, params=today_range())
             
             # HTML 대시보드 생성
             html_content = f"""<!DOCTYPE html>
@@ -1,21 +1,167 @@
 
-import sys, pathlib
+import os, sys, pathlib
 import logging
+from collections import Counter
+from datetime import datetime, timedelta
+
+import pandas as pd
 
 ROOT = pathlib.Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path: sys.path.insert(0, str(ROOT))
 
-from scripts.scrape_eims import fetch_excel_df
-from scripts.normalize import normalize
-from scripts import db
-from scripts.assign import run_assign
+from scripts.scrape_eims import fetch_excel_df, fetch_excel_chunks
+from scripts.normalize import normalize, normalize_chunks, diff_rows, removed_rows, LayoutCache, LAYOUT_CACHE_PATH
+from scripts import db, staging
+from scripts.assign import run_assign, ChunkAssigner
 from scripts.notify import notify
 from scripts.cleanup import cleanup_old_files
 from scripts.structured_logger import logger
 from scripts.database_manager import DatabaseManager
 from scripts.sync_to_shared import SharedFolderSync
+from scripts.fingerprint import file_sha256, row_hashes, frame_digest, RowDigest
 
-def main():
+# 워터마크 이전 며칠을 겹쳐서 다시 조회 (늦게 등록/수정된 행 보완)
+WATERMARK_OVERLAP_DAYS = int(os.getenv("EIMS_WATERMARK_OVERLAP_DAYS", "1"))
+# 1이면 엑셀을 청크 단위로 읽어 표준화 → 저장 → 배정까지 흘려 보냄 (메모리 일정)
+STREAMING = os.getenv("EIMS_STREAMING", "0") == "1"
+# 1이면 site_name/kind/item/status를 범주형(공유 카테고리)으로 표준화
+CATEGORICAL = os.getenv("EIMS_CATEGORICAL", "0") == "1"
+# 1이면 조회기간 안의 기존 행 중 이번 엑셀에 없는 행을 삭제(removed_at)로 표시
+DETECT_REMOVED = os.getenv("EIMS_DETECT_REMOVED", "1") == "1"
+
+# 엑셀 헤더 위치/컬럼 매핑 캐시 - 파일에는 job.py만 저장 (테스트/벤치/재적재는 메모리 캐시)
+layout_cache = LayoutCache(LAYOUT_CACHE_PATH)
+
+def _delta_window():
+    """이번 실행의 조회기간: 워터마크 - 겹침 일수 ~ 오늘 (워터마크가 없으면 오늘 하루)"""
+    today = datetime.now().date()
+    watermark = db.get_watermark()
+    if not watermark:
+        return today.isoformat(), today.isoformat()
+    start = datetime.strptime(watermark, "%Y-%m-%d").date() - timedelta(days=WATERMARK_OVERLAP_DAYS)
+    return min(start, today).isoformat(), today.isoformat()
+
+def _ingested_watermark(df, date_to):
+    """저장한 행의 최신 채취일 (없거나 읽을 수 없으면 조회 종료일), 조회 종료일을 넘지 않음"""
+    latest = None
+    if "collected_at" in df.columns:
+        latest = pd.to_datetime(df["collected_at"], errors="coerce").max()
+    if latest is None or pd.isna(latest):
+        return date_to
+    return min(latest.date().isoformat(), date_to)
+
+def _record_noop(src, file_hash, rows_hash, row_count, reason):
+    """변경 없는 다운로드: 후속 단계(저장/배정/알림/동기화)를 건너뛰고 기록만 남김"""
+    db.record_download(src, file_hash, rows_hash, row_count, 0, "noop")
+    logger.log_event("noop_run", reason=reason, source_path=src, rows=row_count)
+
+def _removed_keys(src, window_confirmed, date_from, date_to, seen_keys, row_count):
+    """조회기간의 기존 행 중 이번 다운로드에 없는 uniq_key
+
+    빈 다운로드이거나, 다운로드에 조회기간이 적용됐는지 확인되지 않으면(기본 화면 다운로드 등) 판단하지 않음
+    """
+    if not DETECT_REMOVED or row_count == 0:
+        return []
+    if not window_confirmed:
+        logger.log_event("removed_detection_skipped", reason="window_not_confirmed", source_path=src)
+        return []
+    return removed_rows(db.get_window_keys(date_from, date_to), seen_keys)["uniq_key"].tolist()
+
+def _log_changes(total, counts, removed):
+    """counts: change_type별 행 수 (insert/update/unassigned)"""
+    logger.log_event("changed_rows_detected", total=total, changed=counts["insert"] + counts["update"],
+                     inserted=counts["insert"], updated=counts["update"], removed=len(removed),
+                     unassigned=counts["unassigned"])
+
+def _delta_rows(df):
+    """직전 상태 대비 바뀐 행 + 저장됐지만 아직 배정되지 않은 행 (change_type 포함)"""
+    keys = df["uniq_key"].unique()
+    return diff_rows(df, db.get_row_hashes(keys), unassigned=db.get_unassigned_keys(keys))
+
+def _stage(df, src, file_hash):
+    """표준화 결과를 Parquet 스테이징에 저장 (실패해도 처리는 계속)"""
+    try:
+        path = staging.stage(df, src, file_hash)
+        if path:
+            logger.log_event("staged", path=str(path), rows=len(df))
+    except Exception as e:
+        logger.log_error("staging_failed", e)
+
+def _process_chunks(src, chunks, file_hash, date_from, date_to, window_confirmed=False):
+    """청크 단위 표준화 → 변경 행 저장 → 배정 (배정 목록 반환, 변경이 없으면 None)
+
+    다운로드 기록과 워터마크는 모든 청크의 배정이 끝난 뒤에만 남긴다.
+    헤더 감지는 첫 청크에서 한 번만 하고, 메모리에는 한 청크와 배정 결과,
+    삭제 판단용 uniq_key 집합만 유지한다. 배정은 청크 안의 키만 기존 배정을 조회하므로
+    청크당 비용이 기존 배정 수와 무관하다.
+    """
+    digest = RowDigest()
+    assigned = []
+    counts = Counter()
+    saved = Counter()
+    seen_keys = set()
+    total_rows = changed_rows = 0
+    watermark = None
+    assigner = ChunkAssigner()
+    writer = staging.StagedWriter(src, file_hash) if staging.available() else None
+
+    logger.log_event("data_normalization_started", streaming=True)
+    for df in normalize_chunks(chunks, categorical=CATEGORICAL, cache=layout_cache):
+        df["row_hash"] = row_hashes(df)
+        digest.update(df["uniq_key"], df["row_hash"])
+        if writer is not None:
+            try:
+                writer.write(df)
+            except Exception as e:
+                logger.log_error("staging_failed", e)
+                writer.abort()
+                writer = None
+        total_rows += len(df)
+        batch_mark = _ingested_watermark(df, date_to)
+        watermark = batch_mark if watermark is None else max(watermark, batch_mark)
+
+        seen_keys.update(df["uniq_key"])
+
+        df = _delta_rows(df)
+        if df.empty:
+            continue
+        changed_rows += len(df)
+        counts.update(df["change_type"])
+
+        saved.update(db.upsert_samples(df, src))
+        assigned.extend(assigner.assign(df))
+    logger.log_event("data_normalization_completed", rows=total_rows, streaming=True)
+    layout_cache.save()
+    if writer is not None:
+        path = writer.close()
+        if path:
+            logger.log_event("staged", path=str(path), rows=writer.rows)
+
+    removed = _removed_keys(src, window_confirmed, date_from, date_to, seen_keys, total_rows)
+    if removed:
+        db.mark_removed(removed)
+        changed_rows += len(removed)
+    _log_changes(total_rows, counts, removed)
+    if saved:
+        logger.log_event("database_save_completed", streaming=True, **saved)
+
+    rows_hash = digest.hexdigest()
+    if changed_rows == 0:
+        _record_noop(src, file_hash, rows_hash, total_rows, "no_changed_rows")
+        assigned = None
+    else:
+        db.record_download(src, file_hash, rows_hash, total_rows, changed_rows, "processed")
+        logger.log_assignment("system", len(assigned), [a["item"] for a in assigned])
+    db.set_watermark(watermark or date_to)
+    return assigned
+
+def run_job(fetch=fetch_excel_df, fetch_chunks=fetch_excel_chunks, streaming=STREAMING):
+    """다운로드부터 공유폴더 동기화까지 전체 처리 (성공 시 True)
+
+    fetch: (date_from, date_to)를 받아 원본 DataFrame(attrs: source_path, window_confirmed)을 반환하는 함수
+           (상주 워커는 열린 브라우저를 쓰는 함수를 넘김)
+    fetch_chunks: streaming일 때 사용, (파일 경로, 원본 청크 반복자, 조회기간 적용 여부)를 반환하는 함수
+    """
     try:
         # 구조화된 로깅 시작
         logger.log_event("process_started", version="1.0")
@@ -34,41 +180,93 @@ def main():
         
         # 2) 엑셀 다운로드
         try:
-            logger.log_event("excel_download_started")
-            raw = fetch_excel_df()
-            src = raw.attrs.get("source_path","")
-            logger.log_download(src.split('/')[-1], len(raw), len(raw))
+            date_from, date_to = _delta_window()
+            logger.log_event("excel_download_started", date_from=date_from, date_to=date_to)
+            if streaming:
+                src, chunks, window_confirmed = fetch_chunks(date_from, date_to)
+            else:
+                raw = fetch(date_from, date_to)
+                src = raw.attrs.get("source_path","")
+                window_confirmed = raw.attrs.get("window_confirmed", False)
+                logger.log_download(src.split('/')[-1], len(raw), len(raw))
         except Exception as e:
             logger.log_error("excel_download_failed", e, 
                            suggestion="로그인 문제일 가능성이 높습니다. .env 파일과 네트워크 연결을 확인하세요.")
             raise
         
-        # 3) 데이터 표준화
-        try:
-            logger.log_event("data_normalization_started", rows=len(raw))
-            df = normalize(raw)
-            logger.log_event("data_normalization_completed", rows=len(df))
-        except Exception as e:
-            logger.log_error("data_normalization_failed", e)
-            raise
+        # 2-1) 직전 다운로드와 파일이 완전히 같으면 종료
+        last = db.last_download()
+        file_hash = file_sha256(src)
+        if last and last["file_sha256"] == file_hash:
+            _record_noop(src, file_hash, last["rows_sha256"], last["row_count"] if streaming else len(raw), "same_file")
+            # 직전 다운로드(배정까지 끝난)와 같은 파일이므로 조회한 행은 모두 DB에 있어 워터마크 전진 가능
+            db.set_watermark(date_to)
+            return True
         
-        # 4) 데이터베이스 저장
-        try:
-            logger.log_event("database_save_started", rows=len(df))
-            db.upsert_samples(df, src)
-            logger.log_event("database_save_completed")
-        except Exception as e:
-            logger.log_error("database_save_failed", e)
-            raise
+        # 3~5) 청크 단위 처리: 표준화 → 변경 행 저장 → 배정을 청크마다 수행
+        if streaming:
+            try:
+                assigned = _process_chunks(src, chunks, file_hash, date_from, date_to, window_confirmed)
+            except Exception as e:
+                logger.log_error("streaming_ingest_failed", e)
+                raise
+            if assigned is None:
+                return True
+        else:
+            # 3) 데이터 표준화
+            try:
+                logger.log_event("data_normalization_started", rows=len(raw))
+                df = normalize(raw, categorical=CATEGORICAL, cache=layout_cache)
+                logger.log_event("data_normalization_completed", rows=len(df))
+                layout_cache.save()
+            except Exception as e:
+                logger.log_error("data_normalization_failed", e)
+                raise
         
-        # 5) 작업 배정
-        try:
-            logger.log_event("assignment_started", rows=len(df))
-            assigned = run_assign(df)
-            logger.log_assignment("system", len(assigned), [a["item"] for a in assigned])
-        except Exception as e:
-            logger.log_error("assignment_failed", e)
-            raise
+            # 3-1) 행 단위 변경 확인: 새로 생기거나(insert) 내용이 바뀐(update) 행과 아직 배정되지 않은(unassigned)
+            #      행만 다음 단계로 전달하고 조회기간 안에서 사라진 행은 삭제(delete)로 표시
+            df["row_hash"] = row_hashes(df)
+            _stage(df, src, file_hash)
+            rows_hash = frame_digest(df["uniq_key"], df["row_hash"])
+            # 변경이 없어도 조회한 행은 모두 DB에 있으므로 워터마크는 전진 가능
+            watermark = _ingested_watermark(df, date_to)
+            if last and last["rows_sha256"] == rows_hash:
+                _record_noop(src, file_hash, rows_hash, len(df), "same_rows")
+                db.set_watermark(watermark)
+                return True
+        
+            total_rows = len(df)
+            removed = _removed_keys(src, window_confirmed, date_from, date_to, df["uniq_key"], total_rows)
+            df = _delta_rows(df)
+            _log_changes(total_rows, Counter(df["change_type"]), removed)
+            if df.empty and not removed:
+                _record_noop(src, file_hash, rows_hash, total_rows, "no_changed_rows")
+                db.set_watermark(watermark)
+                return True
+        
+            # 4) 데이터베이스 저장
+            try:
+                logger.log_event("database_save_started", rows=len(df), removed=len(removed))
+                saved = db.upsert_samples(df, src)
+                db.mark_removed(removed)
+                logger.log_event("database_save_completed", **saved)
+            except Exception as e:
+                logger.log_error("database_save_failed", e)
+                raise
+        
+            # 5) 작업 배정
+            try:
+                logger.log_event("assignment_started", rows=len(df))
+                assigned = run_assign(df)
+                logger.log_assignment("system", len(assigned), [a["item"] for a in assigned])
+            except Exception as e:
+                logger.log_error("assignment_failed", e)
+                raise
+
+            # 5-1) 배정까지 끝난 다운로드만 기록하고 워터마크 전진
+            #      (배정 전에 실패하면 다음 실행이 같은 기간을 다시 받아 배정되지 않은 행을 배정)
+            db.record_download(src, file_hash, rows_hash, total_rows, len(df) + len(removed), "processed")
+            db.set_watermark(watermark)
         
         # 6) 알림 발송
         try:
@@ -106,9 +304,14 @@ def main():
             logger.log_event("shared_folder_sync_failed_but_continuing")
         
         logger.log_event("process_completed", success=True)
+        return True
         
     except Exception as e:
         logger.log_error("process_failed", e)
+        return False
+
+def main():
+    if not run_job():
         sys.exit(1)
 
 if __name__ == "__main__":
@@ -2,7 +2,8 @@ CREATE TABLE IF NOT EXISTS samples(
   id INTEGER PRIMARY KEY,
   sample_no TEXT, site_name TEXT, collected_at TEXT,
   kind TEXT, item TEXT, status TEXT,
-  uniq_key TEXT UNIQUE, raw_path TEXT, created_at TEXT
+  uniq_key TEXT UNIQUE, raw_path TEXT, created_at TEXT,
+  row_hash TEXT, removed_at TEXT
 );
 CREATE TABLE IF NOT EXISTS researchers(
   id INTEGER PRIMARY KEY, name TEXT, email TEXT,
@@ -11,5 +12,17 @@ CREATE TABLE IF NOT EXISTS researchers(
 CREATE TABLE IF NOT EXISTS assignments(
   id INTEGER PRIMARY KEY, sample_no TEXT, item TEXT,
   researcher TEXT, assigned_at TEXT, method TEXT,
+  status TEXT, completed_at TEXT,
   UNIQUE(sample_no, item)
 );
+CREATE TABLE IF NOT EXISTS downloads(
+  id INTEGER PRIMARY KEY, path TEXT,
+  file_sha256 TEXT, rows_sha256 TEXT,
+  row_count INTEGER, changed_rows INTEGER,
+  status TEXT, created_at TEXT
+);
+CREATE TABLE IF NOT EXISTS watermarks(
+  name TEXT PRIMARY KEY, value TEXT, updated_at TEXT
+);
+
+-- 기존 DB 변경(컬럼/인덱스 추가 등)은 scripts/migrations.py에 번호 순서대로 추가
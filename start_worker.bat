@@ -0,0 +1,27 @@
+@echo off
+chcp 65001 >nul
+REM EIMS 상주 스크래퍼 워커 실행 배치 파일
+
+echo ========================================
+echo    EIMS 상주 스크래퍼 워커 시작
+echo ========================================
+
+REM 현재 디렉토리를 스크립트 위치로 변경
+cd /d "%~dp0"
+
+REM Python 환경 확인
+python --version >nul 2>&1
+if errorlevel 1 (
+    echo [ERROR] Python이 설치되지 않았습니다.
+    pause
+    exit /b 1
+)
+
+REM 워커 실행 (스케줄러보다 먼저 실행해 두면 매 실행마다 브라우저를 새로 띄우지 않음)
+echo [INFO] 브라우저를 띄워 두고 스케줄러의 실행 요청을 기다립니다.
+echo [INFO] 중단하려면 Ctrl+C를 누르세요.
+echo.
+
+python scripts/scrape_worker.py
+
+pause
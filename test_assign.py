@@ -1,9 +1,10 @@
 import sys
 import pathlib
-sys.path.append('scripts')
 
-from assign import run_assign
-from db import get_samples_df
+ROOT = pathlib.Path(__file__).resolve().parent
+if str(ROOT) not in sys.path: sys.path.insert(0, str(ROOT))
+
+from scripts.assign import run_assign
 import pandas as pd
 
 # 간단한 테스트 데이터
@@ -0,0 +1,33 @@
+import os
+import sys
+import pathlib
+import tempfile
+
+import pytest
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path: sys.path.insert(0, str(ROOT))
+
+# scrape_eims는 로그인 정보가 없으면 import 시 종료하고, 로그(storage/logs, 현재 폴더 기준)와
+# 다운로드/세션 폴더를 만들므로 테스트용 값과 임시 폴더로 대체
+os.environ.setdefault("EIMS_ID", "test")
+os.environ.setdefault("EIMS_PW", "test")
+_WORKDIR = pathlib.Path(tempfile.mkdtemp(prefix="eims_test_"))
+(_WORKDIR / "storage" / "logs").mkdir(parents=True)
+os.environ["EIMS_STORAGE_DIR"] = str(_WORKDIR / "storage")
+_cwd = os.getcwd()
+os.chdir(_WORKDIR)
+try:
+    from scripts import scrape_eims, structured_logger  # noqa: F401  (로그 파일을 임시 폴더에 열어 둠)
+finally:
+    os.chdir(_cwd)
+
+from scripts import normalize
+
+
+@pytest.fixture(autouse=True)
+def layout_cache(monkeypatch):
+    """레이아웃 캐시를 테스트마다 새 메모리 캐시로 (테스트 사이에 학습 결과 공유 안 함)"""
+    cache = normalize.LayoutCache()
+    monkeypatch.setattr(normalize, "layout_cache", cache)
+    return cache
@@ -0,0 +1,31 @@
+import pytest
+
+from scripts.eims_http import DirectExportError, with_dates
+
+
+def _recipe(url="https://eims.example/ms/field_water.do", post_data=None, **extra):
+    return {"method": "POST", "url": url, "post_data": post_data,
+            "headers": {"content-type": "application/x-www-form-urlencoded"},
+            "date_from": "2025-10-21", "date_to": "2025-10-21", **extra}
+
+
+def test_replaces_only_date_fields():
+    recipe = _recipe(post_data="dateFrom=2025-10-21&dateTo=2025-10-21&ts=2025-10-21")
+    new = with_dates(recipe, "2025-10-01", "2025-10-07")
+    assert new["post_data"] == "dateFrom=2025-10-01&dateTo=2025-10-07&ts=2025-10-21"
+
+
+def test_keeps_date_format_and_captured_field_names():
+    recipe = _recipe(url="https://eims.example/x.do?sdt=2025.10.21&edt=20251021",
+                     from_param="sdt", to_param="edt")
+    new = with_dates(recipe, "2025-10-01", "2025-10-07")
+    assert new["url"].endswith("?sdt=2025.10.01&edt=20251007")
+
+
+@pytest.mark.parametrize("post_data", [
+    "page=1&size=100",                        # 조회기간 필드 없음
+    "dateFrom=2025-10-21&dateTo=21-10-2025",  # 종료일 표기를 알 수 없음
+])
+def test_raises_when_window_not_replaced(post_data):
+    with pytest.raises(DirectExportError):
+        with_dates(_recipe(post_data=post_data), "2025-10-01", "2025-10-07")
@@ -0,0 +1,56 @@
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+
+from scripts import excel_reader
+from scripts.excel_reader import read_excel_streaming
+from scripts.normalize import normalize
+
+HEADER = ["시료번호", "사업장", "채취일자", "종류", "측정항목", "상태"]
+ROWS = [
+    [12345, "가공장", "2025-10-01", "방류수", "총질소", "접수"],
+    [12345, "가공장", "2025-10-01", None, "총인", None],
+    [12346, None, "2025-10-02", "방류수", "부유물질", "NA"],
+    [12347, "나공장", None, "방류수", "BOD", "완료"],
+]
+
+
+def _write(path, rows, title=None):
+    wb = Workbook()
+    ws = wb.active
+    if title:
+        ws.append([title])
+        ws.append([])
+    ws.append(HEADER)
+    for row in rows:
+        ws.append(row)
+    wb.save(path)
+    return path
+
+
+def _calamine_rows(path):
+    """calamine처럼 빈 칸은 '', 정수 셀은 실수로 반환"""
+    for row in pd.read_excel(path, header=None).itertuples(index=False, name=None):
+        yield tuple("" if pd.isna(v) else float(v) if isinstance(v, int) else v for v in row)
+
+
+@pytest.mark.parametrize("title", [None, "측정 결과 목록"])
+@pytest.mark.parametrize("calamine", [False, True])
+def test_streaming_matches_read_excel(tmp_path, monkeypatch, title, calamine):
+    path = _write(tmp_path / "export.xlsx", ROWS, title)
+    if calamine:
+        monkeypatch.setattr(excel_reader, "_iter_raw_rows", _calamine_rows)
+
+    expected = normalize(pd.read_excel(path))
+    actual = normalize(read_excel_streaming(path, chunksize=2))
+
+    pd.testing.assert_frame_equal(actual, expected)
+    assert "12345_총질소" in set(actual["uniq_key"].astype(str))
+    assert actual.loc[actual["item"] == "총인", "status"].tolist() == ["nan"]
+
+
+def test_chunks_have_same_columns(tmp_path):
+    path = _write(tmp_path / "export.xlsx", ROWS * 3)
+    chunks = list(excel_reader.iter_excel_chunks(path, chunksize=5))
+    assert [len(c) for c in chunks] == [5, 5, 2]
+    assert all(list(c.columns) == HEADER for c in chunks)
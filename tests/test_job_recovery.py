@@ -0,0 +1,72 @@
+import pathlib
+import sys
+from datetime import date
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "sql"))
+
+import job
+from scripts import db, staging
+
+
+class _NoSync:
+    def sync_all(self):
+        pass
+
+
+@pytest.fixture
+def pipeline(tmp_path, monkeypatch):
+    """알림/백업/정리/공유폴더 동기화 없이 run_job을 돌리는 환경"""
+    monkeypatch.setattr(db, "DB_PATH", tmp_path / "lab.db")
+    monkeypatch.setattr(staging, "STAGING_DIR", tmp_path / "staging")
+    monkeypatch.setattr(job, "DatabaseManager", lambda: None)
+    monkeypatch.setattr(job, "notify", lambda assigned: None)
+    monkeypatch.setattr(job, "cleanup_old_files", lambda: None)
+    monkeypatch.setattr(job, "SharedFolderSync", _NoSync)
+
+    src = tmp_path / "export.xlsx"
+    src.write_bytes(b"same export")
+
+    def fetch(date_from, date_to):
+        raw = pd.DataFrame({
+            "시료번호": ["S1", "S2", "S3"],
+            "사업장": ["가공장"] * 3,
+            "채취일자": ["2025-10-01"] * 3,
+            "측정항목": ["총질소"] * 3,
+        })
+        raw.attrs["source_path"] = str(src)
+        return raw
+    return fetch
+
+
+def test_rows_stored_before_failed_assignment_are_assigned_next_run(pipeline, monkeypatch):
+    run_assign = job.run_assign
+    calls = []
+
+    def flaky_assign(df):
+        calls.append(len(df))
+        if len(calls) == 1:
+            raise RuntimeError("database is locked")
+        return run_assign(df)
+    monkeypatch.setattr(job, "run_assign", flaky_assign)
+
+    assert job.run_job(fetch=pipeline, streaming=False) is False
+    assert len(db.get_row_hashes(["S1_총질소", "S2_총질소", "S3_총질소"])) == 3  # 저장은 됨
+    assert db.last_download() is None and db.get_watermark() is None
+
+    # 같은 파일이 다시 내려와도 no-op으로 끝나지 않고 배정되지 않은 행을 배정
+    assert job.run_job(fetch=pipeline, streaming=False) is True
+    assert calls == [3, 3]
+    assert db.get_existing_assignments() == {"S1_총질소", "S2_총질소", "S3_총질소"}
+    assert db.last_download()["status"] == "processed"
+
+
+def test_same_file_noop_advances_watermark(pipeline):
+    assert job.run_job(fetch=pipeline, streaming=False) is True
+    assert db.get_watermark() == "2025-10-01"  # 저장한 행의 최신 채취일
+
+    assert job.run_job(fetch=pipeline, streaming=False) is True
+    assert db.last_download()["status"] == "noop"
+    assert db.get_watermark() == date.today().isoformat()
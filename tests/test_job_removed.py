@@ -0,0 +1,27 @@
+import pathlib
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "sql"))
+
+import job
+from scripts import db
+
+
+@pytest.fixture
+def lab_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(db, "DB_PATH", tmp_path / "lab.db")
+    db.init_db()
+    rows = pd.DataFrame({"sample_no": ["A-1", "A-2"], "site_name": ["가공장"] * 2,
+                         "collected_at": ["2025-10-01"] * 2, "kind": ["방류수"] * 2,
+                         "item": ["총질소"] * 2, "status": ["접수"] * 2,
+                         "uniq_key": ["A-1_총질소", "A-2_총질소"]})
+    db.upsert_samples(rows, "old.xlsx")
+    return db
+
+
+@pytest.mark.parametrize("confirmed, expected", [(True, ["A-2_총질소"]), (False, [])])
+def test_removed_only_for_confirmed_window(lab_db, confirmed, expected):
+    assert job._removed_keys("new.xlsx", confirmed, "2025-10-01", "2025-10-01", {"A-1_총질소"}, 1) == expected
@@ -0,0 +1,36 @@
+import pathlib
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "sql"))
+
+import job
+from scripts import db, staging
+
+
+def _chunk(start, count):
+    return pd.DataFrame({
+        "시료번호": [f"S{i}" for i in range(start, start + count)],
+        "사업장": ["가공장"] * count,
+        "채취일자": ["2025-10-01"] * count,
+        "측정항목": ["총질소"] * count,
+    })
+
+
+def test_process_chunks_assigns_each_chunk_once(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(db, "DB_PATH", tmp_path / "lab.db")
+    monkeypatch.setattr(staging, "STAGING_DIR", tmp_path / "staging")
+    db.init_db()
+    calls = []
+    get_existing = db.get_existing_assignments
+    monkeypatch.setattr(db, "get_existing_assignments",
+                        lambda pairs=None: calls.append(pairs) or get_existing(pairs))
+
+    chunks = [_chunk(0, 30), _chunk(30, 30), _chunk(0, 10)]  # 마지막 청크는 이미 배정된 시료
+    assigned = job._process_chunks("export.xlsx", iter(chunks), "hash", "2025-10-01", "2025-10-01")
+
+    assert calls and all(pairs is not None for pairs in calls)  # 전체 배정을 읽지 않음
+    assert len(assigned) == 60
+    assert len(get_existing()) == 60
+    assert "처리 중인 항목" not in capsys.readouterr().out  # 행별 DEBUG 출력 없음
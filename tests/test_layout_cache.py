@@ -0,0 +1,27 @@
+import pandas as pd
+
+from scripts import normalize
+
+
+def _raw():
+    return pd.DataFrame({"시료번호": ["S1"], "사업장": ["가공장"], "측정항목": ["총질소"]})
+
+
+def test_normalize_does_not_write_cache_file(tmp_path):
+    cache = normalize.LayoutCache(tmp_path / "layouts.json")
+    normalize.normalize(_raw(), cache=cache)
+    assert cache.misses == 1
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_saved_layouts_are_reused(tmp_path):
+    path = tmp_path / "cache" / "layouts.json"
+    cache = normalize.LayoutCache(path)
+    normalize.normalize(_raw(), cache=cache)
+    cache.save()
+    assert [p.name for p in path.parent.iterdir()] == ["layouts.json"]  # 임시 파일이 남지 않음
+
+    reloaded = normalize.LayoutCache(path)
+    normalize.normalize(_raw(), cache=reloaded)
+    assert (reloaded.hits, reloaded.misses) == (1, 0)
+
@@ -0,0 +1,28 @@
+import sqlite3
+
+from scripts import db, migrations
+from scripts.connection import connect
+
+
+def test_upgrades_old_layout_in_place(tmp_path, monkeypatch):
+    path = tmp_path / "lab.db"
+    old = sqlite3.connect(path)
+    old.executescript("""
+        CREATE TABLE samples(id INTEGER PRIMARY KEY, sample_no TEXT, site_name TEXT, collected_at TEXT,
+          kind TEXT, item TEXT, status TEXT, uniq_key TEXT UNIQUE, raw_path TEXT, created_at TEXT);
+        CREATE TABLE assignments(id INTEGER PRIMARY KEY, sample_no TEXT, item TEXT,
+          researcher TEXT, assigned_at TEXT, method TEXT);
+        INSERT INTO assignments (sample_no, item, researcher) VALUES ('S1', 'A', 'r1'), ('S1', 'A', 'r2'), ('S2', 'A', 'r1');
+    """)
+    old.commit()
+    old.close()
+
+    monkeypatch.setattr(db, "DB_PATH", path)
+    db.init_db()
+    conn = connect(path)
+
+    assert migrations.current_version(conn) == migrations.MIGRATIONS[-1][0]
+    assert conn.execute("SELECT id, researcher FROM assignments ORDER BY id").fetchall() == [(1, "r1"), (3, "r1")]
+    assert {"status", "completed_at"} <= migrations._columns(conn, "assignments")
+    assert {"row_hash", "removed_at"} <= migrations._columns(conn, "samples")
+    assert migrations.migrate(conn) == []  # 다시 실행해도 적용할 것 없음
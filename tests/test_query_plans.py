@@ -0,0 +1,14 @@
+from scripts import check_query_plans, db
+from scripts.connection import connect, close
+
+
+def test_assignment_queries_use_indexes(tmp_path, monkeypatch):
+    monkeypatch.setattr(db, "DB_PATH", tmp_path / "lab.db")
+    db.init_db()
+    try:
+        results = check_query_plans.check(connect(db.DB_PATH))
+    finally:
+        close(db.DB_PATH)
+
+    assert [name for name, _, _ in results] == [name for name, *_ in check_query_plans.CHECKS]
+    assert {name: problems for name, _, problems in results if problems} == {}
@@ -0,0 +1,49 @@
+from openpyxl import Workbook
+
+from scripts import scrape_eims
+from scripts.scrape_report import summarize
+from scripts.structured_logger import StructuredLogger
+
+
+def _capture(monkeypatch, slog):
+    events = []
+    monkeypatch.setattr(slog, "log_event", lambda event_type, **kw: events.append(kw))
+    return events
+
+
+def test_total_counts_nested_phases_once(monkeypatch):
+    slog = StructuredLogger()
+    events = _capture(monkeypatch, slog)
+    slog.start_run()
+    with slog.span("login"):
+        with slog.span("login_probe"):
+            pass
+    with slog.span("export"):
+        pass
+
+    assert [e.get("parent") for e in events] == ["login", None, None]
+    _, summary = summarize(events)
+    login, export = summary["login"]["p50_ms"], summary["export"]["p50_ms"]
+    assert summary["(total)"]["p50_ms"] == login + export
+
+
+def test_total_ignores_login_probe_in_old_logs():
+    events = [{"run_id": "r1", "phase": p, "duration_ms": ms}
+              for p, ms in [("login_probe", 100.0), ("login", 300.0), ("read_excel", 50.0)]]
+    _, summary = summarize(events)
+    assert summary["(total)"]["p50_ms"] == 350.0
+
+
+def test_streaming_read_excel_is_timed(tmp_path, monkeypatch):
+    events = _capture(monkeypatch, scrape_eims.slog)
+    wb = Workbook()
+    wb.active.append(["시료번호", "측정항목"])
+    for i in range(25):
+        wb.active.append([i, "총질소"])
+    wb.save(tmp_path / "export.xlsx")
+
+    chunks = list(scrape_eims._timed_chunks(tmp_path / "export.xlsx", 10))
+
+    assert [len(c) for c in chunks] == [10, 10, 5]
+    (event,) = [e for e in events if e.get("phase") == "read_excel"]
+    assert event["rows"] == 25 and event["ok"] and event["streaming"]
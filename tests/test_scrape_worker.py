@@ -0,0 +1,57 @@
+import socket
+import threading
+import time
+from multiprocessing import AuthenticationError
+
+import pytest
+
+from scripts import scrape_worker
+
+
+@pytest.fixture
+def worker(monkeypatch):
+    """임시 포트에서 serve()를 백그라운드 스레드로 실행"""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    monkeypatch.setattr(scrape_worker, "WORKER_ADDRESS", ("127.0.0.1", port))
+    monkeypatch.setenv("EIMS_WORKER_AUTHKEY", "test-key")
+    thread = threading.Thread(target=scrape_worker.serve, daemon=True)
+    thread.start()
+    for _ in range(50):
+        try:
+            scrape_worker.send_command("ping", timeout=5)
+            break
+        except ConnectionRefusedError:
+            time.sleep(0.05)
+    yield
+    scrape_worker.send_command("stop", timeout=5)
+    thread.join(5)
+
+
+def test_failed_run_is_reported_and_worker_survives(worker, monkeypatch):
+    def boom(warm):
+        raise RuntimeError("브라우저 오류")
+    monkeypatch.setattr(scrape_worker, "_run_once", boom)
+
+    result = scrape_worker.send_command("run", timeout=5)
+    assert result["ok"] is False and "브라우저 오류" in result["error"]
+    assert scrape_worker.send_command("ping", timeout=5)["ok"] is True
+
+
+def test_hung_run_times_out(worker, monkeypatch):
+    release = threading.Event()
+    monkeypatch.setattr(scrape_worker, "_run_once", lambda warm: release.wait(5) and {"ok": True})
+
+    started = time.perf_counter()
+    with pytest.raises(TimeoutError):
+        scrape_worker.send_command("run", timeout=0.5)
+    assert time.perf_counter() - started < 2  # 연결/인증 단계에서 멈추지 않음
+    release.set()
+
+
+def test_authkey_has_no_default(monkeypatch):
+    monkeypatch.setattr(scrape_worker, "ROOT", scrape_worker.ROOT / "nonexistent")  # .env 로드 안 함
+    monkeypatch.delenv("EIMS_WORKER_AUTHKEY", raising=False)
+    with pytest.raises(AuthenticationError):
+        scrape_worker.worker_authkey()
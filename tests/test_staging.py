@@ -0,0 +1,30 @@
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from scripts import staging
+from scripts.normalize import CategoryRegistry, normalize_chunks
+
+
+def _chunk(start, count):
+    return pd.DataFrame({
+        "시료번호": [f"S{i}" for i in range(start, start + count)],
+        "사업장": [f"사업장{i}" for i in range(start, start + count)],
+        "측정항목": ["총질소"] * count,
+    })
+
+
+def test_categories_grow_past_int8_across_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr(staging, "STAGING_DIR", tmp_path)
+    monkeypatch.setattr("scripts.normalize.category_registry", CategoryRegistry())
+    chunks = [_chunk(0, 10), _chunk(10, 200), _chunk(210, 50)]
+
+    with staging.StagedWriter(tmp_path / "export.xlsx") as writer:
+        for df in normalize_chunks(chunks, categorical=True):
+            writer.write(df)
+
+    staged = staging.read_staged(writer.path)
+    assert len(staged) == 260
+    assert staged["site_name"].nunique() == 260
+    assert staged["site_name"].astype(str).tolist() == [f"사업장{i}" for i in range(260)]